@@ -0,0 +1,62 @@
+"""Add attendance_day column with unique (student, course, day) key
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+# Rows backfilled per UPDATE, to keep lock times short on large tables
+BACKFILL_BATCH_SIZE = 50000
+
+
+def upgrade() -> None:
+    op.add_column('attendances', sa.Column('attendance_day', sa.Date(), nullable=True))
+
+    # Backfill attendance_day in primary-key ranges
+    connection = op.get_bind()
+    min_id, max_id = connection.execute(sa.text("SELECT MIN(id), MAX(id) FROM attendances")).one()
+    if min_id is not None:
+        for start in range(min_id, max_id + 1, BACKFILL_BATCH_SIZE):
+            connection.execute(
+                sa.text(
+                    "UPDATE attendances SET attendance_day = DATE(attendance_date) "
+                    "WHERE id >= :start AND id < :end"
+                ),
+                {"start": start, "end": start + BACKFILL_BATCH_SIZE},
+            )
+
+    # Drop duplicates left by the old check-then-insert race, keeping the first mark
+    connection.execute(sa.text(
+        "DELETE FROM attendances WHERE id NOT IN ("
+        "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM attendances "
+        "GROUP BY student_id, course_id, attendance_day) AS keep)"
+    ))
+
+    with op.batch_alter_table('attendances') as batch_op:
+        batch_op.alter_column('attendance_day', existing_type=sa.Date(), nullable=False)
+
+    op.create_index(
+        'uq_attendances_student_course_day',
+        'attendances',
+        ['student_id', 'course_id', 'attendance_day'],
+        unique=True,
+    )
+    op.create_index('ix_attendances_day_course', 'attendances', ['attendance_day', 'course_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendances_day_course', table_name='attendances')
+    op.drop_index('uq_attendances_student_course_day', table_name='attendances')
+    with op.batch_alter_table('attendances') as batch_op:
+        batch_op.drop_column('attendance_day')
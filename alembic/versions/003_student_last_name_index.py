@@ -0,0 +1,24 @@
+"""Index students.last_name for keyset pagination by last name
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Secondary indexes carry the primary key, so this serves ORDER BY last_name, id
+    op.create_index(op.f('ix_students_last_name'), 'students', ['last_name'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_students_last_name'), table_name='students')
@@ -0,0 +1,59 @@
+"""Full-text search index on student name and email
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5("
+    "first_name, last_name, email, content='students', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS students_fts_ai AFTER INSERT ON students BEGIN "
+    "INSERT INTO students_fts(rowid, first_name, last_name, email) "
+    "VALUES (new.id, new.first_name, new.last_name, new.email); END",
+    "CREATE TRIGGER IF NOT EXISTS students_fts_ad AFTER DELETE ON students BEGIN "
+    "INSERT INTO students_fts(students_fts, rowid, first_name, last_name, email) "
+    "VALUES ('delete', old.id, old.first_name, old.last_name, old.email); END",
+    "CREATE TRIGGER IF NOT EXISTS students_fts_au AFTER UPDATE OF first_name, last_name, email ON students BEGIN "
+    "INSERT INTO students_fts(students_fts, rowid, first_name, last_name, email) "
+    "VALUES ('delete', old.id, old.first_name, old.last_name, old.email); "
+    "INSERT INTO students_fts(rowid, first_name, last_name, email) "
+    "VALUES (new.id, new.first_name, new.last_name, new.email); END",
+    # Index the existing rows
+    "INSERT INTO students_fts(students_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS students_fts_au",
+    "DROP TRIGGER IF EXISTS students_fts_ad",
+    "DROP TRIGGER IF EXISTS students_fts_ai",
+    "DROP TABLE IF EXISTS students_fts",
+]
+
+
+def upgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name in ("mysql", "mariadb"):
+        op.execute("ALTER TABLE students ADD FULLTEXT INDEX ft_students_name_email (first_name, last_name, email)")
+    elif dialect_name == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name in ("mysql", "mariadb"):
+        op.drop_index('ft_students_name_email', table_name='students')
+    elif dialect_name == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
@@ -0,0 +1,43 @@
+"""Add attendance_summary table with per student/course counters
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'attendance_summary',
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('total_classes', sa.Integer(), nullable=False),
+        sa.Column('present_classes', sa.Integer(), nullable=False),
+        sa.Column('absent_classes', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('student_id', 'course_id')
+    )
+
+    # Populate from the existing attendance rows
+    op.execute(
+        "INSERT INTO attendance_summary (student_id, course_id, total_classes, present_classes, absent_classes) "
+        "SELECT student_id, course_id, COUNT(*), "
+        "SUM(CASE WHEN is_present THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN is_present THEN 0 ELSE 1 END) "
+        "FROM attendances GROUP BY student_id, course_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('attendance_summary')
@@ -0,0 +1,55 @@
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.cli rebuild-attendance-summary
+    python -m app.cli resume-purge-jobs
+"""
+import argparse
+import logging
+from app.core.database import SessionLocal
+from app.services.attendance_service import AttendanceService
+from app.services.purge_service import PurgeService
+
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_attendance_summary(args: argparse.Namespace) -> None:
+    """Recompute the attendance_summary counters from the attendance rows."""
+    with SessionLocal() as db:
+        rows = AttendanceService.rebuild_attendance_summary(db)
+    print(f"Rebuilt attendance summary: {rows} rows")
+
+
+def resume_purge_jobs(args: argparse.Namespace) -> None:
+    """Run purge jobs left unfinished (e.g. by a restart during a background purge)."""
+    with SessionLocal() as db:
+        job_ids = PurgeService.unfinished_job_ids(db)
+    for job_id in job_ids:
+        PurgeService.run_purge_job(job_id)
+    print(f"Resumed {len(job_ids)} purge job(s)")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Parse arguments and run a maintenance command.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Student Management System maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild-attendance-summary", help="Reconcile attendance_summary with the attendance rows")
+    rebuild.set_defaults(handler=rebuild_attendance_summary)
+
+    resume = commands.add_parser("resume-purge-jobs", help="Finish background purges that were interrupted")
+    resume.set_defaults(handler=resume_purge_jobs)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,223 @@
 Database configuration and session management.
 Sets up SQLAlchemy engine and session factory.
 """
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import itertools
+import time
+from fastapi import Request
+from sqlalchemy import Column, DateTime, create_engine, event, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker, with_loader_criteria
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.pool_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+
+
+# Sync driver prefix -> async driver prefix
+ASYNC_DRIVERS = {
+    "mysql+mysqlconnector://": "mysql+aiomysql://",
+    "mysql+pymysql://": "mysql+aiomysql://",
+    "mysql://": "mysql+aiomysql://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+# Time until which a client's reads stay on the primary: kept in the session
+# cookie of web clients, and sent to API clients in a response header they
+# echo back on their reads
+PRIMARY_UNTIL_KEY = "db_primary_until"
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
+
+# HTTP methods that only read and may be served by a replica
+READ_METHODS = ("GET", "HEAD")
+
+# Session.info key of the blocking calls queued by call_off_loop
+OFF_LOOP_CALLS_KEY = "off_loop_calls"
+
+
+def _is_memory_sqlite(database_url: str) -> bool:
+    """In-memory SQLite must keep SQLAlchemy's default pool so every session sees the same database."""
+    return "sqlite" in database_url and (":memory:" in database_url or database_url.rstrip("/") == "sqlite:")
+
+
+def _pool_options(database_url: str, poolclass=InstrumentedQueuePool) -> dict:
+    """
+    Build connection pool options from settings.
+
+    Args:
+        database_url: Database URL the pool is created for
+        poolclass: Instrumented pool class to use
+
+    Returns:
+        dict: Keyword arguments for create_engine
+    """
+    if _is_memory_sqlite(database_url):
+        return {}
+
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_use_lifo": settings.db_pool_use_lifo,
+    }
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Swap the driver of a database URL for its async counterpart.
+
+    Args:
+        database_url: Sync database URL
+
+    Returns:
+        str: database_url using the async driver
+
+    Raises:
+        ValueError: If no async driver is known for the URL
+    """
+    for sync_prefix, async_prefix in ASYNC_DRIVERS.items():
+        if database_url.startswith(sync_prefix):
+            return async_prefix + database_url[len(sync_prefix):]
+
+    raise ValueError(f"No async driver known for '{database_url}'; set ASYNC_DATABASE_URL")
+
+
+def get_async_replica_url(replica_url: str) -> str:
+    """
+    Get the async URL of a read replica, with the primary's async driver.
+
+    Args:
+        replica_url: Sync replica URL (an entry of REPLICA_DATABASE_URLS)
+
+    Returns:
+        str: replica_url using the driver of ASYNC_DATABASE_URL when it is
+        set, otherwise the one get_async_database_url maps to
+
+    Raises:
+        ValueError: If ASYNC_DATABASE_URL is not set and no async driver is known for the URL
+    """
+    if not settings.async_database_url:
+        return get_async_database_url(replica_url)
+    driver = make_url(settings.async_database_url).drivername
+    return make_url(replica_url).set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _enable_sqlite_foreign_keys(sync_engine) -> None:
+    """SQLite leaves foreign keys (and ON DELETE CASCADE) off unless enabled on each connection."""
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def _make_engine(database_url: str):
+    """Create a sync engine with the configured pool."""
+    db_engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if "sqlite" in database_url else {},
+        echo=False,  # Set to True for SQL query logging
+        **_pool_options(database_url),
+    )
+    if "sqlite" in database_url:
+        _enable_sqlite_foreign_keys(db_engine)
+    return db_engine
+
+
+def _make_async_engine(async_url: str):
+    """Create an async engine with the configured pool."""
+    db_engine = create_async_engine(
+        async_url,
+        echo=False,
+        **_pool_options(async_url, poolclass=InstrumentedAsyncAdaptedQueuePool),
+    )
+    if "sqlite" in async_url:
+        _enable_sqlite_foreign_keys(db_engine.sync_engine)
+    return db_engine
+
 
 # Create database engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
-    echo=False,  # Set to True for SQL query logging
-)
+engine = _make_engine(settings.database_url)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read replica engines and session factories
+replica_engines = [_make_engine(url) for url in settings.replica_database_urls]
+ReplicaSessionLocals = [
+    sessionmaker(autocommit=False, autoflush=False, bind=replica) for replica in replica_engines
+]
+
+# Async engines and session factories (only when DB_ASYNC is enabled)
+async_engine = None
+AsyncSessionLocal = None
+async_replica_engines = []
+AsyncReplicaSessionLocals = []
+
+if settings.db_async:
+    async_engine = _make_async_engine(
+        settings.async_database_url or get_async_database_url(settings.database_url)
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    async_replica_engines = [
+        _make_async_engine(get_async_replica_url(url)) for url in settings.replica_database_urls
+    ]
+    AsyncReplicaSessionLocals = [
+        async_sessionmaker(replica, autoflush=False, expire_on_commit=False)
+        for replica in async_replica_engines
+    ]
+
 # Base class for all models
 Base = declarative_base()
 
 
+class SoftDeleteMixin:
+    """
+    Adds a deleted_at column. Rows with deleted_at set are waiting to be purged
+    and are hidden from every ORM SELECT (see _hide_soft_deleted).
+    """
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+
+
+def join_live(stmt, *references):
+    """
+    Keep only the rows of a statement whose referenced soft-deletable rows are live.
+
+    For statements over tables without deleted_at (e.g. attendances), whose
+    rows _hide_soft_deleted cannot see through, and for Core statements,
+    which bypass it altogether.
+
+    Args:
+        stmt: Select statement
+        *references: (model, foreign key column) pairs, e.g. (Student, Attendance.student_id)
+
+    Returns:
+        Select: stmt joined to each referenced model, filtered on its deleted_at
+    """
+    for model, column in references:
+        stmt = stmt.join(model, model.id == column).where(model.deleted_at.is_(None))
+    return stmt
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _hide_soft_deleted(orm_execute_state) -> None:
+    """Filter out soft-deleted rows unless the statement sets execution option include_deleted=True."""
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+        and not orm_execute_state.execution_options.get("include_deleted", False)
+    ):
+        # Carried over to relationship and eager loads of the returned objects
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
+
+# Round-robin position over the replicas
+_replica_counter = itertools.count()
+
+
 def get_db():
     """
     Dependency function to get database session.
@@ -30,3 +229,201 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency function to get an async database session.
+    Usage: Inject as dependency in routers when DB_ASYNC is enabled.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _primary_until(request: Request, now: float) -> float | None:
+    """
+    Read the time until which a client's reads stay on the primary.
+
+    Taken from the session cookie or the PRIMARY_UNTIL_HEADER the client
+    echoes back. The header is not signed, so a value further away than one
+    stickiness window is capped: a client cannot pin itself to the primary.
+
+    Args:
+        request: Incoming request
+        now: Current Unix time
+
+    Returns:
+        float: Unix time, or None when the client sent none
+    """
+    deadlines = []
+    if "session" in request.scope and PRIMARY_UNTIL_KEY in request.session:
+        deadlines.append(request.session[PRIMARY_UNTIL_KEY])
+    try:
+        echoed = float(request.headers[PRIMARY_UNTIL_HEADER])
+    except (KeyError, ValueError):
+        echoed = None
+    if echoed is not None:
+        deadlines.append(min(echoed, now + settings.replica_stickiness_seconds))
+    return max(deadlines, default=None)
+
+
+def _choose_session_factory(request: Request, primary, replicas: list):
+    """
+    Pick the primary or the next replica for a request.
+
+    Writes go to the primary and keep that client's reads on the primary for
+    replica_stickiness_seconds so it reads its own writes. The deadline
+    travels with the client, so it holds whichever worker process serves the
+    next read: web clients keep it in their session cookie, API clients get
+    it in the PRIMARY_UNTIL_HEADER of the write's response (added by
+    PrimaryStickinessMiddleware) and send it back with their reads.
+
+    Args:
+        request: Incoming request
+        primary: Primary session factory
+        replicas: Replica session factories
+
+    Returns:
+        Session factory to use for this request
+    """
+    if not replicas:
+        return primary
+
+    now = time.time()
+    session = request.session if "session" in request.scope else None
+
+    if request.method not in READ_METHODS:
+        primary_until = now + settings.replica_stickiness_seconds
+        request.state.primary_until = primary_until
+        if session:  # Only clients that already keep the cookie; never start a session for this
+            session[PRIMARY_UNTIL_KEY] = primary_until
+        return primary
+
+    primary_until = _primary_until(request, now)
+    if primary_until is not None and now < primary_until:
+        return primary
+    if session and PRIMARY_UNTIL_KEY in session:
+        del session[PRIMARY_UNTIL_KEY]
+
+    return replicas[next(_replica_counter) % len(replicas)]
+
+
+class PrimaryStickinessMiddleware:
+    """ASGI middleware sending the primary deadline of a write (see _choose_session_factory) in PRIMARY_UNTIL_HEADER."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_deadline(message):
+            if message["type"] == "http.response.start":
+                primary_until = scope.get("state", {}).get("primary_until")
+                if primary_until is not None:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (PRIMARY_UNTIL_HEADER.lower().encode(), f"{primary_until:.3f}".encode()),
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_deadline)
+
+
+def get_routed_db(request: Request):
+    """
+    Dependency function to get a database session routed to the primary or a read replica.
+    Usage: Inject as dependency in API routers.
+    """
+    db = _choose_session_factory(request, SessionLocal, ReplicaSessionLocals)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_routed_async_db(request: Request):
+    """
+    Dependency function to get an async database session routed to the primary or a read replica.
+    Usage: Inject as dependency in API routers when DB_ASYNC is enabled.
+    """
+    async with _choose_session_factory(request, AsyncSessionLocal, AsyncReplicaSessionLocals)() as db:
+        yield db
+
+
+# Session dependency for the API routers: async when DB_ASYNC is enabled, sync otherwise
+get_api_db = get_routed_async_db if settings.db_async else get_routed_db
+
+# Session dependency on the primary for API endpoints whose results are cached
+# and shared between clients: a lagging replica must not be what gets cached
+get_api_primary_db = get_async_db if settings.db_async else get_db
+
+
+def choose_api_session_factory(request: Request):
+    """
+    Get the session factory get_api_db would use for a request.
+
+    For handlers that must own the session's lifetime, e.g. streaming
+    responses that keep reading after the handler returns.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        AsyncSession factory when DB_ASYNC is enabled, Session factory otherwise
+    """
+    if settings.db_async:
+        return _choose_session_factory(request, AsyncSessionLocal, AsyncReplicaSessionLocals)
+    return _choose_session_factory(request, SessionLocal, ReplicaSessionLocals)
+
+
+async def run_db(db: Session | AsyncSession, fn, *args, **kwargs):
+    """
+    Run a sync service function against either kind of session without blocking the event loop.
+
+    AsyncSession runs it via run_sync on the async driver, then makes the
+    blocking calls it queued with call_off_loop; a sync Session runs it in
+    the threadpool.
+
+    Args:
+        db: Sync or async database session
+        fn: Function taking the sync session as its first argument
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        The return value of fn
+    """
+    if isinstance(db, AsyncSession):
+        info = db.sync_session.info
+        info[OFF_LOOP_CALLS_KEY] = queued = []
+        try:
+            return await db.run_sync(fn, *args, **kwargs)
+        finally:
+            del info[OFF_LOOP_CALLS_KEY]
+            for call, call_args in queued:
+                await run_in_threadpool(call, *call_args)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def call_off_loop(db: Session, fn, *args) -> None:
+    """
+    Make a blocking call (e.g. network I/O) from a sync service function.
+
+    Under run_db with an AsyncSession the function runs on the event loop,
+    so the call is queued and run_db makes it in the threadpool before
+    returning. Anywhere else (threadpool, background threads) it is made
+    right away.
+
+    Args:
+        db: Sync database session the service function was given
+        fn: Blocking function
+        *args: Positional arguments for fn
+    """
+    queued = db.info.get(OFF_LOOP_CALLS_KEY)
+    if queued is not None:
+        queued.append((fn, args))
+    else:
+        fn(*args)
@@ -0,0 +1,148 @@
+"""
+ETags and conditional GET for API resources.
+
+An ETag is a hash of the request URL (or of a response cache key) and the
+versions of the tables the response is built from (see
+app/models/table_version.py). The conditional_get dependency reads those
+versions before the endpoint runs and answers a matching If-None-Match with
+304 right away, so nothing else is loaded or serialized.
+"""
+import hashlib
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.database import get_api_db, run_db
+from app.models.table_version import TableVersion
+
+
+# Clients may keep responses but must revalidate them before every use
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def get_table_versions(db: Session, tables: tuple[str, ...]) -> dict[str, int]:
+    """
+    Read the current versions of tables.
+
+    Args:
+        db: Database session
+        tables: Table names
+
+    Returns:
+        dict: Table name -> version (tables without a version row are left out)
+    """
+    rows = db.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(tables))
+    )
+    return dict(rows.all())
+
+
+def make_etag(representation: str, versions: dict[str, int]) -> str:
+    """
+    Build the weak ETag of a response.
+
+    Weak, because compression changes the bytes but not the content.
+
+    Args:
+        representation: What the response shows, e.g. the request's path and
+            query, or a response cache key (equivalent URLs share one)
+        versions: Versions of the tables the response is built from
+
+    Returns:
+        str: ETag header value
+    """
+    key = "|".join([representation, *(f"{name}:{versions[name]}" for name in sorted(versions))])
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == opaque
+        for candidate in (part.strip() for part in if_none_match.split(","))
+    )
+
+
+async def current_etag(
+    request: Request, db: Session | AsyncSession, tables: tuple[str, ...], representation: str | None = None
+) -> str | None:
+    """
+    Build the ETag a response built from tables would carry now.
+
+    Args:
+        request: Incoming request
+        db: Database session
+        tables: Tables the response is built from
+        representation: What the response shows (default: the request's path and query)
+
+    Returns:
+        str: ETag, or None when a table has no version row (no ETag rather than one that never changes)
+    """
+    versions = await run_db(db, get_table_versions, tables)
+    if len(versions) < len(tables):
+        return None
+    if representation is None:
+        representation = f"{request.url.path}|{request.url.query}"
+    return make_etag(representation, versions)
+
+
+def etag_headers(etag: str) -> dict:
+    """Headers sent with an ETag, on 200 and 304 alike."""
+    return {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+
+
+async def apply_etag(
+    request: Request, response: Response, db: Session | AsyncSession, tables: tuple[str, ...]
+) -> str | None:
+    """
+    Answer a matching If-None-Match with 304, or add the ETag to the response.
+
+    Call it before the endpoint loads anything: a write landing in between
+    yields an older ETag with newer data, which costs one extra full
+    response later, never a stale 304.
+
+    Args:
+        request: Incoming request
+        response: Response the ETag headers are added to
+        db: Database session
+        tables: Tables the response is built from
+
+    Returns:
+        str: The ETag, or None when there is none
+
+    Raises:
+        HTTPException: 304 when the client's copy is current
+    """
+    etag = await current_etag(request, db, tables)
+    if etag is None:
+        return None
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
+    return etag
+
+
+def conditional_get(*tables: str):
+    """
+    Create a dependency adding an ETag to a GET endpoint's response (see apply_etag).
+
+    Place it after the authentication dependency so unauthenticated requests
+    still get 401.
+
+    Args:
+        *tables: Tables the endpoint's response is built from
+
+    Returns:
+        Dependency returning the ETag, or None when a table has no version row
+    """
+    async def check_etag(
+        request: Request,
+        response: Response,
+        db: Session | AsyncSession = Depends(get_api_db),
+    ) -> str | None:
+        return await apply_etag(request, response, db, tables)
+
+    return check_etag
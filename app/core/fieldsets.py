@@ -0,0 +1,124 @@
+"""
+Sparse fieldsets: a fields= query parameter selecting the response fields.
+
+parse_fields checks the requested names against the endpoint's response
+schema. The services pass them to column_options, so the SELECT reads only
+those columns (plus the primary key), and load relationships such as a
+student's courses only when requested. sparse_response serializes with the
+response schema pruned to the requested fields, which reads nothing else
+from the ORM objects.
+"""
+import functools
+from typing import Any, get_args, get_origin
+from fastapi import Response
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+from app.core.serialization import dump_response
+
+
+def parse_fields(fields: str | None, schema: type[BaseModel]) -> tuple[str, ...] | None:
+    """
+    Parse a fields= parameter against a response schema.
+
+    Args:
+        fields: Comma-separated field names, e.g. "id,first_name,email"; None for all fields
+        schema: Response schema of one item, e.g. StudentResponse
+
+    Returns:
+        tuple: Requested field names in schema order, or None for all fields
+
+    Raises:
+        ValueError: If a name is not a field of schema, or no name is given
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        raise ValueError("fields must name at least one field")
+    unknown = sorted(requested - schema.model_fields.keys())
+    if unknown:
+        raise ValueError(
+            f"Invalid field(s) {', '.join(unknown)}; expected any of: {', '.join(schema.model_fields)}"
+        )
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+def wants(fields: tuple[str, ...] | None, name: str) -> bool:
+    """Whether a field is part of the response (every field is when fields is None)."""
+    return fields is None or name in fields
+
+
+def column_options(model, fields: tuple[str, ...] | None, *required) -> list:
+    """
+    Build the loader options selecting only the columns behind fields.
+
+    Args:
+        model: ORM model queried
+        fields: Result of parse_fields (relationship names are skipped)
+        *required: Other attributes the caller reads, e.g. keyset sort columns
+
+    Returns:
+        list: [load_only(...)] (the primary key is always loaded), or [] for all columns
+    """
+    if fields is None:
+        return []
+    mapper = inspect(model)
+    columns = [getattr(model, name) for name in fields if name in mapper.column_attrs]
+    primary_key = [getattr(model, column.key) for column in mapper.primary_key]
+    return [load_only(*primary_key, *columns, *required)]
+
+
+# Bounded by the validated field names; LRU in case clients try many combinations
+@functools.lru_cache(maxsize=256)
+def sparse_model(schema: Any, fields: tuple[str, ...] | None, items: str | None = None) -> Any:
+    """
+    Get a response schema pruned to fields.
+
+    Args:
+        schema: Response model, or list[Model]
+        fields: Result of parse_fields (None returns schema unchanged)
+        items: Prune the items of this list field (e.g. "students" of
+            StudentListResponse) instead of schema's own fields
+
+    Returns:
+        Pruned model (list[...] for a list schema)
+    """
+    if fields is None:
+        return schema
+    if get_origin(schema) is list:
+        return list[sparse_model(get_args(schema)[0], fields)]
+    if items is not None:
+        item_schema = get_args(schema.model_fields[items].annotation)[0]
+        return create_model(
+            schema.__name__, __base__=schema, **{items: (list[sparse_model(item_schema, fields)], ...)}
+        )
+    return create_model(
+        schema.__name__,
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (info.annotation, info) for name, info in schema.model_fields.items() if name in fields},
+    )
+
+
+def sparse_response(
+    schema: Any, value: Any, fields: tuple[str, ...], response: Response, items: str | None = None
+) -> Response:
+    """
+    Serialize a value as schema pruned to fields.
+
+    Returned as a Response, since the route's response_model describes the
+    full schema; the headers set on response (e.g. ETag) are kept.
+
+    Args:
+        schema: Full response schema (see sparse_model)
+        value: Endpoint result (ORM objects loaded with column_options, or dicts)
+        fields: Result of parse_fields
+        response: Response the endpoint and its dependencies set headers on
+        items: See sparse_model
+
+    Returns:
+        Response: JSON response
+    """
+    sparse = Response(dump_response(sparse_model(schema, fields, items), value), media_type="application/json")
+    sparse.headers.raw.extend(response.headers.raw)
+    return sparse
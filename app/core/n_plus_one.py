@@ -0,0 +1,77 @@
+"""
+Development-mode N+1 query detection.
+Counts ORM lazy loads per request and relationship, and logs or fails when one
+relationship lazy-loads more than once within a request.
+"""
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Detection modes
+DETECTION_MODES = ("off", "log", "raise")
+
+# Lazy loads per relationship for the current request (None outside requests)
+_lazy_loads: ContextVar[Counter | None] = ContextVar("lazy_loads", default=None)
+
+
+class NPlusOneError(RuntimeError):
+    """Raised in "raise" mode when a relationship lazy-loads repeatedly in one request."""
+
+
+def _on_orm_execute(orm_execute_state) -> None:
+    """Session event hook: count lazy (not eager) relationship loads."""
+    counts = _lazy_loads.get()
+    if (
+        counts is None
+        or not orm_execute_state.is_relationship_load
+        or orm_execute_state.lazy_loaded_from is None
+    ):
+        return
+
+    relationship = str(orm_execute_state.loader_strategy_path[-1])
+    counts[relationship] += 1
+
+    if counts[relationship] > 1 and settings.n_plus_one_detection == "raise":
+        raise NPlusOneError(
+            f"N+1 query: {relationship} lazy-loaded {counts[relationship]} times in one request; "
+            f"add an eager loader option in the service"
+        )
+
+
+def install_n_plus_one_detection() -> None:
+    """Listen for ORM executions on every Session (sync, and the ones behind AsyncSession)."""
+    if settings.n_plus_one_detection not in DETECTION_MODES:
+        raise ValueError(
+            f"Invalid N_PLUS_ONE_DETECTION '{settings.n_plus_one_detection}'; "
+            f"expected one of: {', '.join(DETECTION_MODES)}"
+        )
+    if settings.n_plus_one_detection != "off" and not event.contains(Session, "do_orm_execute", _on_orm_execute):
+        event.listen(Session, "do_orm_execute", _on_orm_execute)
+
+
+class NPlusOneMiddleware:
+    """ASGI middleware giving each request its own lazy-load counter and logging repeats."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counts = Counter()
+        token = _lazy_loads.set(counts)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _lazy_loads.reset(token)
+            repeated = {relationship: n for relationship, n in counts.items() if n > 1}
+            if repeated:
+                logger.warning(f"N+1 lazy loads in {scope['method']} {scope['path']}: {repeated}")
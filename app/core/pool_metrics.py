@@ -0,0 +1,120 @@
+"""
+Connection pool instrumentation.
+Tracks how long requests wait for a pooled connection so the pool can be sized against real traffic.
+"""
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Thread-safe counters and wait-time histogram for a connection pool."""
+
+    # Upper bounds (milliseconds) of the wait-time histogram buckets
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bucket_counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+
+    def observe(self, wait_ms: float) -> None:
+        """
+        Record one successful connection checkout.
+
+        Args:
+            wait_ms: Time spent waiting for the connection in milliseconds
+        """
+        index = len(self.BUCKETS_MS)
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if wait_ms <= bound:
+                index = i
+                break
+
+        with self._lock:
+            self._bucket_counts[index] += 1
+            self._checkouts += 1
+            self._total_wait_ms += wait_ms
+            if wait_ms > self._max_wait_ms:
+                self._max_wait_ms = wait_ms
+
+    def record_timeout(self) -> None:
+        """Record a checkout that gave up after pool_timeout."""
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self) -> dict:
+        """
+        Get a consistent copy of the collected metrics.
+
+        Returns:
+            dict: Checkout counts, timeouts and wait-time histogram
+        """
+        with self._lock:
+            labels = [f"le_{bound}ms" for bound in self.BUCKETS_MS] + ["gt_5000ms"]
+            return {
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._total_wait_ms / self._checkouts, 3) if self._checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait_ms, 3),
+                "wait_histogram": dict(zip(labels, self._bucket_counts)),
+            }
+
+
+class InstrumentedPoolMixin:
+    """Times every connection checkout and stores the result on ``self.metrics``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.observe((time.perf_counter() - start) * 1000)
+        return connection
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    """QueuePool that records checkout wait times."""
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool (used by AsyncEngine) that records checkout wait times."""
+
+
+def get_pool_stats(pool) -> dict:
+    """
+    Get live statistics for a connection pool.
+
+    Args:
+        pool: SQLAlchemy pool instance
+
+    Returns:
+        dict: Pool occupancy plus checkout metrics when the pool is instrumented
+    """
+    stats = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+
+    return stats
@@ -0,0 +1,375 @@
+"""
+Response cache for rendered API responses.
+
+Entries are JSON bodies stored with their ETag under string keys; entries
+can belong to a named group (e.g. every page of a listing) that is dropped
+as a whole. Backends:
+  - lru: in-process LRU with a TTL, one per worker process
+  - redis: a Redis-protocol server shared by all workers, through the
+    optional redis package or any client with the same methods (e.g. a
+    fakeredis client in tests)
+
+Writers invalidate entries after they commit. Each invalidation also bumps
+an epoch; a response rendered while the epoch moved is not stored, so a
+read that raced a write cannot put pre-write data back into the cache.
+Invalidations of the lru backend stay in the writer's process, so its hits
+are checked against the current table versions: an entry whose ETag is no
+longer current is a miss.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.cache import TTLCache
+from app.core.database import call_off_loop
+from app.core.etag import current_etag, etag_headers, etag_matches
+
+try:
+    import redis
+except ImportError:  # Optional: only needed for the redis backend
+    redis = None
+
+
+logger = logging.getLogger(__name__)
+
+# Failures treated as a cache miss (or a skipped store/invalidation) instead of failing the request
+_BACKEND_ERRORS = (redis.RedisError, OSError) if redis else (OSError,)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """A rendered JSON response and its ETag."""
+    etag: str | None
+    body: bytes
+
+    def encode(self) -> bytes:
+        """Serialize for byte-oriented backends (ETags never contain a newline)."""
+        return (self.etag or "").encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, data: bytes) -> "CachedResponse":
+        """Inverse of encode."""
+        etag, _, body = data.partition(b"\n")
+        return cls(etag.decode() or None, body)
+
+
+class LRUResponseBackend:
+    """In-process backend: an LRU with a TTL, private to the worker process."""
+
+    name = "lru"
+    blocking = False  # Safe to call on the event loop
+    shared = False  # Other workers' invalidations do not reach it
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)  # Key -> (group, CachedResponse)
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self._cache.get(key)
+        return entry[1] if entry else None
+
+    def set(self, key: str, response: CachedResponse, group: str | None, epoch: int) -> bool:
+        with self._lock:
+            if epoch != self._epoch:
+                return False
+            self._cache.set(key, (group, response))
+            return True
+
+    def epoch(self) -> int:
+        return self._epoch
+
+    def invalidate(self, keys: list[str], groups: list[str]) -> None:
+        with self._lock:
+            self._epoch += 1
+            for key in keys:
+                self._cache.delete(key)
+            if groups:
+                self._cache.delete_where(lambda key, entry: entry[0] in groups)
+
+    def stats(self) -> dict:
+        stats = self._cache.stats()
+        return {"size": stats["size"], "maxsize": stats["maxsize"], "ttl_seconds": stats["ttl_seconds"]}
+
+
+class RedisResponseBackend:
+    """Shared backend on a Redis-protocol server; groups are kept as Redis sets of their keys."""
+
+    name = "redis"
+    blocking = True  # Network round trips: run off the event loop
+    shared = True  # Every worker invalidates the same entries
+
+    def __init__(self, client, ttl: float, prefix: str = "response:"):
+        """
+        Args:
+            client: Redis client (redis.Redis or a compatible fake) returning bytes
+            ttl: Time-to-live of entries in seconds
+            prefix: Prefix of every key this backend writes
+        """
+        self.client = client
+        self.ttl = max(1, int(ttl))
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float, prefix: str = "response:") -> "RedisResponseBackend":
+        """
+        Create a backend connected to a Redis URL.
+
+        Raises:
+            ValueError: If the redis package is not installed
+        """
+        if redis is None:
+            raise ValueError("The redis response cache backend needs the redis package (pip install redis)")
+        return cls(redis.Redis.from_url(url, socket_timeout=1.0), ttl, prefix)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _group_key(self, group: str) -> str:
+        return f"{self.prefix}group:{group}"
+
+    def get(self, key: str) -> CachedResponse | None:
+        data = self.client.get(self._key(key))
+        return CachedResponse.decode(data) if data is not None else None
+
+    def set(self, key: str, response: CachedResponse, group: str | None, epoch: int) -> bool:
+        # Not atomic with a concurrent invalidation, but narrows the window to one round trip
+        if self.epoch() != epoch:
+            return False
+        pipe = self.client.pipeline()
+        pipe.set(self._key(key), response.encode(), ex=self.ttl)
+        if group:
+            pipe.sadd(self._group_key(group), self._key(key))
+            pipe.expire(self._group_key(group), self.ttl)
+        pipe.execute()
+        return True
+
+    def epoch(self) -> int:
+        return int(self.client.get(f"{self.prefix}epoch") or 0)
+
+    def invalidate(self, keys: list[str], groups: list[str]) -> None:
+        self.client.incr(f"{self.prefix}epoch")
+        doomed = [self._key(key) for key in keys]
+        for group in groups:
+            doomed.extend(self.client.smembers(self._group_key(group)))
+            doomed.append(self._group_key(group))
+        if doomed:
+            self.client.delete(*doomed)
+
+    def stats(self) -> dict:
+        return {"ttl_seconds": self.ttl}
+
+
+def make_response_backend(name: str, maxsize: int, ttl: float, redis_url: str | None = None):
+    """
+    Create a response cache backend from settings.
+
+    Args:
+        name: lru, redis or off
+        maxsize: Entries kept by the lru backend
+        ttl: Time-to-live of entries in seconds
+        redis_url: Server of the redis backend
+
+    Returns:
+        Backend, or None for off
+
+    Raises:
+        ValueError: If the backend is unknown or cannot be created
+    """
+    if name == "off":
+        return None
+    if name == "lru":
+        return LRUResponseBackend(maxsize, ttl)
+    if name == "redis":
+        return RedisResponseBackend.from_url(redis_url, ttl)
+    raise ValueError(f"Invalid response cache backend '{name}'; expected lru, redis or off")
+
+
+class ResponseCache:
+    """Response cache over a backend, with hit/miss counters; a None backend disables it."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0, "misses": 0, "outdated": 0, "stores": 0, "stale_skips": 0, "invalidations": 0, "errors": 0
+        }
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    async def _call(self, method, *args):
+        """Call a backend method, off the event loop for blocking backends."""
+        if self.backend.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    @property
+    def checks_hits(self) -> bool:
+        """Whether get needs the current ETag: entries of a per-process backend can be outdated."""
+        return self.backend is not None and not self.backend.shared
+
+    async def get(self, key: str, etag: str | None = None) -> CachedResponse | None:
+        """
+        Look up a response.
+
+        Args:
+            key: Cache key
+            etag: Current ETag of the response, when checks_hits (an entry
+                rendered with another one is outdated and dropped)
+
+        Returns:
+            CachedResponse, or None on a miss, with the cache disabled, or when the backend fails
+        """
+        if self.backend is None:
+            return None
+        try:
+            response = await self._call(self.backend.get, key)
+        except _BACKEND_ERRORS as e:
+            logger.warning(f"Response cache read failed: {e}")
+            self._count("errors")
+            return None
+        if response is not None and self.checks_hits and response.etag != etag:
+            self._count("outdated")
+            response = None
+        self._count("hits" if response is not None else "misses")
+        return response
+
+    async def epoch(self) -> int | None:
+        """Get the invalidation epoch; read it before loading what is passed to set."""
+        if self.backend is None:
+            return None
+        try:
+            return await self._call(self.backend.epoch)
+        except _BACKEND_ERRORS as e:
+            logger.warning(f"Response cache read failed: {e}")
+            self._count("errors")
+            return None
+
+    async def set(self, key: str, response: CachedResponse, epoch: int | None, group: str | None = None) -> None:
+        """
+        Store a response unless an invalidation happened since epoch was read.
+
+        Args:
+            key: Cache key
+            response: Rendered response
+            epoch: Result of epoch() taken before the response's data was loaded
+            group: Group the entry belongs to
+        """
+        if self.backend is None or epoch is None:
+            return
+        try:
+            stored = await self._call(self.backend.set, key, response, group, epoch)
+        except _BACKEND_ERRORS as e:
+            logger.warning(f"Response cache write failed: {e}")
+            self._count("errors")
+            return
+        self._count("stores" if stored else "stale_skips")
+
+    def invalidate(self, db: Session, keys: list[str] = (), groups: list[str] = ()) -> None:
+        """
+        Drop entries and whole groups (call after committing the write they depend on).
+
+        Synchronous, for the services. A blocking backend is called off the
+        event loop (see call_off_loop), before the request's response is sent.
+
+        Args:
+            db: Database session of the service making the write
+            keys: Cache keys
+            groups: Groups
+        """
+        if self.backend is None or not (keys or groups):
+            return
+        if self.backend.blocking:
+            call_off_loop(db, self._invalidate, list(keys), list(groups))
+        else:
+            self._invalidate(list(keys), list(groups))
+
+    def _invalidate(self, keys: list[str], groups: list[str]) -> None:
+        try:
+            self.backend.invalidate(keys, groups)
+        except _BACKEND_ERRORS as e:
+            # Entries expire after the TTL at the latest
+            logger.error(f"Response cache invalidation failed: {e}")
+            self._count("errors")
+            return
+        self._count("invalidations")
+
+    def stats(self) -> dict:
+        """
+        Get the cache's backend, counters and (lru) size.
+
+        Returns:
+            dict: Backend name, hit/miss/store counters and hit ratio
+        """
+        if self.backend is None:
+            return {"backend": "off"}
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "backend": self.backend.name,
+            **self.backend.stats(),
+            **counters,
+            "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _json_response(request: Request, cached: CachedResponse) -> Response:
+    """Send a cached response, or 304 when the client already has it."""
+    if cached.etag is None:
+        return Response(cached.body, media_type="application/json")
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=etag_headers(cached.etag))
+    return Response(cached.body, media_type="application/json", headers=etag_headers(cached.etag))
+
+
+async def serve_cached(
+    request: Request,
+    cache: ResponseCache,
+    key: str,
+    render,
+    db: Session | AsyncSession,
+    tables: tuple[str, ...],
+    group: str | None = None,
+) -> Response:
+    """
+    Serve a JSON response from the cache, rendering and storing it on a miss.
+
+    A hit of a shared backend never touches the database, conditional
+    requests included: the entry carries the ETag it was rendered with. A
+    hit of a per-process backend reads the table versions first.
+
+    Everything cached is served to every client, so db and render must use
+    the primary: a lagging replica's render would be cached and served, as
+    a hit, to the admin whose write it is missing.
+
+    Args:
+        request: Incoming request
+        cache: Response cache
+        key: Cache key of the response (also what its ETag is built from)
+        render: Async function returning the JSON body from the primary
+            (raises HTTPException, e.g. 404, which is not cached)
+        db: Primary database session
+        tables: Tables the response is built from (for its ETag)
+        group: Group the entry belongs to
+
+    Returns:
+        Response: JSON response, or 304
+    """
+    # From the key, like the cached entries: equivalent URLs share the ETag
+    etag = await current_etag(request, db, tables, key) if cache.checks_hits else None
+    cached = await cache.get(key, etag)
+    if cached is None:
+        epoch = await cache.epoch()
+        if not cache.checks_hits:
+            etag = await current_etag(request, db, tables, key)
+        if etag is not None and etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=etag_headers(etag))
+        cached = CachedResponse(etag, await render())
+        await cache.set(key, cached, epoch, group)
+    return _json_response(request, cached)
@@ -4,11 +4,12 @@ Handles JWT token dependencies and admin authentication.
 """
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.utils.jwt_utils import decode_token
-from app.models.admin import Admin
-from app.core.database import get_db
+from app.utils.jwt_utils import decode_token_cached
+from app.core.database import get_api_primary_db
+from app.services.admin_service import AdminIdentity, AsyncAdminService
 
 
 security = HTTPBearer(auto_error=False)
@@ -16,17 +17,17 @@ security = HTTPBearer(auto_error=False)
 
 async def get_current_admin(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> Admin:
+    db: Session | AsyncSession = Depends(get_api_primary_db)
+) -> AdminIdentity:
     """
     Dependency to verify JWT token and get current admin.
     
     Args:
         credentials: HTTP Bearer credentials
-        db: Database session
+        db: Primary database session (a replica may not have a new or changed admin yet)
         
     Returns:
-        Admin: Current authenticated admin
+        AdminIdentity: Current authenticated admin
         
     Raises:
         HTTPException: If token is invalid or admin not found
@@ -34,7 +35,7 @@ async def get_current_admin(
     token = credentials.credentials
     
     try:
-        payload = decode_token(token)
+        payload = decode_token_cached(token)
         admin_id: str = payload.get("sub")
         
         if admin_id is None:
@@ -48,7 +49,7 @@ async def get_current_admin(
             detail="Could not validate credentials",
         )
     
-    admin = db.query(Admin).filter(Admin.id == int(admin_id)).first()
+    admin = await AsyncAdminService.get_admin_identity(db, int(admin_id))
     
     if admin is None:
         raise HTTPException(
@@ -62,8 +63,8 @@ async def get_current_admin(
 async def get_current_admin_or_session(
     request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> Admin:
+    db: Session | AsyncSession = Depends(get_api_primary_db)
+) -> AdminIdentity:
     """
     Dependency to verify authentication via JWT token OR session cookie.
     Accepts both JWT tokens (for API clients) and session cookies (for web browsers).
@@ -71,10 +72,10 @@ async def get_current_admin_or_session(
     Args:
         request: FastAPI Request object (for session access)
         credentials: Optional HTTP Bearer credentials
-        db: Database session
+        db: Primary database session (a replica may not have a new or changed admin yet)
         
     Returns:
-        Admin: Current authenticated admin
+        AdminIdentity: Current authenticated admin
         
     Raises:
         HTTPException: If neither JWT token nor session is valid
@@ -85,11 +86,11 @@ async def get_current_admin_or_session(
     if credentials:
         try:
             token = credentials.credentials
-            payload = decode_token(token)
+            payload = decode_token_cached(token)
             admin_id: str = payload.get("sub")
             
             if admin_id:
-                admin = db.query(Admin).filter(Admin.id == int(admin_id)).first()
+                admin = await AsyncAdminService.get_admin_identity(db, int(admin_id))
         except Exception:
             pass
     
@@ -98,7 +99,7 @@ async def get_current_admin_or_session(
         admin_id = request.session.get("admin_id")
         if admin_id:
             try:
-                admin = db.query(Admin).filter(Admin.id == int(admin_id)).first()
+                admin = await AsyncAdminService.get_admin_identity(db, int(admin_id))
             except Exception:
                 pass
     
@@ -0,0 +1,151 @@
+"""
+Fast JSON serialization for API routers.
+
+FastAPI's default response pipeline validates an endpoint's return value
+against response_model, turns the result into Python primitives, and
+encodes those with the standard json module. Routers created with
+route_class=json_route_class(name) use FastJSONRoute instead, when
+FAST_JSON_ROUTERS lists the router. It validates once, from attributes,
+with a precompiled TypeAdapter per response schema, and lets that adapter
+write the JSON bytes directly. Values that already are instances of the
+response schema are not validated again. Routes without a response_model
+are encoded with orjson, when installed.
+"""
+import functools
+import inspect
+from typing import Any
+from fastapi import Response
+from fastapi.dependencies.utils import get_typed_signature
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from fastapi.utils import is_body_allowed_for_status_code
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # Optional: FastAPI's encoder for routes without a response_model
+    orjson = None
+
+
+# Parameter added to endpoints that take no Response themselves, to receive
+# the response FastAPI hands to dependencies (headers and status they set)
+_SUB_RESPONSE_PARAM = "fast_json_sub_response"
+
+
+# Bounded for the pruned schemas of sparse fieldsets (see app/core/fieldsets.py)
+@functools.lru_cache(maxsize=1024)
+def response_adapter(schema: Any) -> TypeAdapter:
+    """
+    Get the shared, precompiled TypeAdapter of a response schema.
+
+    Args:
+        schema: Response model, e.g. StudentResponse or list[CourseResponse]
+
+    Returns:
+        TypeAdapter: Adapter validating from attributes and dumping JSON bytes
+    """
+    return TypeAdapter(schema)
+
+
+def dump_response(schema: Any, value: Any, **options) -> bytes:
+    """
+    Serialize a value as a response schema in one validation pass.
+
+    Args:
+        schema: Response model
+        value: ORM object(s), dicts, or an instance of schema (not validated again)
+        **options: TypeAdapter.dump_json options (by_alias, exclude_none, ...)
+
+    Returns:
+        bytes: JSON body
+    """
+    adapter = response_adapter(schema)
+    if type(value) is not schema:
+        value = adapter.validate_python(value, from_attributes=True)
+    return adapter.dump_json(value, **options)
+
+
+class FastJSONRoute(APIRoute):
+    """APIRoute that encodes responses with the route's TypeAdapter (or orjson) instead of FastAPI's encoder."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        response_param = next(
+            (name for name, param in get_typed_signature(endpoint).parameters.items()
+             if inspect.isclass(param.annotation) and issubclass(param.annotation, Response)),
+            None,
+        )
+        is_coroutine = inspect.iscoroutinefunction(endpoint)
+
+        @functools.wraps(endpoint)
+        async def fast_endpoint(*args, **values):
+            sub_response = values[response_param] if response_param else values.pop(_SUB_RESPONSE_PARAM)
+            if is_coroutine:
+                result = await endpoint(*args, **values)
+            else:
+                result = await run_in_threadpool(endpoint, *args, **values)
+            return self.render(result, sub_response)
+
+        signature = get_typed_signature(endpoint)
+        if not response_param:
+            signature = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(_SUB_RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+            ])
+        fast_endpoint.__signature__ = signature
+
+        super().__init__(path, fast_endpoint, **kwargs)
+        self.original_endpoint = endpoint
+
+    def render(self, result: Any, sub_response: Response) -> Any:
+        """
+        Encode an endpoint's return value as the response.
+
+        Args:
+            result: Return value of the endpoint
+            sub_response: Response dependencies and the endpoint set headers and status on
+
+        Returns:
+            Response, or result unchanged for FastAPI to encode (Response
+            results, or no response_model and no orjson)
+        """
+        if isinstance(result, Response):
+            return result
+
+        if self.response_model is not None:
+            body = dump_response(
+                self.response_model,
+                result,
+                by_alias=self.response_model_by_alias,
+                exclude_unset=self.response_model_exclude_unset,
+                exclude_defaults=self.response_model_exclude_defaults,
+                exclude_none=self.response_model_exclude_none,
+                include=self.response_model_include,
+                exclude=self.response_model_exclude,
+            )
+        elif orjson is not None:
+            body = orjson.dumps(result, default=jsonable_encoder)
+        else:
+            return result
+
+        status_code = sub_response.status_code or self.status_code or 200
+        if not is_body_allowed_for_status_code(status_code):
+            response = Response(status_code=status_code)
+        else:
+            response = Response(body, status_code=status_code, media_type="application/json")
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+
+def json_route_class(router_name: str) -> type[APIRoute]:
+    """
+    Get the route class for a router: FastJSONRoute when FAST_JSON_ROUTERS lists it.
+
+    Args:
+        router_name: Router name as listed in FAST_JSON_ROUTERS, e.g. students
+
+    Returns:
+        FastJSONRoute or APIRoute
+    """
+    return FastJSONRoute if router_name in settings.fast_json_routers else APIRoute
@@ -0,0 +1,122 @@
+"""
+Fingerprinted, precompressed static assets.
+
+At startup every file under the static directory is hashed and compressed
+once (gzip, plus brotli when the optional brotli package is installed).
+Templates link to content-hashed URLs through the static_url() Jinja helper,
+e.g. /static/js/main.3f2a9c1b7d4e.js, which are served with the best encoding
+the client accepts and cached by browsers for a year: a changed file gets a
+new URL. Plain, unhashed URLs keep working with revalidation.
+"""
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+from app.core.compression import accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Only text-like files shrink enough to be worth compressing
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+MIN_COMPRESS_SIZE = 256
+
+
+class StaticAsset:
+    """One static file with its hashed URL path and precompressed bodies."""
+    
+    __slots__ = ("hashed_path", "media_type", "etag", "bodies")
+    
+    def __init__(self, hashed_path: str, media_type: str, etag: str, bodies: dict[str, bytes]):
+        self.hashed_path = hashed_path
+        self.media_type = media_type
+        self.etag = etag
+        self.bodies = bodies  # Content-Encoding ("identity", "gzip", "br") -> body
+
+
+def _compress(content: bytes) -> dict[str, bytes]:
+    """Precompress a file, keeping only encodings that make it smaller."""
+    bodies = {"identity": content}
+    candidates = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        candidates["br"] = brotli.compress(content, quality=11)
+    for encoding, body in candidates.items():
+        if len(body) < len(content):
+            bodies[encoding] = body
+    return bodies
+
+
+class AssetManifest:
+    """Maps static files to fingerprinted URLs and holds their precompressed bodies."""
+    
+    def __init__(self, directory: str | Path, url_prefix: str = "/static"):
+        self.directory = Path(directory)
+        self.url_prefix = url_prefix.rstrip("/")
+        self.urls: dict[str, str] = {}  # Logical path -> hashed path
+        self.assets: dict[str, StaticAsset] = {}  # Hashed path -> asset
+        self.build()
+    
+    def build(self) -> None:
+        """Hash and compress every file under the directory."""
+        urls, assets = {}, {}
+        for file in sorted(self.directory.rglob("*")):
+            if not file.is_file():
+                continue
+            logical = file.relative_to(self.directory).as_posix()
+            content = file.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            hashed = f"{logical[:-len(file.suffix)] if file.suffix else logical}.{digest}{file.suffix}"
+            
+            media_type = mimetypes.guess_type(file.name)[0] or "application/octet-stream"
+            compressible = media_type.startswith(COMPRESSIBLE_TYPES) and len(content) >= MIN_COMPRESS_SIZE
+            urls[logical] = hashed
+            assets[hashed] = StaticAsset(
+                hashed, media_type, f'"{digest}"', _compress(content) if compressible else {"identity": content}
+            )
+        self.urls, self.assets = urls, assets
+    
+    def url(self, path: str) -> str:
+        """
+        Get the URL of a static file (the Jinja static_url helper).
+        
+        Args:
+            path: Path under the static directory, e.g. js/main.js
+        
+        Returns:
+            str: Fingerprinted URL, or the plain URL for unknown files
+        """
+        return f"{self.url_prefix}/{self.urls.get(path, path)}"
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """StaticFiles that serves the manifest's hashed URLs precompressed and immutable."""
+    
+    def __init__(self, *, manifest: AssetManifest, **kwargs):
+        super().__init__(directory=manifest.directory, **kwargs)
+        self.manifest = manifest
+    
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        asset = self.manifest.assets.get(Path(path).as_posix())
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+        
+        request_headers = Headers(scope=scope)
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": asset.etag, "Vary": "Accept-Encoding"}
+        if request_headers.get("if-none-match") == asset.etag:
+            return Response(status_code=304, headers=headers)
+        
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding in ("br", "gzip"):
+            if encoding in asset.bodies and encoding in accepted:
+                headers["Content-Encoding"] = encoding
+                return Response(asset.bodies[encoding], media_type=asset.media_type, headers=headers)
+        return Response(asset.bodies["identity"], media_type=asset.media_type, headers=headers)
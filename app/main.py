@@ -5,15 +5,26 @@ Supports both API endpoints and web-based frontend with Jinja2 templates.
 """
 import logging
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from app.core.database import Base, engine
+from app.core.database import (
+    Base, PrimaryStickinessMiddleware, PRIMARY_UNTIL_HEADER, engine, async_engine, replica_engines, async_replica_engines
+)
 from app.core.config import settings
-from app.routers import auth_router, student_router, course_router, attendance_router, web_router
+from app.core.pool_metrics import get_pool_stats
+from app.core.compression import CompressionMiddleware
+from app.core.security import get_current_admin_or_session
+from app.core.static_assets import AssetManifest, FingerprintedStaticFiles
+from app.core.n_plus_one import NPlusOneMiddleware, install_n_plus_one_detection
+from app.services.admin_service import AdminIdentity, admin_identity_cache_stats
+from app.services.course_cache import course_cache_stats
+from app.services.stats_service import dashboard_stats_cache_stats
+from app.utils.hashing import shutdown_hashing_pool
+from app.utils.jwt_utils import token_cache_stats
+from app.routers import auth_router, student_router, course_router, attendance_router, export_router, purge_router, stats_router, web_router
 
 
 # Configure logging
@@ -44,9 +55,12 @@ app = FastAPI(
 template_dir = Path(__file__).parent / "templates"
 app.state.templates = Jinja2Templates(directory=str(template_dir))
 
-# Mount static files (CSS, JS, images)
+# Mount static files (CSS, JS, images): fingerprinted and precompressed at startup,
+# linked from templates with static_url('js/main.js')
 static_dir = Path(__file__).parent / "static"
-app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+static_assets = AssetManifest(static_dir, url_prefix="/static")
+app.mount("/static", FingerprintedStaticFiles(manifest=static_assets), name="static")
+app.state.templates.env.globals["static_url"] = static_assets.url
 
 
 # ---------------------------
@@ -60,18 +74,46 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", PRIMARY_UNTIL_HEADER],
 )
 
+# Read-your-writes: tells API clients until when to ask for the primary (see app/core/database.py)
+app.add_middleware(PrimaryStickinessMiddleware)
+
 app.add_middleware(
     SessionMiddleware,
     secret_key=settings.secret_key,
     session_cookie="session"        # IMPORTANT - only one cookie
 )
 
+# Response compression (outermost, so it sees the final responses)
+app.add_middleware(
+    CompressionMiddleware,
+    encodings=settings.compression_encodings,
+    minimum_size=settings.compression_minimum_size,
+    content_types=settings.compression_content_types,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+)
+
+# Development: N+1 lazy-load detection (N_PLUS_ONE_DETECTION=log|raise)
+if settings.n_plus_one_detection != "off":
+    install_n_plus_one_detection()
+    app.add_middleware(NPlusOneMiddleware)
+
+
+# Stop the password hashing worker processes with the server
+@app.on_event("shutdown")
+def stop_hashing_pool():
+    shutdown_hashing_pool()
+
 
 # Custom exception handler
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
+    if exc.status_code == status.HTTP_304_NOT_MODIFIED:
+        # Conditional GET: the client's copy is current, send its ETag without a body
+        return Response(status_code=exc.status_code, headers=exc.headers)
     return JSONResponse(
         status_code=exc.status_code,
         content={
@@ -90,6 +132,34 @@ def health_check():
     }
 
 
+# Connection pool statistics (for sizing the pool against real traffic; admins only)
+@app.get("/health/db")
+def database_health(current_admin: AdminIdentity = Depends(get_current_admin_or_session)):
+    stats = {
+        "status": "healthy",
+        "pool": get_pool_stats(engine.pool)
+    }
+    if async_engine is not None:
+        stats["async_pool"] = get_pool_stats(async_engine.pool)
+    if replica_engines:
+        stats["replica_pools"] = [get_pool_stats(replica.pool) for replica in replica_engines]
+    if async_replica_engines:
+        stats["async_replica_pools"] = [get_pool_stats(replica.pool) for replica in async_replica_engines]
+    return stats
+
+
+# In-process cache statistics (hit/miss counters, per worker process; admins only)
+@app.get("/health/cache")
+def cache_health(current_admin: AdminIdentity = Depends(get_current_admin_or_session)):
+    return {
+        "status": "healthy",
+        "admin_identity": admin_identity_cache_stats(),
+        "verified_tokens": token_cache_stats(),
+        "dashboard_stats": dashboard_stats_cache_stats(),
+        "course_responses": course_cache_stats()
+    }
+
+
 # Root endpoint
 @app.get("/")
 def root():
@@ -112,6 +182,9 @@ app.include_router(auth_router.router)     # Auth API
 app.include_router(student_router.router)  # Students API
 app.include_router(course_router.router)   # Courses API
 app.include_router(attendance_router.router)  # Attendance API
+app.include_router(export_router.router)   # Export API
+app.include_router(purge_router.router)    # Purge jobs API
+app.include_router(stats_router.router)    # Dashboard stats API
 
 
 logger.info("FastAPI application initialized successfully")
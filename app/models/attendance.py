@@ -1,21 +1,33 @@
 """
 Attendance model for tracking student attendance.
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 
+def _attendance_day_default(context):
+    """Derive attendance_day from attendance_date when it is not given explicitly."""
+    return context.get_current_parameters()["attendance_date"].date()
+
+
 class Attendance(Base):
     """Attendance model tracking student attendance in courses."""
     
     __tablename__ = "attendances"
+    __table_args__ = (
+        # One mark per student, course and day; also serves the per-student/course lookups
+        Index("uq_attendances_student_course_day", "student_id", "course_id", "attendance_day", unique=True),
+        # By-date lookups, optionally narrowed to a course
+        Index("ix_attendances_day_course", "attendance_day", "course_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
     course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False, index=True)
     attendance_date = Column(DateTime(timezone=True), nullable=False, index=True)
+    attendance_day = Column(Date, nullable=False, default=_attendance_day_default)
     is_present = Column(Boolean, default=True, nullable=False)
     remarks = Column(String(255), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -27,3 +39,18 @@ class Attendance(Base):
     
     def __repr__(self):
         return f"<Attendance(id={self.id}, student_id={self.student_id}, course_id={self.course_id}, date={self.attendance_date})>"
+
+
+class AttendanceSummary(Base):
+    """Per student and course attendance counters, kept in step with the attendances table."""
+    
+    __tablename__ = "attendance_summary"
+    
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    total_classes = Column(Integer, default=0, nullable=False)
+    present_classes = Column(Integer, default=0, nullable=False)
+    absent_classes = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<AttendanceSummary(student_id={self.student_id}, course_id={self.course_id}, total={self.total_classes})>"
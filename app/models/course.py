@@ -4,10 +4,11 @@ Course model representing a course in the system.
 from sqlalchemy import Column, Integer, String, DateTime, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.core.database import Base
+from app.core.database import Base, SoftDeleteMixin
+from app.models import table_version  # noqa: F401  (keeps the table versions up to date)
 
 
-class Course(Base):
+class Course(SoftDeleteMixin, Base):
     """Course model representing a course available in the system."""
     
     __tablename__ = "courses"
@@ -0,0 +1,26 @@
+"""
+Purge job model tracking background deletion of students or courses.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class PurgeJob(Base):
+    """Background removal of soft-deleted students or courses and their dependent rows."""
+    
+    __tablename__ = "purge_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String(20), nullable=False)  # student or course
+    target_ids = Column(Text, nullable=False)  # JSON list of ids
+    status = Column(String(20), default="pending", nullable=False)  # pending, running, done, failed
+    total_rows = Column(Integer, default=0, nullable=False)  # Attendance rows to remove (at start)
+    rows_deleted = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<PurgeJob(id={self.id}, entity={self.entity}, status={self.status})>"
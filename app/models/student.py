@@ -1,10 +1,11 @@
 """
 Student model representing a student in the system.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, Table, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Table, ForeignKey, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.core.database import Base
+from app.core.database import Base, SoftDeleteMixin
+from app.models import table_version  # noqa: F401  (keeps the table versions up to date)
 
 
 # Association table for many-to-many relationship between students and courses
@@ -16,14 +17,14 @@ student_course = Table(
 )
 
 
-class Student(Base):
+class Student(SoftDeleteMixin, Base):
     """Student model representing a student enrolled in the system."""
     
     __tablename__ = "students"
     
     id = Column(Integer, primary_key=True, index=True)
     first_name = Column(String(100), nullable=False)
-    last_name = Column(String(100), nullable=False)
+    last_name = Column(String(100), nullable=False, index=True)
     email = Column(String(120), unique=True, nullable=False, index=True)
     phone = Column(String(15), nullable=True)
     address = Column(Text, nullable=True)
@@ -39,3 +40,43 @@ class Student(Base):
     
     def __repr__(self):
         return f"<Student(id={self.id}, name={self.first_name} {self.last_name}, email={self.email})>"
+
+
+# Full-text search index over name and email, created together with the table.
+# MySQL: FULLTEXT index maintained by InnoDB.
+# SQLite: external-content FTS5 table kept in sync by triggers on students.
+STUDENT_FULLTEXT_DDL = [
+    DDL(
+        "ALTER TABLE students ADD FULLTEXT INDEX ft_students_name_email (first_name, last_name, email)"
+    ).execute_if(dialect=("mysql", "mariadb")),
+    DDL(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5("
+        "first_name, last_name, email, content='students', content_rowid='id', prefix='2 3')"
+    ).execute_if(dialect="sqlite"),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS students_fts_ai AFTER INSERT ON students BEGIN "
+        "INSERT INTO students_fts(rowid, first_name, last_name, email) "
+        "VALUES (new.id, new.first_name, new.last_name, new.email); END"
+    ).execute_if(dialect="sqlite"),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS students_fts_ad AFTER DELETE ON students BEGIN "
+        "INSERT INTO students_fts(students_fts, rowid, first_name, last_name, email) "
+        "VALUES ('delete', old.id, old.first_name, old.last_name, old.email); END"
+    ).execute_if(dialect="sqlite"),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS students_fts_au AFTER UPDATE OF first_name, last_name, email ON students BEGIN "
+        "INSERT INTO students_fts(students_fts, rowid, first_name, last_name, email) "
+        "VALUES ('delete', old.id, old.first_name, old.last_name, old.email); "
+        "INSERT INTO students_fts(rowid, first_name, last_name, email) "
+        "VALUES (new.id, new.first_name, new.last_name, new.email); END"
+    ).execute_if(dialect="sqlite"),
+]
+
+for _ddl in STUDENT_FULLTEXT_DDL:
+    event.listen(Student.__table__, "after_create", _ddl)
+
+event.listen(
+    Student.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS students_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,117 @@
+"""
+Table version model: a change counter per table, used to build ETags.
+
+Every session write to a tracked table (ORM flush or insert/update/delete
+statement) marks the table as changed, and the versions of the changed
+tables are bumped in a short transaction of their own once the write has
+committed. Bumping inside the writing transaction would hold the counter
+row's lock until its commit and serialize all writers of the table. A read
+racing the bump still sees the old version (a 304, or an ETag that changes
+again right away), which only costs the client an extra 200 later; a
+version never gets ahead of its data.
+"""
+import logging
+from itertools import chain
+from sqlalchemy import Column, DDL, Integer, String, event, inspect, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.database import Base
+
+
+logger = logging.getLogger(__name__)
+
+
+# Tables whose versions are kept (ETags of the student and course endpoints)
+TRACKED_TABLES = ("courses", "student_course", "students")
+
+# Session.info keys: tracked tables changed in the current transaction, and
+# those of the committing transaction, bumped once it has committed
+_CHANGED_KEY = "changed_tables"
+_COMMITTED_KEY = "committed_tables"
+
+
+class TableVersion(Base):
+    """Change counter of one table."""
+
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<TableVersion(table_name={self.table_name}, version={self.version})>"
+
+
+# One row per tracked table, created together with the table
+event.listen(
+    TableVersion.__table__,
+    "after_create",
+    DDL(
+        "INSERT INTO table_versions (table_name, version) VALUES "
+        + ", ".join(f"('{name}', 0)" for name in TRACKED_TABLES)
+    ),
+)
+
+
+def _mark_changed(session: Session, tables) -> None:
+    """Remember the tracked tables among tables as changed in this transaction."""
+    changed = [name for name in tables if name in TRACKED_TABLES]
+    if changed:
+        session.info.setdefault(_CHANGED_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_changes(session, flush_context) -> None:
+    """Mark the tables of flushed objects (and of changed many-to-many collections) as changed."""
+    # new/dirty/deleted and attribute history still show the pre-flush state here
+    deleted = session.deleted
+    for obj in chain(session.new, session.dirty, deleted):
+        state = inspect(obj)
+        tables = [table.name for table in state.mapper.tables]
+        for relationship in state.mapper.relationships:
+            if relationship.secondary is not None and (
+                obj in deleted or state.attrs[relationship.key].history.has_changes()
+            ):
+                tables.append(relationship.secondary.name)
+        _mark_changed(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_changes(orm_execute_state) -> None:
+    """Mark the target table of insert, update and delete statements as changed."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_changed(orm_execute_state.session, [orm_execute_state.statement.table.name])
+
+
+@event.listens_for(Session, "before_commit")
+def _collect_committed_changes(session) -> None:
+    """Set aside the tables changed in the committing transaction, for _bump_table_versions."""
+    session.flush()  # Commit would flush after this hook; track those changes too
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed:
+        session.info[_COMMITTED_KEY] = changed
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_table_versions(session) -> None:
+    """Bump the versions of the tables changed in the committed transaction, in a transaction of their own."""
+    changed = session.info.pop(_COMMITTED_KEY, None)
+    if not changed:
+        return
+    try:
+        with session.get_bind().begin() as connection:
+            connection.execute(
+                update(TableVersion.__table__)
+                .where(TableVersion.table_name.in_(sorted(changed)))
+                .values(version=TableVersion.version + 1)
+            )
+    except SQLAlchemyError as e:
+        # The write is committed; its ETags catch up with the next bump of these tables
+        logger.error(f"Could not bump table versions of {', '.join(sorted(changed))}: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changes(session) -> None:
+    """Rolled-back changes leave the versions alone."""
+    session.info.pop(_CHANGED_KEY, None)
+    session.info.pop(_COMMITTED_KEY, None)
@@ -3,121 +3,217 @@ Attendance router for attendance management endpoints.
 """
 import logging
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_api_db
+from app.core.fieldsets import parse_fields, sparse_response
 from app.core.security import get_current_admin_or_session
-from app.models.admin import Admin
-from app.schemas.attendance import AttendanceCreate, AttendanceResponse, AttendanceUpdate, AttendanceDetailResponse
-from app.services.attendance_service import AttendanceService
+from app.core.serialization import json_route_class
+from app.services.admin_service import AdminIdentity
+from app.schemas.attendance import (
+    AttendanceCreate, AttendanceResponse, AttendanceUpdate, AttendanceDetailResponse, AttendanceBulkCreate, AttendanceBulkResponse,
+    AttendanceReportResponse
+)
+from app.services.attendance_service import AsyncAttendanceService
 
 
-router = APIRouter(prefix="/api/attendance", tags=["Attendance"])
+router = APIRouter(prefix="/api/attendance", tags=["Attendance"], route_class=json_route_class("attendance"))
 logger = logging.getLogger(__name__)
 
 
 @router.post("/", response_model=AttendanceResponse, status_code=status.HTTP_201_CREATED)
-def mark_attendance(
+async def mark_attendance(
     attendance_data: AttendanceCreate,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    response: Response,
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Mark attendance for a student in a course.
     
+    Responds 201 for the day's first mark, and 200 when it updates the mark
+    already recorded for that student, course and day.
+    
     Args:
         attendance_data: Attendance data
+        response: Response (its status tells a new mark from an update)
         db: Database session
         current_admin: Current authenticated admin
         
     Returns:
-        AttendanceResponse: Created attendance record
+        AttendanceResponse: Created or updated attendance record
     """
     try:
-        attendance = AttendanceService.mark_attendance(db, attendance_data)
+        attendance = await AsyncAttendanceService.mark_attendance(db, attendance_data)
+        if attendance.updated_at is not None:  # Only updates set it
+            response.status_code = status.HTTP_200_OK
         return attendance
     except ValueError as e:
         logger.error(f"Attendance marking error: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post("/bulk", response_model=AttendanceBulkResponse)
+async def mark_attendance_bulk(
+    bulk_data: AttendanceBulkCreate,
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
+):
+    """
+    Mark attendance for a whole course roster on one date.
+    
+    Students already marked that day are updated. Unknown or repeated
+    student ids are reported per student without failing the others.
+    
+    Args:
+        bulk_data: Course, date and per-student entries
+        db: Database session
+        current_admin: Current authenticated admin
+        
+    Returns:
+        AttendanceBulkResponse: Counts and per-student results
+    """
+    try:
+        return await AsyncAttendanceService.mark_attendance_bulk(db, bulk_data)
+    except ValueError as e:
+        logger.error(f"Bulk attendance marking error: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/{attendance_id}", response_model=AttendanceDetailResponse)
-def get_attendance(
+async def get_attendance(
     attendance_id: int,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    response: Response,
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,is_present,student"),
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Get an attendance record by ID.
     
     Args:
         attendance_id: Attendance ID
+        response: Response (its headers are kept for sparse fieldsets)
+        fields: Fields to return (default: all; student and course are loaded only when requested)
         db: Database session
         current_admin: Current authenticated admin
         
     Returns:
         AttendanceDetailResponse: Attendance record details
     """
-    attendance = AttendanceService.get_attendance_by_id(db, attendance_id)
+    try:
+        requested = parse_fields(fields, AttendanceDetailResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    attendance = await AsyncAttendanceService.get_attendance_detail(db, attendance_id, requested)
     
     if not attendance:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attendance record not found")
     
+    if requested:
+        return sparse_response(AttendanceDetailResponse, attendance, requested, response)
     return attendance
 
 
 @router.get("/student/{student_id}", response_model=list[AttendanceResponse])
-def get_student_attendance(
+async def get_student_attendance(
     student_id: int,
+    response: Response,
     course_id: int | None = Query(None),
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    fields: str | None = Query(None, description="Comma-separated attendance fields to return, e.g. student_id,is_present"),
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Get attendance records for a student.
     
     Args:
         student_id: Student ID
+        response: Response (its headers are kept for sparse fieldsets)
         course_id: Optional course ID to filter
+        fields: Attendance fields to return (default: all)
         db: Database session
         current_admin: Current authenticated admin
         
     Returns:
         list: List of attendance records
     """
-    attendance_records = AttendanceService.get_attendance_by_student(db, student_id, course_id)
+    try:
+        requested = parse_fields(fields, AttendanceResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    attendance_records = await AsyncAttendanceService.get_attendance_by_student(db, student_id, course_id, requested)
+    if requested:
+        return sparse_response(list[AttendanceResponse], attendance_records, requested, response)
     return attendance_records
 
 
 @router.get("/date/{attendance_date}", response_model=list[AttendanceResponse])
-def get_attendance_by_date(
+async def get_attendance_by_date(
     attendance_date: date,
+    response: Response,
     course_id: int | None = Query(None),
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    fields: str | None = Query(None, description="Comma-separated attendance fields to return, e.g. student_id,is_present"),
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Get attendance records for a specific date.
     
     Args:
         attendance_date: Attendance date
+        response: Response (its headers are kept for sparse fieldsets)
         course_id: Optional course ID to filter
+        fields: Attendance fields to return (default: all)
         db: Database session
         current_admin: Current authenticated admin
         
     Returns:
         list: List of attendance records
     """
-    attendance_records = AttendanceService.get_attendance_by_date(db, attendance_date, course_id)
+    try:
+        requested = parse_fields(fields, AttendanceResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    attendance_records = await AsyncAttendanceService.get_attendance_by_date(db, attendance_date, course_id, requested)
+    if requested:
+        return sparse_response(list[AttendanceResponse], attendance_records, requested, response)
     return attendance_records
 
 
-@router.get("/report/{student_id}/{course_id}")
-def get_attendance_report(
+@router.get("/report/course/{course_id}", response_model=list[AttendanceReportResponse])
+async def get_course_attendance_report(
+    course_id: int,
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
+):
+    """
+    Get attendance reports for every student enrolled in a course.
+    
+    Args:
+        course_id: Course ID
+        db: Database session
+        current_admin: Current authenticated admin
+        
+    Returns:
+        list: Attendance report per enrolled student
+    """
+    try:
+        return await AsyncAttendanceService.get_course_attendance_report(db, course_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get("/report/{student_id}/{course_id}", response_model=AttendanceReportResponse)
+async def get_attendance_report(
     student_id: int,
     course_id: int,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Get attendance report for a student in a course.
@@ -129,21 +225,21 @@ def get_attendance_report(
         current_admin: Current authenticated admin
         
     Returns:
-        dict: Attendance report with statistics
+        AttendanceReportResponse: Attendance report with statistics
     """
     try:
-        report = AttendanceService.get_attendance_report(db, student_id, course_id)
+        report = await AsyncAttendanceService.get_attendance_report(db, student_id, course_id)
         return report
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
 @router.put("/{attendance_id}", response_model=AttendanceResponse)
-def update_attendance(
+async def update_attendance(
     attendance_id: int,
     attendance_data: AttendanceUpdate,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Update an attendance record.
@@ -157,7 +253,7 @@ def update_attendance(
     Returns:
         AttendanceResponse: Updated attendance record
     """
-    attendance = AttendanceService.update_attendance(db, attendance_id, attendance_data)
+    attendance = await AsyncAttendanceService.update_attendance(db, attendance_id, attendance_data)
     
     if not attendance:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attendance record not found")
@@ -166,10 +262,10 @@ def update_attendance(
 
 
 @router.delete("/{attendance_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_attendance(
+async def delete_attendance(
     attendance_id: int,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Delete an attendance record.
@@ -179,7 +275,7 @@ def delete_attendance(
         db: Database session
         current_admin: Current authenticated admin
     """
-    deleted = AttendanceService.delete_attendance(db, attendance_id)
+    deleted = await AsyncAttendanceService.delete_attendance(db, attendance_id)
     
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attendance record not found")
@@ -4,18 +4,31 @@ Authentication router for admin login.
 import logging
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.schemas.admin import AdminLogin, Token, AdminCreate, AdminResponse
-from app.services.admin_service import AdminService
+from app.core.database import get_api_db, get_db
+from app.core.security import get_current_admin_or_session
+from app.schemas.admin import AdminActiveUpdate, AdminLogin, Token, AdminCreate, AdminResponse
+from app.services.admin_service import AdminIdentity, AdminService, AsyncAdminService
+from app.utils.hashing import HashingBusyError
 from app.utils.jwt_utils import create_access_token
 from app.core.config import settings
+from app.core.serialization import json_route_class
 
 
-router = APIRouter(prefix="/api/auth", tags=["Authentication"])
+router = APIRouter(prefix="/api/auth", tags=["Authentication"], route_class=json_route_class("auth"))
 logger = logging.getLogger(__name__)
 
 
+def _hashing_busy() -> HTTPException:
+    """503 for requests turned away by the full password hashing queue."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/register", response_model=AdminResponse)
 def register_admin(admin_data: AdminCreate, db: Session = Depends(get_db)):
     """
@@ -34,6 +47,8 @@ def register_admin(admin_data: AdminCreate, db: Session = Depends(get_db)):
     except ValueError as e:
         logger.error(f"Registration error: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HashingBusyError:
+        raise _hashing_busy()
 
 
 @router.post("/login", response_model=Token)
@@ -48,9 +63,14 @@ def login(login_data: AdminLogin, db: Session = Depends(get_db)):
     Returns:
         Token: JWT access token
     """
-    admin = AdminService.verify_admin_password(db, login_data.username, login_data.password)
+    try:
+        admin = AdminService.verify_admin_password(db, login_data.username, login_data.password)
+    except HashingBusyError:
+        logger.warning(f"Login for {login_data.username} rejected: password hashing queue is full")
+        raise _hashing_busy()
     
     if not admin:
+        # Also for deactivated admins
         logger.warning(f"Failed login attempt for username: {login_data.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -71,3 +91,37 @@ def login(login_data: AdminLogin, db: Session = Depends(get_db)):
         "token_type": "bearer",
         "expires_in": settings.access_token_expire_minutes * 60
     }
+
+
+@router.put("/admins/{admin_id}/active", response_model=AdminResponse)
+async def set_admin_active(
+    admin_id: int,
+    active_data: AdminActiveUpdate,
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
+):
+    """
+    Activate or deactivate an admin.
+    
+    A deactivated admin can no longer log in, and their existing tokens and
+    web sessions are rejected.
+    
+    Args:
+        admin_id: Admin ID
+        active_data: New state
+        db: Database session
+        current_admin: Current authenticated admin
+        
+    Returns:
+        AdminResponse: Updated admin details
+    """
+    if admin_id == current_admin.id and not active_data.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Admins cannot deactivate themselves")
+    
+    admin = await AsyncAdminService.set_admin_active(db, admin_id, active_data.is_active)
+    
+    if not admin:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin not found")
+    
+    logger.info(f"Admin {current_admin.username} set admin {admin.username} active={admin.is_active}")
+    return admin
@@ -2,24 +2,42 @@
 Course router for course management endpoints.
 """
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_api_db, get_api_primary_db
+from app.core.etag import apply_etag
+from app.core.fieldsets import parse_fields, sparse_model, sparse_response
+from app.core.response_cache import serve_cached
 from app.core.security import get_current_admin_or_session
-from app.models.admin import Admin
-from app.schemas.course import CourseCreate, CourseResponse, CourseUpdate, CourseDetailResponse
-from app.services.course_service import CourseService
+from app.core.serialization import dump_response, json_route_class
+from app.services.admin_service import AdminIdentity
+from app.schemas.course import (
+    CourseCreate, CourseResponse, CourseUpdate, CourseDetailResponse, EnrollmentBulkRequest, EnrollmentBulkResponse
+)
+from app.schemas.purge_job import PurgeJobResponse
+from app.services.course_cache import course_detail_key, course_listing_key, course_response_cache, COURSE_LISTINGS_GROUP
+from app.services.course_service import AsyncCourseService
+from app.services.purge_service import PurgeService
 
 
-router = APIRouter(prefix="/api/courses", tags=["Courses"])
+router = APIRouter(prefix="/api/courses", tags=["Courses"], route_class=json_route_class("courses"))
 logger = logging.getLogger(__name__)
 
+# Response header carrying the cursor for the next page in cursor mode
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Tables each response is built from (for its ETag)
+COURSE_LIST_TABLES = ("courses",)
+COURSE_DETAIL_TABLES = ("courses", "student_course", "students")
+
 
 @router.post("/", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
-def create_course(
+async def create_course(
     course_data: CourseCreate,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Create a new course.
@@ -33,7 +51,7 @@ def create_course(
         CourseResponse: Created course details
     """
     try:
-        course = CourseService.create_course(db, course_data)
+        course = await AsyncCourseService.create_course(db, course_data)
         return course
     except ValueError as e:
         logger.error(f"Course creation error: {str(e)}")
@@ -41,59 +59,134 @@ def create_course(
 
 
 @router.get("/", response_model=list[CourseResponse])
-def list_courses(
+async def list_courses(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    after: str | None = Query(None, description="Cursor from a previous page's X-Next-Cursor header"),
+    sort: str = Query("id", description="Sort key: id, name or code"),
+    cursor: bool = Query(False, description="Use cursor pagination for the first page"),
+    fields: str | None = Query(None, description="Comma-separated course fields to return, e.g. id,name,code"),
+    db: Session | AsyncSession = Depends(get_api_db),
+    primary_db: Session | AsyncSession = Depends(get_api_primary_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     List all courses with pagination.
     
+    In cursor mode (after, or cursor=true for the first page) the cursor for
+    the next page is returned in the X-Next-Cursor header. Offset pages are
+    served from the course response cache, one entry per fieldset, and
+    rendered on the primary (see serve_cached).
+    
     Args:
+        request: Incoming request
+        response: Response (for the next-cursor and ETag headers)
         skip: Number of records to skip
         limit: Maximum number of records
+        after: Cursor to continue after
+        sort: Sort key
+        cursor: Start cursor pagination without a cursor
+        fields: Course fields to return (default: all)
         db: Database session
+        primary_db: Primary database session (cached pages)
         current_admin: Current authenticated admin
         
     Returns:
         list: List of courses
     """
-    courses, _ = CourseService.get_all_courses(db, skip, limit)
-    return courses
+    try:
+        requested = parse_fields(fields, CourseResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if after or cursor:
+        await apply_etag(request, response, db, COURSE_LIST_TABLES)
+        try:
+            courses, next_cursor = await AsyncCourseService.get_courses_after(db, limit, after, sort, requested)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        if requested:
+            return sparse_response(list[CourseResponse], courses, requested, response)
+        return courses
+    
+    async def render() -> bytes:
+        try:
+            # The listing has no total field: skip the COUNT
+            courses, _ = await AsyncCourseService.get_all_courses(
+                primary_db, skip, limit, sort, requested, with_total=False
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return dump_response(sparse_model(list[CourseResponse], requested), courses)
+    
+    return await serve_cached(
+        request, course_response_cache, course_listing_key(skip, limit, sort, requested), render,
+        primary_db, COURSE_LIST_TABLES, group=COURSE_LISTINGS_GROUP
+    )
 
 
 @router.get("/{course_id}", response_model=CourseDetailResponse)
-def get_course(
+async def get_course(
+    request: Request,
+    response: Response,
     course_id: int,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,name,students"),
+    db: Session | AsyncSession = Depends(get_api_db),
+    primary_db: Session | AsyncSession = Depends(get_api_primary_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
-    Get a specific course by ID.
+    Get a specific course by ID, from the course response cache when possible.
+    
+    Sparse fieldsets are not cached: a course's cached detail has one key,
+    which writes drop exactly. The cached detail is rendered on the primary
+    (see serve_cached).
     
     Args:
+        request: Incoming request
+        response: Response (for the ETag headers of sparse fieldsets)
         course_id: Course ID
+        fields: Fields to return (default: all; the roster is loaded only when requested)
         db: Database session
+        primary_db: Primary database session (cached detail)
         current_admin: Current authenticated admin
         
     Returns:
         CourseDetailResponse: Course details with enrolled students
     """
-    course = CourseService.get_course_by_id(db, course_id)
+    try:
+        requested = parse_fields(fields, CourseDetailResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    if not course:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    if requested:
+        await apply_etag(request, response, db, COURSE_DETAIL_TABLES)
+        course = await AsyncCourseService.get_course_detail(db, course_id, requested)
+        if not course:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+        return sparse_response(CourseDetailResponse, course, requested, response)
     
-    return course
+    async def render() -> bytes:
+        course = await AsyncCourseService.get_course_detail(primary_db, course_id)
+        if not course:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+        return dump_response(CourseDetailResponse, course)
+    
+    return await serve_cached(
+        request, course_response_cache, course_detail_key(course_id), render, primary_db, COURSE_DETAIL_TABLES
+    )
 
 
 @router.put("/{course_id}", response_model=CourseResponse)
-def update_course(
+async def update_course(
     course_id: int,
     course_data: CourseUpdate,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Update a course.
@@ -107,7 +200,7 @@ def update_course(
     Returns:
         CourseResponse: Updated course details
     """
-    course = CourseService.update_course(db, course_id, course_data)
+    course = await AsyncCourseService.update_course(db, course_id, course_data)
     
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
@@ -116,21 +209,67 @@ def update_course(
 
 
 @router.delete("/{course_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_course(
+async def delete_course(
     course_id: int,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    background_tasks: BackgroundTasks,
+    mode: str = Query("sync", pattern="^(sync|async)$", description="sync, or async (hide now, purge in the background)"),
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
-    Delete a course.
+    Delete a course with its attendance and enrollments.
+    
+    In async mode the course is hidden at once and the response is 202 with
+    a purge job; follow its progress at /api/purge-jobs/{job_id}.
     
     Args:
         course_id: Course ID
+        background_tasks: Runs the purge job after the response (async mode)
+        mode: sync or async
         db: Database session
         current_admin: Current authenticated admin
     """
-    deleted = CourseService.delete_course(db, course_id)
+    if mode == "async":
+        job = await AsyncCourseService.purge_course(db, course_id)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+        background_tasks.add_task(PurgeService.run_purge_job, job.id)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=PurgeJobResponse.model_validate(job).model_dump(mode="json")
+        )
+    
+    deleted = await AsyncCourseService.delete_course(db, course_id)
     
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
 
+
+@router.post("/{course_id}/enrollments/bulk", response_model=EnrollmentBulkResponse)
+async def bulk_update_enrollments(
+    course_id: int,
+    enrollment_data: EnrollmentBulkRequest,
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
+):
+    """
+    Enroll or unenroll many students in a course at once.
+    
+    Idempotent: students already enrolled (add) or not enrolled (remove)
+    are counted as skipped; unknown student ids as missing.
+    
+    Args:
+        course_id: Course ID
+        enrollment_data: Student IDs and action
+        db: Database session
+        current_admin: Current authenticated admin
+        
+    Returns:
+        EnrollmentBulkResponse: Added/removed, skipped and missing counts
+    """
+    try:
+        return await AsyncCourseService.bulk_update_enrollments(
+            db, course_id, enrollment_data.student_ids, enrollment_data.action
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
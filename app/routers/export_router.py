@@ -0,0 +1,86 @@
+"""
+Export router for streaming CSV/NDJSON exports.
+"""
+import logging
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.database import choose_api_session_factory
+from app.core.security import get_current_admin_or_session
+from app.services.admin_service import AdminIdentity
+from app.services.export_service import EXPORTS, EXPORT_FORMATS, ExportEncoder, ExportService
+
+
+router = APIRouter(prefix="/api/export", tags=["Export"])
+logger = logging.getLogger(__name__)
+
+
+def _sync_body(session_factory, stmt, encoder: ExportEncoder):
+    """Response body over a sync session; Starlette iterates it in the threadpool."""
+    with session_factory() as db:
+        yield encoder.header()
+        for partition in ExportService.iter_partitions(db, stmt):
+            yield encoder.encode(partition)
+        yield encoder.finish()
+
+
+async def _async_body(session_factory, stmt, encoder: ExportEncoder):
+    """Response body over an async session."""
+    async with session_factory() as db:
+        yield encoder.header()
+        async for partition in ExportService.aiter_partitions(db, stmt):
+            yield encoder.encode(partition)
+        yield encoder.finish()
+
+
+@router.get("/{kind}")
+async def export_table(
+    kind: str,
+    request: Request,
+    format: str = Query("csv", description="csv or ndjson"),
+    gzip: bool = Query(False, description="Gzip-compress the file"),
+    course_id: int | None = Query(None, description="Only rows for this course"),
+    date_from: date | None = Query(None, description="First day to include"),
+    date_to: date | None = Query(None, description="Last day to include"),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
+):
+    """
+    Stream a full export of students, courses or attendance.
+
+    Rows are streamed from a server-side cursor as they are read, so exports
+    of any size use constant memory. Dates filter enrollment (students),
+    creation (courses) or attendance day (attendance).
+
+    Args:
+        kind: students, courses or attendance
+        request: Incoming request (used for read-replica routing)
+        format: Output format
+        gzip: Whether to compress the output
+        course_id: Optional course filter
+        date_from: Optional first day (inclusive)
+        date_to: Optional last day (inclusive)
+        current_admin: Current authenticated admin
+
+    Returns:
+        StreamingResponse: The export file
+    """
+    if kind not in EXPORTS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown export '{kind}'")
+
+    try:
+        stmt = ExportService.export_query(kind, course_id, date_from, date_to)
+        encoder = ExportEncoder(format, EXPORTS[kind], compress=gzip)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    session_factory = choose_api_session_factory(request)
+    body = _async_body if settings.db_async else _sync_body
+
+    filename = f"{kind}.{format}" + (".gz" if gzip else "")
+    logger.info(f"Export of {kind} as {filename} started")
+    return StreamingResponse(
+        body(session_factory, stmt, encoder),
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
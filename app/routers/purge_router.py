@@ -0,0 +1,42 @@
+"""
+Purge job router for following background deletions.
+"""
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.database import get_api_db
+from app.core.security import get_current_admin_or_session
+from app.core.serialization import json_route_class
+from app.services.admin_service import AdminIdentity
+from app.schemas.purge_job import PurgeJobResponse
+from app.services.purge_service import AsyncPurgeService
+
+
+router = APIRouter(prefix="/api/purge-jobs", tags=["Purge jobs"], route_class=json_route_class("purge_jobs"))
+logger = logging.getLogger(__name__)
+
+
+@router.get("/{job_id}", response_model=PurgeJobResponse)
+async def get_purge_job(
+    job_id: int,
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
+):
+    """
+    Get a purge job's status and progress.
+    
+    Args:
+        job_id: Purge job ID
+        db: Database session
+        current_admin: Current authenticated admin
+        
+    Returns:
+        PurgeJobResponse: Job status and progress
+    """
+    job = await AsyncPurgeService.get_purge_job(db, job_id)
+    
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Purge job not found")
+    
+    return job
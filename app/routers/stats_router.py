@@ -0,0 +1,39 @@
+"""
+Stats router for dashboard statistics.
+"""
+import logging
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.database import get_api_primary_db
+from app.core.security import get_current_admin_or_session
+from app.core.serialization import json_route_class
+from app.services.admin_service import AdminIdentity
+from app.schemas.stats import DashboardStatsResponse
+from app.services.stats_service import AsyncStatsService
+
+
+router = APIRouter(prefix="/api/stats", tags=["Stats"], route_class=json_route_class("stats"))
+logger = logging.getLogger(__name__)
+
+
+@router.get("", response_model=DashboardStatsResponse)
+async def get_dashboard_stats(
+    db: Session | AsyncSession = Depends(get_api_primary_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
+):
+    """
+    Get the dashboard statistics.
+    
+    Served from a short-lived cache that writes invalidate, so the
+    dashboard can poll it cheaply. Computed on the primary, so a refill
+    right after a write's invalidation does not cache a lagging replica.
+    
+    Args:
+        db: Primary database session (only used on a cache miss)
+        current_admin: Current authenticated admin
+    
+    Returns:
+        DashboardStatsResponse: Dashboard numbers
+    """
+    return await AsyncStatsService.get_dashboard_stats(db)
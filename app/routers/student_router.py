@@ -2,24 +2,37 @@
 Student router for student management endpoints.
 """
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_api_db
+from app.core.etag import conditional_get
+from app.core.fieldsets import parse_fields, sparse_response
 from app.core.security import get_current_admin_or_session
-from app.models.admin import Admin
-from app.schemas.student import StudentCreate, StudentResponse, StudentUpdate, StudentListResponse, StudentDetailResponse
-from app.services.student_service import StudentService
+from app.core.serialization import json_route_class
+from app.services.admin_service import AdminIdentity
+from app.schemas.student import (
+    StudentCreate, StudentResponse, StudentUpdate, StudentListResponse, StudentDetailResponse, StudentBulkImportResponse,
+    StudentBulkDeleteRequest, StudentBulkDeleteResponse
+)
+from app.schemas.purge_job import PurgeJobResponse
+from app.services.purge_service import PurgeService
+from app.services.student_service import AsyncStudentService, BULK_IMPORT_CHUNK_SIZE, BULK_IMPORT_MAX_ERRORS
+from app.utils.bulk_import import ErrorReport, detect_format, iter_records
 
 
-router = APIRouter(prefix="/api/students", tags=["Students"])
+router = APIRouter(prefix="/api/students", tags=["Students"], route_class=json_route_class("students"))
 logger = logging.getLogger(__name__)
 
 
 @router.post("/", response_model=StudentResponse, status_code=status.HTTP_201_CREATED)
-def create_student(
+async def create_student(
     student_data: StudentCreate,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Create a new student.
@@ -33,7 +46,7 @@ def create_student(
         StudentResponse: Created student details
     """
     try:
-        student = StudentService.create_student(db, student_data)
+        student = await AsyncStudentService.create_student(db, student_data)
         return student
     except ValueError as e:
         logger.error(f"Student creation error: {str(e)}")
@@ -41,70 +54,238 @@ def create_student(
 
 
 @router.get("/", response_model=StudentListResponse)
-def list_students(
+async def list_students(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     search: str = Query(None),
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    after: str | None = Query(None, description="Cursor from a previous page's next_cursor"),
+    sort: str = Query("id", description="Sort key: id, last_name or email"),
+    cursor: bool = Query(False, description="Use cursor pagination for the first page"),
+    include_total: bool | None = Query(None, description="Return a total (default: yes in offset mode, no in cursor mode)"),
+    total_mode: str | None = Query(None, description="exact, cached (short-TTL exact count) or estimated (table statistics); default: STUDENT_TOTAL_MODE"),
+    fields: str | None = Query(None, description="Comma-separated student fields to return, e.g. id,first_name,last_name,email"),
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session),
+    etag: str | None = Depends(conditional_get("students"))
 ):
     """
     List all students with pagination and optional search.
     
+    Offset mode (skip/limit) returns total and page. Cursor mode (after, or
+    cursor=true for the first page) returns next_cursor instead and stays
+    fast on deep pages. total_kind says how the total was obtained. fields
+    limits the students to those fields, and the query to their columns.
+    
     Args:
+        response: Response (carries the ETag when fields are given)
         skip: Number of records to skip
         limit: Maximum number of records
         search: Optional search term
+        after: Cursor to continue after
+        sort: Sort key
+        cursor: Start cursor pagination without a cursor
+        include_total: Whether to return a total
+        total_mode: How to count the total (default: settings.student_total_mode)
+        fields: Student fields to return (default: all)
         db: Database session
         current_admin: Current authenticated admin
+        etag: ETag of the response (a matching If-None-Match gets 304 before anything is loaded)
         
     Returns:
         StudentListResponse: Paginated list of students
     """
-    if search:
-        students, total = StudentService.search_students(db, search, skip, limit)
-    else:
-        students, total = StudentService.get_students(db, skip, limit)
+    cursor_mode = bool(after or cursor)
+    if include_total is None:
+        include_total = not cursor_mode
+    count_mode = (total_mode or settings.student_total_mode) if include_total else None
+    
+    try:
+        requested = parse_fields(fields, StudentResponse)
+        if cursor_mode:
+            if search:
+                raise ValueError("Cursor pagination is not supported together with search")
+            students, next_cursor = await AsyncStudentService.get_students_after(db, limit, after, sort, requested)
+            total, total_kind = (
+                await AsyncStudentService.count_students(db, mode=count_mode) if count_mode else (None, None)
+            )
+            result = {
+                "total": total,
+                "total_kind": total_kind,
+                "limit": limit,
+                "students": students,
+                "next_cursor": next_cursor
+            }
+        else:
+            if search:
+                students, total, total_kind = await AsyncStudentService.search_students(
+                    db, search, skip, limit, count_mode, requested
+                )
+            else:
+                students, total, total_kind = await AsyncStudentService.get_students(
+                    db, skip, limit, sort, count_mode, requested
+                )
+            result = {
+                "total": total,
+                "total_kind": total_kind,
+                "page": skip // limit + 1,
+                "limit": limit,
+                "students": students
+            }
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if requested:
+        return sparse_response(StudentListResponse, result, requested, response, items="students")
+    return result
+
+
+@router.post("/bulk", response_model=StudentBulkImportResponse)
+async def bulk_import_students(
+    request: Request,
+    format: str | None = Query(None, description="csv or ndjson (default: from Content-Type)"),
+    chunk_size: int = Query(BULK_IMPORT_CHUNK_SIZE, ge=1, le=10000, description="Rows per INSERT and commit"),
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
+):
+    """
+    Import students from a streamed CSV or NDJSON request body.
+    
+    The body is parsed as it arrives and rows are inserted chunk by chunk
+    (one multi-row INSERT and commit per chunk), so memory stays flat for
+    large files. Rows that fail validation or have a duplicate email are
+    skipped and listed in the report (the first BULK_IMPORT_MAX_ERRORS by
+    row; failed counts them all); earlier chunks stay committed.
+    
+    Args:
+        request: Incoming request (body read as a stream)
+        format: Upload format
+        chunk_size: Rows per INSERT and commit
+        db: Database session
+        current_admin: Current authenticated admin
+        
+    Returns:
+        StudentBulkImportResponse: Counts and per-row errors
+    """
+    try:
+        fmt = detect_format(request.headers.get("content-type"), format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
+    total_rows = 0
+    inserted = 0
+    errors = ErrorReport(BULK_IMPORT_MAX_ERRORS)
+    chunk = []
+    
+    async for row_number, record, parse_error in iter_records(request.stream(), fmt):
+        total_rows += 1
+        if parse_error:
+            errors.add({"row": row_number, "errors": [parse_error]})
+            continue
+        try:
+            chunk.append((row_number, StudentCreate(**record)))
+        except ValidationError as e:
+            errors.add({
+                "row": row_number,
+                "email": record.get("email") if isinstance(record.get("email"), str) else None,
+                "errors": [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+            })
+            continue
+        
+        if len(chunk) >= chunk_size:
+            chunk_inserted, chunk_errors = await AsyncStudentService.bulk_create_students(db, chunk)
+            inserted += chunk_inserted
+            errors.extend(chunk_errors)
+            chunk = []
+    
+    if chunk:
+        chunk_inserted, chunk_errors = await AsyncStudentService.bulk_create_students(db, chunk)
+        inserted += chunk_inserted
+        errors.extend(chunk_errors)
+    
+    logger.info(f"Bulk import: {inserted} of {total_rows} rows inserted")
     return {
-        "total": total,
-        "page": skip // limit + 1,
-        "limit": limit,
-        "students": students
+        "total_rows": total_rows,
+        "inserted": inserted,
+        "failed": total_rows - inserted,
+        "errors": errors.errors(),
+        "errors_truncated": errors.truncated
     }
 
 
+@router.post("/bulk-delete", response_model=StudentBulkDeleteResponse)
+async def bulk_delete_students(
+    delete_data: StudentBulkDeleteRequest,
+    background_tasks: BackgroundTasks,
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
+):
+    """
+    Delete many students at once, e.g. a graduated cohort.
+    
+    Sync mode deletes everything before responding, with one DELETE per
+    table. Async mode hides the students at once and removes their rows in
+    the background; the response carries the purge job to poll.
+    
+    Args:
+        delete_data: Student IDs and mode
+        background_tasks: Runs the purge job after the response (async mode)
+        db: Database session
+        current_admin: Current authenticated admin
+        
+    Returns:
+        StudentBulkDeleteResponse: Deleted and missing counts, and the purge job
+    """
+    result = await AsyncStudentService.bulk_delete_students(db, delete_data.student_ids, delete_data.mode)
+    if result["job"]:
+        background_tasks.add_task(PurgeService.run_purge_job, result["job"].id)
+    return result
+
+
 @router.get("/{student_id}", response_model=StudentDetailResponse)
-def get_student(
+async def get_student(
     student_id: int,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    response: Response,
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,email,courses"),
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session),
+    etag: str | None = Depends(conditional_get("students", "student_course", "courses"))
 ):
     """
     Get a specific student by ID.
     
     Args:
         student_id: Student ID
+        response: Response (carries the ETag when fields are given)
+        fields: Fields to return (default: all; courses are loaded only when requested)
         db: Database session
         current_admin: Current authenticated admin
+        etag: ETag of the response (a matching If-None-Match gets 304 before anything is loaded)
         
     Returns:
         StudentDetailResponse: Student details with courses
     """
-    student = StudentService.get_student_by_id(db, student_id)
+    try:
+        requested = parse_fields(fields, StudentDetailResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    student = await AsyncStudentService.get_student_detail(db, student_id, requested)
     
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
     
+    if requested:
+        return sparse_response(StudentDetailResponse, student, requested, response)
     return student
 
 
 @router.put("/{student_id}", response_model=StudentResponse)
-def update_student(
+async def update_student(
     student_id: int,
     student_data: StudentUpdate,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Update a student.
@@ -118,7 +299,7 @@ def update_student(
     Returns:
         StudentResponse: Updated student details
     """
-    student = StudentService.update_student(db, student_id, student_data)
+    student = await AsyncStudentService.update_student(db, student_id, student_data)
     
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
@@ -127,31 +308,48 @@ def update_student(
 
 
 @router.delete("/{student_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_student(
+async def delete_student(
     student_id: int,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    background_tasks: BackgroundTasks,
+    mode: str = Query("sync", pattern="^(sync|async)$", description="sync, or async (hide now, purge in the background)"),
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
-    Delete a student.
+    Delete a student with their attendance and enrollments.
+    
+    In async mode the student is hidden at once and the response is 202 with
+    a purge job; follow its progress at /api/purge-jobs/{job_id}.
     
     Args:
         student_id: Student ID
+        background_tasks: Runs the purge job after the response (async mode)
+        mode: sync or async
         db: Database session
         current_admin: Current authenticated admin
     """
-    deleted = StudentService.delete_student(db, student_id)
+    if mode == "async":
+        job = await AsyncStudentService.purge_student(db, student_id)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
+        background_tasks.add_task(PurgeService.run_purge_job, job.id)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=PurgeJobResponse.model_validate(job).model_dump(mode="json")
+        )
+    
+    deleted = await AsyncStudentService.delete_student(db, student_id)
     
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
 
 
 @router.post("/{student_id}/courses/{course_id}", status_code=status.HTTP_200_OK)
-def enroll_student(
+async def enroll_student(
     student_id: int,
     course_id: int,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Enroll a student in a course.
@@ -163,7 +361,7 @@ def enroll_student(
         current_admin: Current authenticated admin
     """
     try:
-        enrolled = StudentService.enroll_student_in_course(db, student_id, course_id)
+        enrolled = await AsyncStudentService.enroll_student_in_course(db, student_id, course_id)
         
         if not enrolled:
             raise HTTPException(
@@ -177,11 +375,11 @@ def enroll_student(
 
 
 @router.delete("/{student_id}/courses/{course_id}", status_code=status.HTTP_200_OK)
-def unenroll_student(
+async def unenroll_student(
     student_id: int,
     course_id: int,
-    db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin_or_session)
+    db: Session | AsyncSession = Depends(get_api_db),
+    current_admin: AdminIdentity = Depends(get_current_admin_or_session)
 ):
     """
     Unenroll a student from a course.
@@ -193,7 +391,7 @@ def unenroll_student(
         current_admin: Current authenticated admin
     """
     try:
-        unenrolled = StudentService.unenroll_student_from_course(db, student_id, course_id)
+        unenrolled = await AsyncStudentService.unenroll_student_from_course(db, student_id, course_id)
         
         if not unenrolled:
             raise HTTPException(
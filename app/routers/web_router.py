@@ -7,8 +7,9 @@ from fastapi import APIRouter, Request, Depends, Form, HTTPException, status
 from starlette.responses import RedirectResponse, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.models.admin import Admin
-from app.services.admin_service import AdminService
+from app.services.admin_service import AdminIdentity, AdminService
+from app.services.stats_service import StatsService
+from app.utils.hashing import HashingBusyError
 import json
 from urllib.parse import quote, unquote
 
@@ -22,7 +23,7 @@ def get_current_user_from_session(
 ):
     """
     Get current user from session cookie.
-    Returns Admin object if session is valid, None otherwise.
+    Returns the admin's (cached) identity if session is valid, None otherwise.
     """
     admin_id = request.session.get("admin_id")
     
@@ -30,7 +31,7 @@ def get_current_user_from_session(
         return None
     
     try:
-        admin = db.query(Admin).filter(Admin.id == int(admin_id)).first()
+        admin = AdminService.get_admin_identity(db, int(admin_id))
         return admin
     except Exception as e:
         logger.debug(f"Session validation error: {str(e)}")
@@ -53,8 +54,8 @@ def get_current_user_from_session_required(
         return None
     
     try:
-        admin = db.query(Admin).filter(Admin.id == int(admin_id)).first()
-        logger.debug(f"Retrieved admin from DB: {admin}")
+        admin = AdminService.get_admin_identity(db, int(admin_id))
+        logger.debug(f"Retrieved admin identity: {admin}")
         return admin
     except Exception as e:
         logger.debug(f"Session validation error: {str(e)}")
@@ -64,7 +65,7 @@ def get_current_user_from_session_required(
 @router.get("/home")
 def home(
     request: Request,
-    current_admin: Admin = Depends(get_current_user_from_session)
+    current_admin: AdminIdentity = Depends(get_current_user_from_session)
 ):
     """
     Home page route.
@@ -132,6 +133,9 @@ def login_submit(
         
         return response
         
+    except HashingBusyError:
+        logger.warning(f"Login for {username} rejected: password hashing queue is full")
+        return login_page(request, error="Too many sign-ins right now, please try again in a moment")
     except Exception as e:
         logger.error(f"Login error: {str(e)}")
         import traceback
@@ -167,7 +171,7 @@ def register_page(request: Request):
 @router.get("/dashboard")
 def dashboard(
     request: Request,
-    current_admin: Admin = Depends(get_current_user_from_session_required),
+    current_admin: AdminIdentity = Depends(get_current_user_from_session_required),
     db: Session = Depends(get_db)
 ):
     """
@@ -188,19 +192,16 @@ def dashboard(
     logger.info(f"Dashboard: Rendering for admin {current_admin.username}")
     
     try:
-        # Get statistics
-        from app.models.student import Student
-        from app.models.course import Course
-        
-        students_count = db.query(Student).count()
-        courses_count = db.query(Course).count()
+        # Get statistics (one query, cached briefly)
+        stats = StatsService.get_dashboard_stats(db)
         
         context = {
             "request": request,
             "is_authenticated": True,
             "username": current_admin.username,
-            "students_count": students_count,
-            "courses_count": courses_count
+            "stats": stats,
+            "students_count": stats["students_count"],
+            "courses_count": stats["courses_count"]
         }
     except Exception as e:
         logger.error(f"Dashboard error: {str(e)}")
@@ -208,6 +209,7 @@ def dashboard(
             "request": request,
             "is_authenticated": True,
             "username": current_admin.username,
+            "stats": None,
             "students_count": 0,
             "courses_count": 0,
             "error": "Failed to load statistics"
@@ -219,7 +221,7 @@ def dashboard(
 @router.get("/students")
 def students_page(
     request: Request,
-    current_admin: Admin = Depends(get_current_user_from_session_required)
+    current_admin: AdminIdentity = Depends(get_current_user_from_session_required)
 ):
     """
     Students list page route.
@@ -241,7 +243,7 @@ def students_page(
 @router.get("/add-student")
 def add_student_page(
     request: Request,
-    current_admin: Admin = Depends(get_current_user_from_session_required)
+    current_admin: AdminIdentity = Depends(get_current_user_from_session_required)
 ):
     """
     Add new student page route.
@@ -264,7 +266,7 @@ def add_student_page(
 def edit_student_page(
     request: Request,
     student_id: int,
-    current_admin: Admin = Depends(get_current_user_from_session_required)
+    current_admin: AdminIdentity = Depends(get_current_user_from_session_required)
 ):
     """
     Edit student page route.
@@ -287,7 +289,7 @@ def edit_student_page(
 @router.get("/courses")
 def courses_page(
     request: Request,
-    current_admin: Admin = Depends(get_current_user_from_session_required)
+    current_admin: AdminIdentity = Depends(get_current_user_from_session_required)
 ):
     """
     Courses list page route.
@@ -309,7 +311,7 @@ def courses_page(
 @router.get("/attendance")
 def attendance_page(
     request: Request,
-    current_admin: Admin = Depends(get_current_user_from_session_required)
+    current_admin: AdminIdentity = Depends(get_current_user_from_session_required)
 ):
     """
     Attendance tracking page route.
@@ -4,6 +4,7 @@ Pydantic schemas for admin-related API requests and responses.
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
 from typing import Optional
+from app.schemas.fields import StoredEmail
 
 
 class AdminBase(BaseModel):
@@ -24,8 +25,14 @@ class AdminUpdate(BaseModel):
     password: Optional[str] = Field(None, min_length=8)
 
 
+class AdminActiveUpdate(BaseModel):
+    """Schema for activating or deactivating an admin."""
+    is_active: bool
+
+
 class AdminResponse(AdminBase):
     """Schema for admin response."""
+    email: StoredEmail
     id: int
     is_active: bool
     created_at: datetime
@@ -19,6 +19,20 @@ class AttendanceCreate(AttendanceBase):
     attendance_date: datetime
 
 
+class AttendanceBulkEntry(BaseModel):
+    """Schema for one student's mark in a bulk attendance request."""
+    student_id: int
+    is_present: bool = True
+    remarks: Optional[str] = Field(None, max_length=255)
+
+
+class AttendanceBulkCreate(BaseModel):
+    """Schema for marking a course roster's attendance for one date."""
+    course_id: int
+    attendance_date: datetime
+    entries: List[AttendanceBulkEntry] = Field(..., min_length=1, max_length=2000)
+
+
 class AttendanceUpdate(BaseModel):
     """Schema for updating attendance record."""
     is_present: Optional[bool] = None
@@ -40,6 +54,24 @@ class AttendanceResponse(BaseModel):
         from_attributes = True
 
 
+class AttendanceBulkResult(BaseModel):
+    """Schema for one student's outcome in a bulk attendance response."""
+    student_id: int
+    status: str  # created, updated or error
+    attendance_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class AttendanceBulkResponse(BaseModel):
+    """Schema for bulk attendance response."""
+    course_id: int
+    attendance_date: datetime
+    created: int
+    updated: int
+    failed: int
+    results: List[AttendanceBulkResult]
+
+
 class AttendanceDetailResponse(AttendanceResponse):
     """Schema for detailed attendance with student and course info."""
     student: Optional['StudentResponse'] = None
@@ -57,6 +89,7 @@ class AttendanceReportResponse(BaseModel):
     course_name: str
     total_classes: int
     attended_classes: int
+    absent_classes: int
     attendance_percentage: float
 
 
@@ -3,7 +3,7 @@ Pydantic schemas for course-related API requests and responses.
 """
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Literal, Optional, List
 
 
 class CourseBase(BaseModel):
@@ -49,6 +49,23 @@ class CourseDetailResponse(CourseResponse):
         from_attributes = True
 
 
+class EnrollmentBulkRequest(BaseModel):
+    """Schema for adding or removing many students in a course."""
+    student_ids: List[int] = Field(..., min_length=1, max_length=10000)
+    action: Literal["add", "remove"] = "add"
+
+
+class EnrollmentBulkResponse(BaseModel):
+    """Schema for bulk enrollment results."""
+    course_id: int
+    action: str
+    added: int = 0
+    removed: int = 0
+    skipped: int  # Already enrolled (add) or not enrolled (remove)
+    missing: int  # Student ids that do not exist
+    missing_ids: List[int] = []
+
+
 # Forward reference resolution (avoid circular import)
 from app.schemas.student import StudentResponse
 CourseDetailResponse.model_rebuild()
@@ -0,0 +1,10 @@
+"""
+Field types shared by the API schemas.
+"""
+from typing import Annotated
+from pydantic import WithJsonSchema
+
+
+# Email address read back from the database: validated as EmailStr when it was
+# written, so responses skip the (costly) email check but document the same format
+StoredEmail = Annotated[str, WithJsonSchema({"format": "email", "type": "string"})]
@@ -0,0 +1,31 @@
+"""
+Pydantic schemas for purge job responses.
+"""
+from pydantic import BaseModel, computed_field
+from datetime import datetime
+from typing import Optional
+
+
+class PurgeJobResponse(BaseModel):
+    """Schema for a background purge job and its progress."""
+    id: int
+    entity: str
+    status: str
+    total_rows: int
+    rows_deleted: int
+    error: Optional[str]
+    created_at: datetime
+    finished_at: Optional[datetime]
+    
+    @computed_field
+    @property
+    def progress(self) -> float:
+        """Percentage of the attendance rows removed so far."""
+        if self.status == "done":
+            return 100.0
+        if not self.total_rows:
+            return 0.0
+        return round(min(self.rows_deleted / self.total_rows, 1) * 100, 1)
+    
+    class Config:
+        from_attributes = True
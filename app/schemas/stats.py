@@ -0,0 +1,19 @@
+"""
+Pydantic schemas for dashboard statistics responses.
+"""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class DashboardStatsResponse(BaseModel):
+    """Schema for the dashboard numbers."""
+    students_count: int
+    courses_count: int
+    enrollments_count: int
+    today_marked: int  # Attendance marks recorded for today
+    today_present: int
+    today_attendance_rate: Optional[float]  # Percent; None until something is marked today
+    average_attendance_rate: Optional[float]  # Percent over all attendance
+    at_risk_students: int
+    generated_at: datetime
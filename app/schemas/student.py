@@ -3,7 +3,9 @@ Pydantic schemas for student-related API requests and responses.
 """
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Literal, Optional, List
+from app.schemas.fields import StoredEmail
+from app.schemas.purge_job import PurgeJobResponse
 
 
 class StudentBase(BaseModel):
@@ -31,6 +33,7 @@ class StudentUpdate(BaseModel):
 
 class StudentResponse(StudentBase):
     """Schema for student response."""
+    email: StoredEmail
     id: int
     enrollment_date: datetime
     created_at: datetime
@@ -50,10 +53,43 @@ class StudentDetailResponse(StudentResponse):
 
 class StudentListResponse(BaseModel):
     """Schema for paginated student list."""
-    total: int
-    page: int
+    total: Optional[int] = None  # Omitted when include_total is off (default in cursor mode)
+    total_kind: Optional[str] = None  # exact, cached or estimated
+    page: Optional[int] = None  # Not known in cursor mode
     limit: int
     students: List[StudentResponse]
+    next_cursor: Optional[str] = None  # Pass as `after` to get the next page
+
+
+class StudentBulkRowError(BaseModel):
+    """Schema for one rejected row of a bulk import."""
+    row: int  # 1-based data row (CSV header not counted)
+    email: Optional[str] = None
+    errors: List[str]
+
+
+class StudentBulkImportResponse(BaseModel):
+    """Schema for a bulk import report."""
+    total_rows: int
+    inserted: int
+    failed: int
+    errors: List[StudentBulkRowError]  # The first rows' errors; see errors_truncated
+    errors_truncated: bool = False  # More rows failed than errors lists
+
+
+class StudentBulkDeleteRequest(BaseModel):
+    """Schema for deleting many students (e.g. a graduated cohort)."""
+    student_ids: List[int] = Field(..., min_length=1, max_length=10000)
+    mode: Literal["sync", "async"] = "sync"  # async: hide now, purge in the background
+
+
+class StudentBulkDeleteResponse(BaseModel):
+    """Schema for bulk delete results."""
+    mode: str
+    deleted: int  # Deleted now (sync) or hidden and queued for purging (async)
+    missing: int
+    missing_ids: List[int]
+    job: Optional[PurgeJobResponse] = None
 
 
 # Forward reference resolution
@@ -2,15 +2,38 @@
 Admin service for handling admin-related business logic.
 """
 import logging
+from dataclasses import dataclass
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import run_db
 from app.models.admin import Admin
 from app.schemas.admin import AdminCreate, AdminUpdate
-from app.utils.hashing import hash_password, verify_password
+from app.utils.hashing import hash_password, verify_and_update_password
 
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class AdminIdentity:
+    """Lightweight, immutable view of an authenticated admin (safe to share between requests)."""
+    id: int
+    username: str
+    email: str
+    is_active: bool
+
+
+# Identities of active admins by id, for the per-request authentication dependencies
+_identity_cache = TTLCache(maxsize=settings.admin_cache_size, ttl=settings.admin_cache_ttl_seconds)
+
+
+def admin_identity_cache_stats() -> dict:
+    """Get the admin identity cache's size and hit/miss counters."""
+    return _identity_cache.stats()
+
+
 class AdminService:
     """Service for admin operations."""
     
@@ -79,27 +102,79 @@ class AdminService:
         """
         return db.query(Admin).filter(Admin.id == admin_id).first()
     
+    @staticmethod
+    def get_admin_identity(db: Session, admin_id: int) -> AdminIdentity | None:
+        """
+        Get an active admin's identity, from the cache when possible.
+        
+        Args:
+            db: Database session (only used on a cache miss)
+            admin_id: Admin ID
+            
+        Returns:
+            AdminIdentity: Identity, or None if the admin does not exist or is inactive
+        """
+        identity = _identity_cache.get(admin_id)
+        if identity is not None:
+            return identity
+        return AdminService.load_admin_identity(db, admin_id)
+    
+    @staticmethod
+    def load_admin_identity(db: Session, admin_id: int) -> AdminIdentity | None:
+        """
+        Read an active admin's identity from the database and cache it.
+        
+        Args:
+            db: Database session
+            admin_id: Admin ID
+            
+        Returns:
+            AdminIdentity: Identity, or None if the admin does not exist or is inactive
+        """
+        row = db.query(Admin.id, Admin.username, Admin.email, Admin.is_active).filter(
+            Admin.id == admin_id, Admin.is_active.is_(True)
+        ).first()
+        if row is None:
+            return None
+        
+        identity = AdminIdentity(*row)
+        _identity_cache.set(admin_id, identity)
+        return identity
+    
     @staticmethod
     def verify_admin_password(db: Session, username: str, password: str) -> Admin | None:
         """
         Verify admin credentials.
         
+        A password hashed with outdated Argon2 parameters is rehashed with the
+        current ones once it has been verified.
+        
         Args:
             db: Database session
             username: Admin username
             password: Plain-text password
             
         Returns:
-            Admin: Admin instance if credentials are valid, None otherwise
+            Admin: Admin instance if credentials are valid and the admin is active, None otherwise
+            
+        Raises:
+            HashingBusyError: If the password hashing queue is full
         """
         admin = AdminService.get_admin_by_username(db, username)
         
         if not admin:
             return None
         
-        if not verify_password(password, admin.hashed_password):
+        valid, new_hash = verify_and_update_password(password, admin.hashed_password)
+        # Checked after the password, so the response does not reveal deactivated accounts
+        if not valid or not admin.is_active:
             return None
         
+        if new_hash:
+            admin.hashed_password = new_hash
+            db.commit()
+            logger.info(f"Rehashed password for admin: {admin.username}")
+        
         return admin
     
     @staticmethod
@@ -130,6 +205,83 @@ class AdminService:
         
         db.commit()
         db.refresh(admin)
+        _identity_cache.delete(admin_id)
         
         logger.info(f"Updated admin: {admin.username}")
         return admin
+    
+    @staticmethod
+    def set_admin_active(db: Session, admin_id: int, is_active: bool) -> Admin | None:
+        """
+        Activate or deactivate an admin. Inactive admins cannot log in, and
+        their tokens and web sessions fail authentication (in other worker
+        processes once their cached identity expires, see ADMIN_CACHE_TTL_SECONDS).
+        
+        Args:
+            db: Database session
+            admin_id: Admin ID
+            is_active: New state
+            
+        Returns:
+            Admin: Updated admin instance or None
+        """
+        admin = AdminService.get_admin_by_id(db, admin_id)
+        
+        if not admin:
+            return None
+        
+        admin.is_active = is_active
+        db.commit()
+        db.refresh(admin)
+        _identity_cache.delete(admin_id)
+        
+        logger.info(f"{'Activated' if is_active else 'Deactivated'} admin: {admin.username}")
+        return admin
+
+
+class AsyncAdminService:
+    """
+    Async facade over AdminService.
+    
+    Password hashing waits on the hashing process pool, so with an
+    AsyncSession the hashing methods would block the event loop; the
+    auth router stays sync.
+    """
+    
+    @staticmethod
+    async def create_admin(db: Session | AsyncSession, admin_data: AdminCreate) -> Admin:
+        """Async variant of AdminService.create_admin."""
+        return await run_db(db, AdminService.create_admin, admin_data)
+    
+    @staticmethod
+    async def get_admin_by_username(db: Session | AsyncSession, username: str) -> Admin | None:
+        """Async variant of AdminService.get_admin_by_username."""
+        return await run_db(db, AdminService.get_admin_by_username, username)
+    
+    @staticmethod
+    async def get_admin_by_id(db: Session | AsyncSession, admin_id: int) -> Admin | None:
+        """Async variant of AdminService.get_admin_by_id."""
+        return await run_db(db, AdminService.get_admin_by_id, admin_id)
+    
+    @staticmethod
+    async def get_admin_identity(db: Session | AsyncSession, admin_id: int) -> AdminIdentity | None:
+        """Async variant of AdminService.get_admin_identity (a cache hit skips the database entirely)."""
+        identity = _identity_cache.get(admin_id)
+        if identity is not None:
+            return identity
+        return await run_db(db, AdminService.load_admin_identity, admin_id)
+    
+    @staticmethod
+    async def verify_admin_password(db: Session | AsyncSession, username: str, password: str) -> Admin | None:
+        """Async variant of AdminService.verify_admin_password."""
+        return await run_db(db, AdminService.verify_admin_password, username, password)
+    
+    @staticmethod
+    async def update_admin(db: Session | AsyncSession, admin_id: int, admin_data: AdminUpdate) -> Admin | None:
+        """Async variant of AdminService.update_admin."""
+        return await run_db(db, AdminService.update_admin, admin_id, admin_data)
+    
+    @staticmethod
+    async def set_admin_active(db: Session | AsyncSession, admin_id: int, is_active: bool) -> Admin | None:
+        """Async variant of AdminService.set_admin_active."""
+        return await run_db(db, AdminService.set_admin_active, admin_id, is_active)
@@ -3,16 +3,198 @@ Attendance service for handling attendance-related business logic.
 """
 import logging
 from datetime import datetime, date
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from app.models.attendance import Attendance
-from app.models.student import Student
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, case, delete, exists, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError, OperationalError
+from app.core.database import join_live, run_db
+from app.core.fieldsets import column_options, wants
+from app.models.attendance import Attendance, AttendanceSummary
+from app.models.student import Student, student_course
 from app.models.course import Course
-from app.schemas.attendance import AttendanceCreate, AttendanceUpdate
+from app.schemas.attendance import AttendanceBulkCreate, AttendanceCreate, AttendanceUpdate
+from app.services.stats_service import invalidate_dashboard_stats
+from app.utils.upsert import upsert
 
 
 logger = logging.getLogger(__name__)
 
+# Tries of a mark: a second one after the database aborted it to resolve a
+# lock conflict with a concurrent mark (see _is_lock_conflict), or, in bulk,
+# after losing a race with a concurrent first mark of the same day
+MARK_ATTEMPTS = 2
+
+# Attendance listings leave out the rows of students and courses waiting to
+# be purged, as the exports and dashboard statistics do
+LIVE_ATTENDANCE = ((Student, Attendance.student_id), (Course, Attendance.course_id))
+
+
+def _is_lock_conflict(error: OperationalError) -> bool:
+    """Whether the database aborted the transaction to resolve a lock conflict (deadlock or lock wait timeout)."""
+    orig = error.orig
+    return getattr(orig, "errno", None) in (1205, 1213) or getattr(orig, "pgcode", None) in ("40001", "40P01")
+
+
+def _mark_delta(previous: bool | None, is_present: bool) -> tuple[int, int, int]:
+    """
+    Summary counter changes for marking a day.
+    
+    Args:
+        previous: is_present of the existing mark, or None for a new mark
+        is_present: New is_present value
+        
+    Returns:
+        tuple: (total, present, absent) deltas
+    """
+    if previous is None:
+        return 1, int(is_present), int(not is_present)
+    if previous != is_present:
+        flip = 1 if is_present else -1
+        return 0, flip, -flip
+    return 0, 0, 0
+
+
+def _apply_summary_deltas(db: Session, deltas: dict[tuple[int, int], tuple[int, int, int]]) -> None:
+    """
+    Add counter deltas to attendance_summary rows in one upsert.
+    
+    The increments are relative (total = total + delta), so concurrent writers
+    for the same student and course do not overwrite each other.
+    
+    Args:
+        db: Database session (the caller commits)
+        deltas: (student_id, course_id) -> (total, present, absent) deltas
+    """
+    rows = [
+        {"student_id": student_id, "course_id": course_id,
+         "total_classes": total, "present_classes": present, "absent_classes": absent}
+        for (student_id, course_id), (total, present, absent) in deltas.items()
+        if total or present or absent
+    ]
+    if not rows:
+        return
+    
+    db.execute(upsert(
+        db.get_bind().dialect.name,
+        AttendanceSummary,
+        rows,
+        conflict_columns=["student_id", "course_id"],
+        update_values={
+            "total_classes": lambda row: AttendanceSummary.total_classes + row.total_classes,
+            "present_classes": lambda row: AttendanceSummary.present_classes + row.present_classes,
+            "absent_classes": lambda row: AttendanceSummary.absent_classes + row.absent_classes,
+        },
+    ))
+
+
+def _report_columns() -> list:
+    """Columns for an attendance report row (summary counters are NULL when nothing is recorded)."""
+    return [
+        Student.id.label("student_id"),
+        Student.first_name,
+        Student.last_name,
+        Course.id.label("course_id"),
+        Course.name.label("course_name"),
+        AttendanceSummary.total_classes,
+        AttendanceSummary.present_classes.label("attended_classes"),
+    ]
+
+
+def _report(row) -> dict:
+    """Build an attendance report dict from an aggregate row."""
+    total_classes = row.total_classes or 0
+    attended_classes = row.attended_classes or 0
+    
+    attendance_percentage = (
+        (attended_classes / total_classes * 100) if total_classes > 0 else 0
+    )
+    
+    return {
+        "student_id": row.student_id,
+        "student_name": f"{row.first_name} {row.last_name}",
+        "course_id": row.course_id,
+        "course_name": row.course_name,
+        "total_classes": total_classes,
+        "attended_classes": attended_classes,
+        "absent_classes": total_classes - attended_classes,
+        "attendance_percentage": round(attendance_percentage, 2)
+    }
+
+
+def _write_mark(db: Session, values: dict) -> tuple[Attendance | None, bool | None]:
+    """
+    Upsert one day's mark, returning it with the previous is_present.
+    
+    One INSERT ... SELECT ... WHERE EXISTS (live student, live course) ON
+    CONFLICT (student_id, course_id, attendance_day) DO UPDATE, with
+    RETURNING (MySQL reads the row back). On conflict it refreshes the date,
+    remarks and updated_at only when is_present is unchanged, so the
+    returned row tells what happened: one with the other is_present is
+    flipped (applied by a second statement, on the row the upsert has
+    locked), one never updated is new, anything else is a re-mark.
+    
+    Args:
+        db: Database session (the caller commits)
+        values: Attendance column values, attendance_day included
+        
+    Returns:
+        tuple: (attendance record, or None when the student or course is
+        not live; previous is_present, or None for a new mark)
+    """
+    dialect = db.get_bind().dialect
+    key = and_(
+        Attendance.student_id == values["student_id"],
+        Attendance.course_id == values["course_id"],
+        Attendance.attendance_day == values["attendance_day"]
+    )
+    columns = list(values)
+    source = select(*(
+        literal(value, type_=Attendance.__table__.c[column].type).label(column) for column, value in values.items()
+    )).where(
+        exists().where(Student.id == values["student_id"], Student.deleted_at.is_(None)),
+        exists().where(Course.id == values["course_id"], Course.deleted_at.is_(None)),
+    )
+    
+    def if_unchanged(row, value, current):
+        return case((Attendance.is_present == row.is_present, value), else_=current)
+    
+    stmt = upsert(
+        dialect.name,
+        Attendance,
+        source,
+        conflict_columns=["student_id", "course_id", "attendance_day"],
+        update_values={
+            "attendance_date": lambda row: if_unchanged(row, row.attendance_date, Attendance.attendance_date),
+            "remarks": lambda row: if_unchanged(row, row.remarks, Attendance.remarks),
+            "updated_at": lambda row: if_unchanged(row, func.now(), Attendance.updated_at),
+        },
+        columns=columns,
+    )
+    
+    if dialect.insert_returning and dialect.name not in ("mysql", "mariadb"):
+        db_attendance = db.scalars(
+            stmt.returning(Attendance), execution_options={"populate_existing": True}
+        ).one_or_none()
+    else:
+        db.execute(stmt)
+        db_attendance = db.query(Attendance).populate_existing().filter(key).with_for_update().one_or_none()
+    
+    if db_attendance is None:
+        return None, None
+    if db_attendance.is_present == values["is_present"]:
+        # Inserted (never updated), or re-marked with the same value
+        return db_attendance, None if db_attendance.updated_at is None else db_attendance.is_present
+    
+    previous = db_attendance.is_present
+    db.execute(update(Attendance).where(Attendance.id == db_attendance.id).values(
+        attendance_date=values["attendance_date"],
+        is_present=values["is_present"],
+        remarks=values["remarks"],
+        updated_at=func.now(),
+    ))
+    db.refresh(db_attendance)
+    return db_attendance, previous
+
 
 class AttendanceService:
     """Service for attendance operations."""
@@ -22,50 +204,190 @@ class AttendanceService:
         """
         Mark attendance for a student in a course.
         
+        Marking the same student, course and day again updates the existing
+        record (its updated_at is then set, which tells callers it was not
+        created). The mark is one upsert on the (student_id, course_id,
+        attendance_day) unique key that also checks the student and course,
+        so concurrent marks cannot create duplicates or count a day twice.
+        
         Args:
             db: Database session
             attendance_data: Attendance creation data
             
         Returns:
-            Attendance: Created attendance record
+            Attendance: Created or updated attendance record
+            
+        Raises:
+            ValueError: If the student or the course does not exist (or is being deleted)
         """
-        # Verify student exists
-        student = db.query(Student).filter(Student.id == attendance_data.student_id).first()
-        if not student:
-            raise ValueError(f"Student with ID {attendance_data.student_id} not found")
+        values = {
+            "student_id": attendance_data.student_id,
+            "course_id": attendance_data.course_id,
+            "attendance_date": attendance_data.attendance_date,
+            "attendance_day": attendance_data.attendance_date.date(),
+            "is_present": attendance_data.is_present,
+            "remarks": attendance_data.remarks,
+        }
         
-        # Verify course exists
-        course = db.query(Course).filter(Course.id == attendance_data.course_id).first()
-        if not course:
-            raise ValueError(f"Course with ID {attendance_data.course_id} not found")
+        for attempt in range(MARK_ATTEMPTS):
+            try:
+                db_attendance, previous = _write_mark(db, values)
+                if db_attendance is None:
+                    db.rollback()
+                    break
+                _apply_summary_deltas(db, {
+                    (attendance_data.student_id, attendance_data.course_id):
+                        _mark_delta(previous, attendance_data.is_present)
+                })
+                db.commit()
+                break
+            except IntegrityError:
+                # Foreign key violation: hard-deleted since the EXISTS checks
+                db.rollback()
+                db_attendance = None
+                break
+            except OperationalError as e:
+                db.rollback()
+                if attempt + 1 < MARK_ATTEMPTS and _is_lock_conflict(e):
+                    continue  # MySQL: concurrent first marks can deadlock on their gap locks
+                raise
         
-        # Check if attendance already marked for this date
-        existing = db.query(Attendance).filter(
-            and_(
-                Attendance.student_id == attendance_data.student_id,
-                Attendance.course_id == attendance_data.course_id,
-                func.date(Attendance.attendance_date) == attendance_data.attendance_date.date()
-            )
-        ).first()
-        
-        if existing:
-            raise ValueError("Attendance already marked for this student on this date")
-        
-        db_attendance = Attendance(
-            student_id=attendance_data.student_id,
-            course_id=attendance_data.course_id,
-            attendance_date=attendance_data.attendance_date,
-            is_present=attendance_data.is_present,
-            remarks=attendance_data.remarks
-        )
-        
-        db.add(db_attendance)
-        db.commit()
-        db.refresh(db_attendance)
+        if db_attendance is None:
+            # Nothing was written: report which side is missing
+            if not db.query(Student.id).filter(Student.id == attendance_data.student_id).first():
+                raise ValueError(f"Student with ID {attendance_data.student_id} not found")
+            raise ValueError(f"Course with ID {attendance_data.course_id} not found")
+        invalidate_dashboard_stats()
         
         logger.info(f"Marked attendance for student {attendance_data.student_id} in course {attendance_data.course_id}")
         return db_attendance
     
+    @staticmethod
+    def mark_attendance_bulk(db: Session, bulk_data: AttendanceBulkCreate) -> dict:
+        """
+        Mark attendance for many students of one course on one date.
+        
+        Uses a fixed number of queries whatever the roster size: the course,
+        the student ids and the existing marks are each checked with one
+        query, then all valid entries (and their summary counters) are
+        written with one multi-row statement each in a single transaction
+        (retried once if a concurrent mark created one of the new marks first).
+        
+        Args:
+            db: Database session
+            bulk_data: Course, date and per-student entries
+            
+        Returns:
+            dict: Created/updated/failed counts and per-student results (in request order)
+        """
+        course_id = bulk_data.course_id
+        attendance_day = bulk_data.attendance_date.date()
+        
+        if not db.query(Course.id).filter(Course.id == course_id).first():
+            raise ValueError(f"Course with ID {course_id} not found")
+        
+        student_ids = {entry.student_id for entry in bulk_data.entries}
+        known_students = {
+            student_id for (student_id,) in db.query(Student.id).filter(Student.id.in_(student_ids))
+        }
+        
+        for attempt in range(MARK_ATTEMPTS):
+            # student_id -> is_present of today's existing marks (locked until commit)
+            existing_marks = dict(db.query(Attendance.student_id, Attendance.is_present).filter(
+                Attendance.course_id == course_id,
+                Attendance.attendance_day == attendance_day,
+                Attendance.student_id.in_(known_students)
+            ).with_for_update().all()) if known_students else {}
+            
+            results = []
+            rows = []
+            seen = set()
+            for entry in bulk_data.entries:
+                if entry.student_id not in known_students:
+                    results.append({"student_id": entry.student_id, "status": "error",
+                                    "error": f"Student with ID {entry.student_id} not found"})
+                elif entry.student_id in seen:
+                    # One statement cannot upsert the same key twice
+                    results.append({"student_id": entry.student_id, "status": "error",
+                                    "error": "Student is listed more than once"})
+                else:
+                    seen.add(entry.student_id)
+                    results.append({"student_id": entry.student_id,
+                                    "status": "updated" if entry.student_id in existing_marks else "created"})
+                    rows.append({
+                        "student_id": entry.student_id,
+                        "course_id": course_id,
+                        "attendance_date": bulk_data.attendance_date,
+                        "attendance_day": attendance_day,
+                        "is_present": entry.is_present,
+                        "remarks": entry.remarks,
+                    })
+            
+            if not rows:
+                break
+            
+            # Existing (locked) marks are updated through the upsert; new ones are
+            # plain INSERTs, which fail instead of overwriting a concurrent first mark
+            updated_rows = [row for row in rows if row["student_id"] in existing_marks]
+            new_rows = [row for row in rows if row["student_id"] not in existing_marks]
+            try:
+                if updated_rows:
+                    db.execute(upsert(
+                        db.get_bind().dialect.name,
+                        Attendance,
+                        updated_rows,
+                        conflict_columns=["student_id", "course_id", "attendance_day"],
+                        update_values={
+                            "attendance_date": lambda row: row.attendance_date,
+                            "is_present": lambda row: row.is_present,
+                            "remarks": lambda row: row.remarks,
+                            "updated_at": func.now(),
+                        },
+                    ))
+                if new_rows:
+                    db.execute(insert(Attendance).values(new_rows))
+                _apply_summary_deltas(db, {
+                    (row["student_id"], course_id): _mark_delta(existing_marks.get(row["student_id"]), row["is_present"])
+                    for row in rows
+                })
+                attendance_ids = dict(db.query(Attendance.student_id, Attendance.id).filter(
+                    Attendance.course_id == course_id,
+                    Attendance.attendance_day == attendance_day,
+                    Attendance.student_id.in_(seen)
+                ).all())
+                db.commit()
+            except IntegrityError:
+                # A concurrent mark created one of the new marks first (retry to
+                # update it), or a student or the course was deleted after the checks above
+                db.rollback()
+                if attempt + 1 < MARK_ATTEMPTS:
+                    continue
+                raise ValueError("Students or course changed during bulk marking; retry the request")
+            except OperationalError as e:
+                db.rollback()
+                if attempt + 1 < MARK_ATTEMPTS and _is_lock_conflict(e):
+                    continue
+                raise
+            invalidate_dashboard_stats()
+            
+            for result in results:
+                if result["status"] != "error":
+                    result["attendance_id"] = attendance_ids.get(result["student_id"])
+            break
+        
+        created = sum(1 for result in results if result["status"] == "created")
+        updated = sum(1 for result in results if result["status"] == "updated")
+        
+        logger.info(f"Bulk marked attendance for course {course_id} on {attendance_day}: {created} created, {updated} updated")
+        return {
+            "course_id": course_id,
+            "attendance_date": bulk_data.attendance_date,
+            "created": created,
+            "updated": updated,
+            "failed": len(results) - created - updated,
+            "results": results
+        }
+    
     @staticmethod
     def get_attendance_by_id(db: Session, attendance_id: int) -> Attendance | None:
         """
@@ -81,19 +403,45 @@ class AttendanceService:
         return db.query(Attendance).filter(Attendance.id == attendance_id).first()
     
     @staticmethod
-    def get_attendance_by_student(db: Session, student_id: int, course_id: int | None = None) -> list[Attendance]:
+    def get_attendance_detail(db: Session, attendance_id: int, fields: tuple[str, ...] | None = None) -> Attendance | None:
+        """
+        Get attendance record by ID with its student and course loaded.
+        
+        Args:
+            db: Database session
+            attendance_id: Attendance ID
+            fields: Response fields to load (see app.core.fieldsets), or None for all
+            
+        Returns:
+            Attendance: Attendance record with student and course (when requested), or None
+        """
+        # joinedload: both are many-to-one, so one row with up to two JOINs
+        query = db.query(Attendance).options(*column_options(Attendance, fields))
+        if wants(fields, "student"):
+            query = query.options(joinedload(Attendance.student))
+        if wants(fields, "course"):
+            query = query.options(joinedload(Attendance.course))
+        return query.filter(Attendance.id == attendance_id).first()
+    
+    @staticmethod
+    def get_attendance_by_student(db: Session, student_id: int, course_id: int | None = None, fields: tuple[str, ...] | None = None) -> list[Attendance]:
         """
         Get attendance records for a student.
         
+        Students and courses pending their purge are left out.
+        
         Args:
             db: Database session
             student_id: Student ID
             course_id: Optional course ID to filter
+            fields: Response fields to load (see app.core.fieldsets), or None for all
             
         Returns:
             list: List of attendance records
         """
-        query = db.query(Attendance).filter(Attendance.student_id == student_id)
+        query = join_live(db.query(Attendance), *LIVE_ATTENDANCE).options(
+            *column_options(Attendance, fields)
+        ).filter(Attendance.student_id == student_id)
         
         if course_id:
             query = query.filter(Attendance.course_id == course_id)
@@ -101,21 +449,24 @@ class AttendanceService:
         return query.order_by(Attendance.attendance_date.desc()).all()
     
     @staticmethod
-    def get_attendance_by_date(db: Session, attendance_date: date, course_id: int | None = None) -> list[Attendance]:
+    def get_attendance_by_date(db: Session, attendance_date: date, course_id: int | None = None, fields: tuple[str, ...] | None = None) -> list[Attendance]:
         """
         Get attendance records for a specific date.
         
+        Students and courses pending their purge are left out.
+        
         Args:
             db: Database session
             attendance_date: Attendance date
             course_id: Optional course ID to filter
+            fields: Response fields to load (see app.core.fieldsets), or None for all
             
         Returns:
             list: List of attendance records
         """
-        query = db.query(Attendance).filter(
-            func.date(Attendance.attendance_date) == attendance_date
-        )
+        query = join_live(db.query(Attendance), *LIVE_ATTENDANCE).options(
+            *column_options(Attendance, fields)
+        ).filter(Attendance.attendance_day == attendance_date)
         
         if course_id:
             query = query.filter(Attendance.course_id == course_id)
@@ -127,6 +478,9 @@ class AttendanceService:
         """
         Get attendance report for a student in a course.
         
+        Reads the attendance_summary counters: one primary-key lookup
+        however many classes have been recorded.
+        
         Args:
             db: Database session
             student_id: Student ID
@@ -135,44 +489,89 @@ class AttendanceService:
         Returns:
             dict: Attendance report with statistics
         """
-        student = db.query(Student).filter(Student.id == student_id).first()
-        if not student:
-            raise ValueError(f"Student with ID {student_id} not found")
+        row = db.query(*_report_columns()).select_from(Student).join(
+            Course, Course.id == course_id
+        ).outerjoin(
+            AttendanceSummary,
+            and_(AttendanceSummary.student_id == Student.id, AttendanceSummary.course_id == Course.id)
+        ).filter(Student.id == student_id).first()
         
-        course = db.query(Course).filter(Course.id == course_id).first()
-        if not course:
+        if row is None:
+            # Only reached on a miss: find out which side is missing
+            if not db.query(Student.id).filter(Student.id == student_id).first():
+                raise ValueError(f"Student with ID {student_id} not found")
             raise ValueError(f"Course with ID {course_id} not found")
         
-        attendance_records = db.query(Attendance).filter(
-            and_(
-                Attendance.student_id == student_id,
-                Attendance.course_id == course_id
-            )
-        ).all()
+        return _report(row)
+    
+    @staticmethod
+    def get_course_attendance_report(db: Session, course_id: int) -> list[dict]:
+        """
+        Get attendance reports for every student enrolled in a course.
+        
+        One query joining the enrollments to their attendance_summary rows,
+        however many students the course has.
         
-        total_classes = len(attendance_records)
-        attended_classes = sum(1 for record in attendance_records if record.is_present)
+        Args:
+            db: Database session
+            course_id: Course ID
+            
+        Returns:
+            list: Attendance report per enrolled student, ordered by name
+        """
+        rows = db.query(*_report_columns()).select_from(Course).outerjoin(
+            student_course, student_course.c.course_id == Course.id
+        ).outerjoin(
+            Student, Student.id == student_course.c.student_id
+        ).outerjoin(
+            AttendanceSummary,
+            and_(AttendanceSummary.student_id == Student.id, AttendanceSummary.course_id == Course.id)
+        ).filter(Course.id == course_id).order_by(Student.last_name, Student.first_name, Student.id).all()
         
-        attendance_percentage = (
-            (attended_classes / total_classes * 100) if total_classes > 0 else 0
-        )
+        if not rows:
+            raise ValueError(f"Course with ID {course_id} not found")
         
-        return {
-            "student_id": student_id,
-            "student_name": f"{student.first_name} {student.last_name}",
-            "course_id": course_id,
-            "course_name": course.name,
-            "total_classes": total_classes,
-            "attended_classes": attended_classes,
-            "absent_classes": total_classes - attended_classes,
-            "attendance_percentage": round(attendance_percentage, 2)
-        }
+        # A course without enrollments yields a single row with no student
+        return [_report(row) for row in rows if row.student_id is not None]
+    
+    @staticmethod
+    def rebuild_attendance_summary(db: Session) -> int:
+        """
+        Recompute attendance_summary from the attendance rows.
+        
+        Reconciles any drift (e.g. after manual SQL edits) in one transaction.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            int: Number of summary rows written
+        """
+        db.execute(delete(AttendanceSummary))
+        result = db.execute(insert(AttendanceSummary).from_select(
+            ["student_id", "course_id", "total_classes", "present_classes", "absent_classes"],
+            db.query(
+                Attendance.student_id,
+                Attendance.course_id,
+                func.count(Attendance.id),
+                func.sum(case((Attendance.is_present.is_(True), 1), else_=0)),
+                func.sum(case((Attendance.is_present.is_(True), 0), else_=1)),
+            ).group_by(Attendance.student_id, Attendance.course_id).statement
+        ))
+        db.commit()
+        invalidate_dashboard_stats()
+        
+        logger.info(f"Rebuilt attendance summary: {result.rowcount} rows")
+        return result.rowcount
     
     @staticmethod
     def update_attendance(db: Session, attendance_id: int, attendance_data: AttendanceUpdate) -> Attendance | None:
         """
         Update attendance record.
         
+        Flipping is_present moves one class between the summary's present
+        and absent counters in the same transaction.
+        
         Args:
             db: Database session
             attendance_id: Attendance ID
@@ -181,18 +580,23 @@ class AttendanceService:
         Returns:
             Attendance: Updated attendance record or None
         """
-        attendance = AttendanceService.get_attendance_by_id(db, attendance_id)
+        attendance = db.query(Attendance).filter(Attendance.id == attendance_id).with_for_update().first()
         
         if not attendance:
             return None
         
         if attendance_data.is_present is not None:
+            _apply_summary_deltas(db, {
+                (attendance.student_id, attendance.course_id):
+                    _mark_delta(attendance.is_present, attendance_data.is_present)
+            })
             attendance.is_present = attendance_data.is_present
         if attendance_data.remarks is not None:
             attendance.remarks = attendance_data.remarks
         
         db.commit()
         db.refresh(attendance)
+        invalidate_dashboard_stats()
         
         logger.info(f"Updated attendance record {attendance_id}")
         return attendance
@@ -200,7 +604,7 @@ class AttendanceService:
     @staticmethod
     def delete_attendance(db: Session, attendance_id: int) -> bool:
         """
-        Delete an attendance record.
+        Delete an attendance record (and take it off the summary counters).
         
         Args:
             db: Database session
@@ -209,13 +613,72 @@ class AttendanceService:
         Returns:
             bool: True if deleted, False if not found
         """
-        attendance = AttendanceService.get_attendance_by_id(db, attendance_id)
+        attendance = db.query(Attendance).filter(Attendance.id == attendance_id).with_for_update().first()
         
         if not attendance:
             return False
         
+        _apply_summary_deltas(db, {
+            (attendance.student_id, attendance.course_id):
+                (-1, -int(attendance.is_present), -int(not attendance.is_present))
+        })
         db.delete(attendance)
         db.commit()
+        invalidate_dashboard_stats()
         
         logger.info(f"Deleted attendance record {attendance_id}")
         return True
+
+
+class AsyncAttendanceService:
+    """Async facade over AttendanceService for the API routers."""
+    
+    @staticmethod
+    async def mark_attendance(db: Session | AsyncSession, attendance_data: AttendanceCreate) -> Attendance:
+        """Async variant of AttendanceService.mark_attendance."""
+        return await run_db(db, AttendanceService.mark_attendance, attendance_data)
+    
+    @staticmethod
+    async def mark_attendance_bulk(db: Session | AsyncSession, bulk_data: AttendanceBulkCreate) -> dict:
+        """Async variant of AttendanceService.mark_attendance_bulk."""
+        return await run_db(db, AttendanceService.mark_attendance_bulk, bulk_data)
+    
+    @staticmethod
+    async def get_attendance_by_id(db: Session | AsyncSession, attendance_id: int) -> Attendance | None:
+        """Async variant of AttendanceService.get_attendance_by_id."""
+        return await run_db(db, AttendanceService.get_attendance_by_id, attendance_id)
+    
+    @staticmethod
+    async def get_attendance_detail(db: Session | AsyncSession, attendance_id: int, fields: tuple[str, ...] | None = None) -> Attendance | None:
+        """Async variant of AttendanceService.get_attendance_detail."""
+        return await run_db(db, AttendanceService.get_attendance_detail, attendance_id, fields)
+    
+    @staticmethod
+    async def get_attendance_by_student(db: Session | AsyncSession, student_id: int, course_id: int | None = None, fields: tuple[str, ...] | None = None) -> list[Attendance]:
+        """Async variant of AttendanceService.get_attendance_by_student."""
+        return await run_db(db, AttendanceService.get_attendance_by_student, student_id, course_id, fields)
+    
+    @staticmethod
+    async def get_attendance_by_date(db: Session | AsyncSession, attendance_date: date, course_id: int | None = None, fields: tuple[str, ...] | None = None) -> list[Attendance]:
+        """Async variant of AttendanceService.get_attendance_by_date."""
+        return await run_db(db, AttendanceService.get_attendance_by_date, attendance_date, course_id, fields)
+    
+    @staticmethod
+    async def get_attendance_report(db: Session | AsyncSession, student_id: int, course_id: int) -> dict:
+        """Async variant of AttendanceService.get_attendance_report."""
+        return await run_db(db, AttendanceService.get_attendance_report, student_id, course_id)
+    
+    @staticmethod
+    async def get_course_attendance_report(db: Session | AsyncSession, course_id: int) -> list[dict]:
+        """Async variant of AttendanceService.get_course_attendance_report."""
+        return await run_db(db, AttendanceService.get_course_attendance_report, course_id)
+    
+    @staticmethod
+    async def update_attendance(db: Session | AsyncSession, attendance_id: int, attendance_data: AttendanceUpdate) -> Attendance | None:
+        """Async variant of AttendanceService.update_attendance."""
+        return await run_db(db, AttendanceService.update_attendance, attendance_id, attendance_data)
+    
+    @staticmethod
+    async def delete_attendance(db: Session | AsyncSession, attendance_id: int) -> bool:
+        """Async variant of AttendanceService.delete_attendance."""
+        return await run_db(db, AttendanceService.delete_attendance, attendance_id)
@@ -0,0 +1,73 @@
+"""
+Response cache for the course endpoints.
+GET /api/courses pages and GET /api/courses/{id} details are cached as
+rendered JSON; services drop exactly the entries a write affects:
+  - course created: the listings
+  - course updated or deleted: the listings and that course's detail
+  - enrollments changed: the details of the courses involved
+  - enrolled student updated or deleted: the details of their courses
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.response_cache import ResponseCache, make_response_backend
+from app.models.student import student_course
+
+
+# Group holding every cached page of the course listing
+COURSE_LISTINGS_GROUP = "courses"
+
+course_response_cache = ResponseCache(make_response_backend(
+    settings.course_cache_backend,
+    maxsize=settings.course_cache_size,
+    ttl=settings.course_cache_ttl_seconds,
+    redis_url=settings.course_cache_redis_url,
+))
+
+
+def course_listing_key(skip: int, limit: int, sort: str, fields: tuple[str, ...] | None = None) -> str:
+    """Cache key of a GET /api/courses page (fields: its sparse fieldset, see app.core.fieldsets)."""
+    return f"{COURSE_LISTINGS_GROUP}:{skip}:{limit}:{sort}:{','.join(fields) if fields else '*'}"
+
+
+def course_detail_key(course_id: int) -> str:
+    """Cache key of a GET /api/courses/{id} response."""
+    return f"course:{course_id}"
+
+
+def invalidate_course_listings(db: Session) -> None:
+    """Drop every cached course listing page (db: session of the write)."""
+    course_response_cache.invalidate(db, groups=[COURSE_LISTINGS_GROUP])
+
+
+def invalidate_courses(db: Session, course_ids: list[int]) -> None:
+    """Drop the listings and the details of courses that changed or were deleted."""
+    course_response_cache.invalidate(
+        db, keys=[course_detail_key(course_id) for course_id in course_ids], groups=[COURSE_LISTINGS_GROUP]
+    )
+
+
+def invalidate_course_details(db: Session, course_ids: list[int]) -> None:
+    """Drop the cached details (rosters) of courses."""
+    course_response_cache.invalidate(db, keys=[course_detail_key(course_id) for course_id in course_ids])
+
+
+def enrolled_course_ids(db: Session, student_ids: list[int]) -> list[int]:
+    """
+    Get the courses students are enrolled in (whose cached rosters show them).
+
+    Args:
+        db: Database session
+        student_ids: Student IDs
+
+    Returns:
+        list: Course IDs
+    """
+    return list(db.execute(
+        select(student_course.c.course_id).where(student_course.c.student_id.in_(student_ids)).distinct()
+    ).scalars())
+
+
+def course_cache_stats() -> dict:
+    """Get the course response cache's backend, size and hit/miss counters."""
+    return course_response_cache.stats()
@@ -2,14 +2,40 @@
 Course service for handling course-related business logic.
 """
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from app.core.database import run_db
+from app.core.fieldsets import column_options, wants
 from app.models.course import Course
+from app.models.purge_job import PurgeJob
+from app.models.student import Student, student_course
 from app.schemas.course import CourseCreate, CourseUpdate
+from app.services.course_cache import invalidate_course_details, invalidate_course_listings, invalidate_courses
+from app.services.purge_service import PurgeService
+from app.services.stats_service import invalidate_dashboard_stats
+from app.utils.pagination import keyset_paginate
+from app.utils.upsert import insert_ignore
 
 
 logger = logging.getLogger(__name__)
 
 
+# Sort keys for course listings; each ends with the unique id as tie-breaker
+COURSE_SORT_KEYS = {
+    "id": [Course.id],
+    "name": [Course.name, Course.id],
+    "code": [Course.code, Course.id],
+}
+
+
+def _sort_columns(sort: str) -> list:
+    """Resolve a course sort key, raising ValueError for unknown keys."""
+    if sort not in COURSE_SORT_KEYS:
+        raise ValueError(f"Invalid sort '{sort}'; expected one of: {', '.join(COURSE_SORT_KEYS)}")
+    return COURSE_SORT_KEYS[sort]
+
+
 class CourseService:
     """Service for course operations."""
     
@@ -25,13 +51,17 @@ class CourseService:
         Returns:
             Course: Created course instance
         """
-        # Check if course code already exists
-        existing_course = db.query(Course).filter(Course.code == course_data.code).first()
+        # Check if course code already exists (soft-deleted courses keep theirs until purged)
+        existing_course = db.query(Course).filter(
+            Course.code == course_data.code
+        ).execution_options(include_deleted=True).first()
         if existing_course:
             raise ValueError(f"Course code '{course_data.code}' already exists")
         
         # Check if course name already exists
-        existing_course = db.query(Course).filter(Course.name == course_data.name).first()
+        existing_course = db.query(Course).filter(
+            Course.name == course_data.name
+        ).execution_options(include_deleted=True).first()
         if existing_course:
             raise ValueError(f"Course name '{course_data.name}' already exists")
         
@@ -45,6 +75,8 @@ class CourseService:
         db.add(db_course)
         db.commit()
         db.refresh(db_course)
+        invalidate_dashboard_stats()
+        invalidate_course_listings(db)
         
         logger.info(f"Created new course: {db_course.name} ({db_course.code})")
         return db_course
@@ -64,7 +96,26 @@ class CourseService:
         return db.query(Course).filter(Course.id == course_id).first()
     
     @staticmethod
-    def get_all_courses(db: Session, skip: int = 0, limit: int = 10) -> tuple[list[Course], int]:
+    def get_course_detail(db: Session, course_id: int, fields: tuple[str, ...] | None = None) -> Course | None:
+        """
+        Get course by ID with enrolled students loaded.
+        
+        Args:
+            db: Database session
+            course_id: Course ID
+            fields: Response fields to load (see app.core.fieldsets), or None for all
+            
+        Returns:
+            Course: Course instance with students (when requested), or None
+        """
+        query = db.query(Course).options(*column_options(Course, fields))
+        if wants(fields, "students"):
+            # selectinload: one extra IN query for the (possibly large) roster
+            query = query.options(selectinload(Course.students))
+        return query.filter(Course.id == course_id).first()
+    
+    @staticmethod
+    def get_all_courses(db: Session, skip: int = 0, limit: int = 10, sort: str = "id", fields: tuple[str, ...] | None = None, with_total: bool = True) -> tuple[list[Course], int | None]:
         """
         Get paginated list of courses.
         
@@ -72,14 +123,37 @@ class CourseService:
             db: Database session
             skip: Number of records to skip
             limit: Maximum number of records to return
+            sort: Sort key (see COURSE_SORT_KEYS)
+            fields: Response fields to load (see app.core.fieldsets), or None for all
+            with_total: Count all courses (False skips the COUNT query)
             
         Returns:
-            tuple: (courses list, total count)
+            tuple: (courses list, total count or None)
         """
-        total = db.query(Course).count()
-        courses = db.query(Course).offset(skip).limit(limit).all()
+        total = db.query(Course).count() if with_total else None
+        courses = db.query(Course).options(*column_options(Course, fields)).order_by(*_sort_columns(sort)).offset(skip).limit(limit).all()
         return courses, total
     
+    @staticmethod
+    def get_courses_after(db: Session, limit: int = 10, after: str | None = None, sort: str = "id", fields: tuple[str, ...] | None = None) -> tuple[list[Course], str | None]:
+        """
+        Get a page of courses using keyset pagination.
+        
+        Args:
+            db: Database session
+            limit: Maximum number of records to return
+            after: Cursor from the previous page, or None for the first page
+            sort: Sort key (see COURSE_SORT_KEYS)
+            fields: Response fields to load (see app.core.fieldsets), or None for all
+            
+        Returns:
+            tuple: (courses list, next cursor or None on the last page)
+        """
+        sort_columns = _sort_columns(sort)
+        # The sort columns are read back to build the next cursor
+        query = db.query(Course).options(*column_options(Course, fields, *sort_columns))
+        return keyset_paginate(query, sort_columns, sort, limit, after)
+    
     @staticmethod
     def update_course(db: Session, course_id: int, course_data: CourseUpdate) -> Course | None:
         """
@@ -110,6 +184,7 @@ class CourseService:
         
         db.commit()
         db.refresh(course)
+        invalidate_courses(db, [course_id])
         
         logger.info(f"Updated course: {course.name}")
         return course
@@ -117,7 +192,9 @@ class CourseService:
     @staticmethod
     def delete_course(db: Session, course_id: int) -> bool:
         """
-        Delete a course.
+        Delete a course with its attendance, summary and enrollment rows.
+        
+        PurgeService drops its cached responses.
         
         Args:
             db: Database session
@@ -126,13 +203,126 @@ class CourseService:
         Returns:
             bool: True if deleted, False if not found
         """
-        course = CourseService.get_course_by_id(db, course_id)
+        return bool(PurgeService.delete_now(db, "course", [course_id]))
+    
+    @staticmethod
+    def purge_course(db: Session, course_id: int) -> PurgeJob | None:
+        """
+        Hide a course now and create a job that removes its rows in the background.
         
-        if not course:
-            return False
+        Args:
+            db: Database session
+            course_id: Course ID
+            
+        Returns:
+            PurgeJob: Pending purge job, or None if the course was not found
+        """
+        return PurgeService.start_purge(db, "course", [course_id])
+    
+    @staticmethod
+    def bulk_update_enrollments(db: Session, course_id: int, student_ids: list[int], action: str = "add") -> dict:
+        """
+        Enroll or unenroll many students in one statement.
         
-        db.delete(course)
-        db.commit()
+        Unknown student ids are found with one IN query; the rest are
+        inserted with one INSERT that skips existing enrollments, or
+        deleted with one DELETE. Enrollment collections are never loaded.
+        
+        Args:
+            db: Database session
+            course_id: Course ID
+            student_ids: Student IDs (duplicates are ignored)
+            action: "add" or "remove"
+            
+        Returns:
+            dict: Counts of added/removed, skipped and missing students
+        """
+        if action not in ("add", "remove"):
+            raise ValueError(f"Invalid action '{action}'; expected add or remove")
+        
+        if not db.query(Course.id).filter(Course.id == course_id).first():
+            raise ValueError(f"Course with ID {course_id} not found")
+        
+        requested = list(dict.fromkeys(student_ids))
+        known = {student_id for (student_id,) in db.query(Student.id).filter(Student.id.in_(requested))}
+        missing_ids = [student_id for student_id in requested if student_id not in known]
         
-        logger.info(f"Deleted course with ID: {course_id}")
-        return True
+        changed = 0
+        if known:
+            if action == "add":
+                stmt = insert_ignore(
+                    db.get_bind().dialect.name,
+                    student_course,
+                    [{"student_id": student_id, "course_id": course_id} for student_id in known],
+                    conflict_columns=["student_id", "course_id"],
+                )
+            else:
+                stmt = delete(student_course).where(
+                    student_course.c.course_id == course_id,
+                    student_course.c.student_id.in_(known)
+                )
+            changed = db.execute(stmt).rowcount
+            db.commit()
+            invalidate_dashboard_stats()
+            if changed:
+                invalidate_course_details(db, [course_id])
+        
+        logger.info(f"Bulk {action} enrollments for course {course_id}: {changed} changed, {len(missing_ids)} missing")
+        return {
+            "course_id": course_id,
+            "action": action,
+            "added": changed if action == "add" else 0,
+            "removed": changed if action == "remove" else 0,
+            "skipped": len(known) - changed,
+            "missing": len(missing_ids),
+            "missing_ids": missing_ids
+        }
+
+
+class AsyncCourseService:
+    """Async facade over CourseService for the API routers."""
+    
+    @staticmethod
+    async def create_course(db: Session | AsyncSession, course_data: CourseCreate) -> Course:
+        """Async variant of CourseService.create_course."""
+        return await run_db(db, CourseService.create_course, course_data)
+    
+    @staticmethod
+    async def get_course_by_id(db: Session | AsyncSession, course_id: int) -> Course | None:
+        """Async variant of CourseService.get_course_by_id."""
+        return await run_db(db, CourseService.get_course_by_id, course_id)
+    
+    @staticmethod
+    async def get_course_detail(db: Session | AsyncSession, course_id: int, fields: tuple[str, ...] | None = None) -> Course | None:
+        """Async variant of CourseService.get_course_detail."""
+        return await run_db(db, CourseService.get_course_detail, course_id, fields)
+    
+    @staticmethod
+    async def get_all_courses(db: Session | AsyncSession, skip: int = 0, limit: int = 10, sort: str = "id", fields: tuple[str, ...] | None = None, with_total: bool = True) -> tuple[list[Course], int | None]:
+        """Async variant of CourseService.get_all_courses."""
+        return await run_db(db, CourseService.get_all_courses, skip, limit, sort, fields, with_total)
+    
+    @staticmethod
+    async def get_courses_after(db: Session | AsyncSession, limit: int = 10, after: str | None = None, sort: str = "id", fields: tuple[str, ...] | None = None) -> tuple[list[Course], str | None]:
+        """Async variant of CourseService.get_courses_after."""
+        return await run_db(db, CourseService.get_courses_after, limit, after, sort, fields)
+    
+    @staticmethod
+    async def update_course(db: Session | AsyncSession, course_id: int, course_data: CourseUpdate) -> Course | None:
+        """Async variant of CourseService.update_course."""
+        return await run_db(db, CourseService.update_course, course_id, course_data)
+    
+    @staticmethod
+    async def delete_course(db: Session | AsyncSession, course_id: int) -> bool:
+        """Async variant of CourseService.delete_course."""
+        return await run_db(db, CourseService.delete_course, course_id)
+    
+    @staticmethod
+    async def purge_course(db: Session | AsyncSession, course_id: int) -> PurgeJob | None:
+        """Async variant of CourseService.purge_course."""
+        return await run_db(db, CourseService.purge_course, course_id)
+    
+    @staticmethod
+    async def bulk_update_enrollments(db: Session | AsyncSession, course_id: int, student_ids: list[int], action: str = "add") -> dict:
+        """Async variant of CourseService.bulk_update_enrollments."""
+        return await run_db(db, CourseService.bulk_update_enrollments, course_id, student_ids, action)
@@ -0,0 +1,212 @@
+"""
+Export service for streaming students, courses and attendance as CSV or NDJSON.
+Rows are read from a server-side cursor in fixed-size partitions and encoded
+partition by partition, so memory stays constant whatever the table size.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime, time, timedelta
+from typing import AsyncIterator, Iterator
+from sqlalchemy import Boolean, Date, DateTime, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.database import join_live
+from app.models.attendance import Attendance
+from app.models.course import Course
+from app.models.student import Student, student_course
+
+
+# Rows fetched from the cursor (and encoded) per partition
+EXPORT_BATCH_SIZE = 5000
+
+# Exportable tables: columns in output order
+EXPORTS = {
+    "students": [
+        Student.id, Student.first_name, Student.last_name, Student.email, Student.phone,
+        Student.address, Student.enrollment_date, Student.created_at, Student.updated_at,
+    ],
+    "courses": [
+        Course.id, Course.name, Course.code, Course.description, Course.credits,
+        Course.created_at, Course.updated_at,
+    ],
+    "attendance": [
+        Attendance.id, Attendance.student_id, Attendance.course_id, Attendance.attendance_date,
+        Attendance.attendance_day, Attendance.is_present, Attendance.remarks,
+        Attendance.created_at, Attendance.updated_at,
+    ],
+}
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _isoformat(value) -> str:
+    return value.isoformat()
+
+
+def _csv_bool(value) -> str:
+    return "true" if value else "false"
+
+
+def _converters(columns: list, fmt: str) -> list[tuple[int, object]]:
+    """
+    Pick per-column value converters once, from the column types.
+
+    Dates become ISO 8601 strings; CSV booleans become true/false. Other
+    values are written as-is (csv writes NULL as an empty cell).
+
+    Args:
+        columns: Exported columns
+        fmt: Output format
+
+    Returns:
+        list: (column index, converter) for the columns that need one
+    """
+    converters = []
+    for index, column in enumerate(columns):
+        if isinstance(column.type, (DateTime, Date)):
+            converters.append((index, _isoformat))
+        elif fmt == "csv" and isinstance(column.type, Boolean):
+            converters.append((index, _csv_bool))
+    return converters
+
+
+class ExportEncoder:
+    """Encodes row partitions as CSV or NDJSON bytes, optionally gzip-compressed."""
+    
+    def __init__(self, fmt: str, columns: list, compress: bool = False):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Invalid format '{fmt}'; expected one of: {', '.join(EXPORT_FORMATS)}")
+        self.fmt = fmt
+        self.names = [column.key for column in columns]
+        self._converters = _converters(columns, fmt)
+        # wbits=31: gzip container, readable by gunzip and browsers
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    
+    def _convert(self, rows):
+        """Apply the column converters to each row (NULLs are left alone)."""
+        for row in rows:
+            row = list(row)
+            for index, converter in self._converters:
+                value = row[index]
+                if value is not None:
+                    row[index] = converter(value)
+            yield row
+    
+    def _output(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) if self._compressor else data
+    
+    def header(self) -> bytes:
+        """Bytes to send before the first row (the CSV header line)."""
+        if self.fmt != "csv":
+            return b""
+        return self._output((",".join(self.names) + "\r\n").encode())
+    
+    def encode(self, rows) -> bytes:
+        """
+        Encode one partition of rows.
+        
+        Args:
+            rows: Row tuples in column order
+        
+        Returns:
+            bytes: Encoded (and possibly compressed) chunk; may be empty while gzip buffers
+        """
+        if self.fmt == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(self._convert(rows))
+            text = buffer.getvalue()
+        else:
+            names = self.names
+            text = "".join(json.dumps(dict(zip(names, row))) + "\n" for row in self._convert(rows))
+        return self._output(text.encode())
+    
+    def finish(self) -> bytes:
+        """Bytes to send after the last row (the end of the gzip stream)."""
+        return self._compressor.flush() if self._compressor else b""
+
+
+class ExportService:
+    """Service for streaming exports."""
+    
+    @staticmethod
+    def export_query(kind: str, course_id: int | None = None, date_from: date | None = None, date_to: date | None = None):
+        """
+        Build the export statement for a table.
+        
+        Filters:
+            students: course_id (enrolled students) and enrollment date range
+            courses: course_id and creation date range
+            attendance: course_id and attendance day range
+        
+        Args:
+            kind: One of EXPORTS
+            course_id: Optional course filter
+            date_from: Optional first day (inclusive)
+            date_to: Optional last day (inclusive)
+        
+        Returns:
+            Select: Statement ordered by primary key, set up to stream in partitions
+        """
+        if kind not in EXPORTS:
+            raise ValueError(f"Unknown export '{kind}'; expected one of: {', '.join(EXPORTS)}")
+        if date_from and date_to and date_from > date_to:
+            raise ValueError("date_from must not be after date_to")
+        
+        columns = EXPORTS[kind]
+        stmt = select(*columns)
+        
+        if kind == "attendance":
+            date_column = Attendance.attendance_day
+            start, end = date_from, date_to
+            # Leave out the attendance of students and courses waiting to be purged
+            stmt = join_live(stmt, (Student, Attendance.student_id), (Course, Attendance.course_id))
+            if course_id is not None:
+                stmt = stmt.where(Attendance.course_id == course_id)
+        else:
+            model = Student if kind == "students" else Course
+            date_column = Student.enrollment_date if kind == "students" else Course.created_at
+            # Core statements bypass the ORM soft-delete filter
+            stmt = stmt.where(model.deleted_at.is_(None))
+            # DateTime columns: whole days from midnight to midnight
+            start = datetime.combine(date_from, time.min) if date_from else None
+            end = datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None
+            if course_id is not None and kind == "students":
+                stmt = stmt.join(student_course, student_course.c.student_id == Student.id).where(
+                    student_course.c.course_id == course_id
+                )
+            elif course_id is not None:
+                stmt = stmt.where(Course.id == course_id)
+        
+        if start is not None:
+            stmt = stmt.where(date_column >= start)
+        if end is not None:
+            stmt = stmt.where(date_column <= end if kind == "attendance" else date_column < end)
+        
+        return stmt.order_by(columns[0]).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    
+    @staticmethod
+    def iter_partitions(db: Session, stmt) -> Iterator[list]:
+        """
+        Stream an export statement's rows in partitions from a server-side cursor.
+        
+        Args:
+            db: Database session (kept busy until the iterator is exhausted)
+            stmt: Statement from export_query
+        
+        Yields:
+            list: Up to EXPORT_BATCH_SIZE row tuples
+        """
+        # Core execution on the session's connection: plain row tuples, no ORM loading overhead
+        result = db.connection().execute(stmt)
+        for partition in result.partitions():
+            yield partition
+    
+    @staticmethod
+    async def aiter_partitions(db: AsyncSession, stmt) -> AsyncIterator[list]:
+        """Async variant of ExportService.iter_partitions (streams over the async driver)."""
+        connection = await db.connection()
+        result = await connection.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
@@ -0,0 +1,236 @@
+"""
+Purge service for deleting students and courses with their dependent rows.
+Deletes are set-based (one DELETE per dependent table) instead of ORM cascades
+that load and delete every attendance row one by one. Large deletions can run
+as background purge jobs that soft-delete the records at once and remove the
+attendance rows in small batches, one short transaction each.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import delete, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal, run_db
+from app.models.attendance import Attendance, AttendanceSummary
+from app.models.course import Course
+from app.models.purge_job import PurgeJob
+from app.models.student import Student, student_course
+from app.services.course_cache import enrolled_course_ids, invalidate_course_details, invalidate_courses
+from app.services.stats_service import invalidate_dashboard_stats
+
+
+logger = logging.getLogger(__name__)
+
+
+# Attendance rows removed per batch (and per commit) by purge jobs
+PURGE_BATCH_SIZE = 5000
+
+# Entity -> (model, foreign key columns referencing it in attendances, attendance_summary, student_course)
+PURGE_TARGETS = {
+    "student": (Student, Attendance.student_id, AttendanceSummary.student_id, student_course.c.student_id),
+    "course": (Course, Attendance.course_id, AttendanceSummary.course_id, student_course.c.course_id),
+}
+
+
+def _target(entity: str) -> tuple:
+    """Resolve a purge entity, raising ValueError for unknown ones."""
+    if entity not in PURGE_TARGETS:
+        raise ValueError(f"Invalid entity '{entity}'; expected one of: {', '.join(PURGE_TARGETS)}")
+    return PURGE_TARGETS[entity]
+
+
+def _invalidate_course_responses(db: Session, entity: str, ids: list[int], course_ids: list[int]) -> None:
+    """Drop the cached course responses showing deleted records (course_ids: rosters of deleted students)."""
+    if entity == "course":
+        invalidate_courses(db, ids)
+    else:
+        invalidate_course_details(db, course_ids)
+
+
+def _delete_rows(db: Session, entity: str, ids: list[int]) -> int:
+    """
+    Delete records and every dependent row with one DELETE per table (caller commits).
+    
+    Args:
+        db: Database session
+        entity: student or course
+        ids: Record ids
+    
+    Returns:
+        int: Number of records deleted
+    """
+    model, attendance_fk, summary_fk, enrollment_fk = _target(entity)
+    db.execute(delete(Attendance.__table__).where(attendance_fk.in_(ids)))
+    db.execute(delete(AttendanceSummary.__table__).where(summary_fk.in_(ids)))
+    db.execute(delete(student_course).where(enrollment_fk.in_(ids)))
+    return db.execute(delete(model.__table__).where(model.id.in_(ids))).rowcount
+
+
+class PurgeService:
+    """Service for deleting students and courses."""
+    
+    @staticmethod
+    def delete_now(db: Session, entity: str, ids: list[int]) -> list[int]:
+        """
+        Delete records and their attendance, summary and enrollment rows in one transaction.
+        
+        Args:
+            db: Database session
+            entity: student or course
+            ids: Record ids
+        
+        Returns:
+            list: Ids that were deleted (unknown or already deleted ids are left out)
+        """
+        model = _target(entity)[0]
+        existing = [record_id for (record_id,) in db.query(model.id).filter(model.id.in_(set(ids)))]
+        if existing:
+            course_ids = enrolled_course_ids(db, existing) if entity == "student" else []
+            _delete_rows(db, entity, existing)
+            db.commit()
+            invalidate_dashboard_stats()
+            _invalidate_course_responses(db, entity, existing, course_ids)
+            logger.info(f"Deleted {len(existing)} {entity}(s)")
+        return existing
+    
+    @staticmethod
+    def start_purge(db: Session, entity: str, ids: list[int]) -> PurgeJob | None:
+        """
+        Soft-delete records now and create a job that removes them in the background.
+        
+        The records disappear from the API as soon as this commits; run
+        run_purge_job with the returned job's id to remove the rows.
+        
+        Args:
+            db: Database session
+            entity: student or course
+            ids: Record ids
+        
+        Returns:
+            PurgeJob: The pending job, or None if none of the ids exist
+        """
+        model, attendance_fk = _target(entity)[:2]
+        existing = [record_id for (record_id,) in db.query(model.id).filter(model.id.in_(set(ids)))]
+        if not existing:
+            return None
+        
+        course_ids = enrolled_course_ids(db, existing) if entity == "student" else []
+        db.execute(
+            update(model.__table__).where(model.id.in_(existing)).values(deleted_at=datetime.now(timezone.utc))
+        )
+        job = PurgeJob(
+            entity=entity,
+            target_ids=json.dumps(existing),
+            status="pending",
+            total_rows=db.query(func.count(Attendance.id)).filter(attendance_fk.in_(existing)).scalar(),
+            rows_deleted=0,
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        invalidate_dashboard_stats()
+        _invalidate_course_responses(db, entity, existing, course_ids)
+        
+        logger.info(f"Started purge job {job.id} for {len(existing)} {entity}(s), {job.total_rows} attendance rows")
+        return job
+    
+    @staticmethod
+    def run_purge_job(job_id: int, batch_size: int = PURGE_BATCH_SIZE) -> None:
+        """
+        Remove a purge job's records in batches, recording progress on the job.
+        
+        Runs in its own session (as a background task or from the CLI) and can
+        be re-run after an interruption: it only deletes what is still there.
+        
+        Args:
+            job_id: Purge job ID
+            batch_size: Attendance rows removed per transaction
+        """
+        with SessionLocal() as db:
+            job = db.query(PurgeJob).filter(PurgeJob.id == job_id).first()
+            if not job or job.status == "done":
+                return
+            
+            _, attendance_fk, _, _ = _target(job.entity)
+            ids = json.loads(job.target_ids)
+            job.status = "running"
+            job.error = None
+            db.commit()
+            
+            try:
+                while True:
+                    batch = [
+                        attendance_id for (attendance_id,) in
+                        db.query(Attendance.id).filter(attendance_fk.in_(ids)).limit(batch_size)
+                    ]
+                    if not batch:
+                        break
+                    db.execute(delete(Attendance.__table__).where(Attendance.id.in_(batch)))
+                    job.rows_deleted += len(batch)
+                    db.commit()
+                
+                # Only small tables are left: finish in one transaction
+                _delete_rows(db, job.entity, ids)
+                job.status = "done"
+                job.finished_at = datetime.now(timezone.utc)
+                db.commit()
+                invalidate_dashboard_stats()
+            except Exception as e:
+                db.rollback()
+                job.status = "failed"
+                job.error = str(e)
+                db.commit()
+                logger.exception(f"Purge job {job_id} failed")
+                return
+        
+        logger.info(f"Purge job {job_id} done")
+    
+    @staticmethod
+    def get_purge_job(db: Session, job_id: int) -> PurgeJob | None:
+        """
+        Get a purge job by ID.
+        
+        Args:
+            db: Database session
+            job_id: Purge job ID
+        
+        Returns:
+            PurgeJob: Purge job or None
+        """
+        return db.query(PurgeJob).filter(PurgeJob.id == job_id).first()
+    
+    @staticmethod
+    def unfinished_job_ids(db: Session) -> list[int]:
+        """
+        Get ids of purge jobs that have not finished (e.g. interrupted by a restart).
+        
+        Args:
+            db: Database session
+        
+        Returns:
+            list: Purge job ids, oldest first
+        """
+        return [
+            job_id for (job_id,) in
+            db.query(PurgeJob.id).filter(PurgeJob.status != "done").order_by(PurgeJob.id)
+        ]
+
+
+class AsyncPurgeService:
+    """Async facade over PurgeService for the API routers."""
+    
+    @staticmethod
+    async def delete_now(db: Session | AsyncSession, entity: str, ids: list[int]) -> list[int]:
+        """Async variant of PurgeService.delete_now."""
+        return await run_db(db, PurgeService.delete_now, entity, ids)
+    
+    @staticmethod
+    async def start_purge(db: Session | AsyncSession, entity: str, ids: list[int]) -> PurgeJob | None:
+        """Async variant of PurgeService.start_purge."""
+        return await run_db(db, PurgeService.start_purge, entity, ids)
+    
+    @staticmethod
+    async def get_purge_job(db: Session | AsyncSession, job_id: int) -> PurgeJob | None:
+        """Async variant of PurgeService.get_purge_job."""
+        return await run_db(db, PurgeService.get_purge_job, job_id)
@@ -0,0 +1,78 @@
+"""
+Student full-text search backend.
+Uses the FULLTEXT index on MySQL and the FTS5 table on SQLite (see app/models/student.py),
+with relevance ranking and prefix matching. Other databases fall back to ILIKE.
+"""
+import re
+from sqlalchemy import Column, Integer, MetaData, Table, literal_column, or_
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.student import Student
+
+
+# The FTS5 shadow table, for use in queries only (never created through metadata)
+students_fts = Table(
+    "students_fts",
+    MetaData(),
+    Column("rowid", Integer),
+    Column("rank"),
+)
+
+# InnoDB ignores tokens shorter than innodb_ft_min_token_size (default 3)
+MYSQL_MIN_TOKEN_SIZE = 3
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokens(search_term: str) -> list[str]:
+    """Split a search term into word tokens, dropping query-syntax characters."""
+    return _TOKEN_RE.findall(search_term.lower())
+
+
+def _like_filter(search_term: str):
+    """Substring match on name and email (full scan; used when no full-text index applies)."""
+    return or_(
+        Student.first_name.ilike(f"%{search_term}%"),
+        Student.last_name.ilike(f"%{search_term}%"),
+        Student.email.ilike(f"%{search_term}%")
+    )
+
+
+def student_search_query(db: Session, search_term: str, ranked: bool = True):
+    """
+    Build a query for students matching a search term.
+
+    Every word of the term must match the start of a word in the first name,
+    last name or email ("ann lee" matches "Annabel Leeds").
+
+    Args:
+        db: Database session
+        search_term: Search term as typed by the user
+        ranked: Order by relevance (best first); leave off for counting
+
+    Returns:
+        Query: ORM query over Student
+    """
+    tokens = _tokens(search_term)
+    dialect_name = db.get_bind().dialect.name
+    query = db.query(Student)
+
+    if settings.student_search_backend == "fulltext" and tokens:
+        if dialect_name == "sqlite":
+            match = " ".join(f'"{token}"*' for token in tokens)
+            query = query.join(students_fts, students_fts.c.rowid == Student.id).filter(
+                literal_column("students_fts").op("MATCH")(match)
+            )
+            return query.order_by(students_fts.c.rank, Student.id) if ranked else query
+
+        if dialect_name in ("mysql", "mariadb") and all(len(token) >= MYSQL_MIN_TOKEN_SIZE for token in tokens):
+            relevance = mysql.match(
+                Student.first_name, Student.last_name, Student.email,
+                against=" ".join(f"+{token}*" for token in tokens),
+            ).in_boolean_mode()
+            query = query.filter(relevance)
+            return query.order_by(relevance.desc(), Student.id) if ranked else query
+
+    query = query.filter(_like_filter(search_term))
+    return query.order_by(Student.id) if ranked else query
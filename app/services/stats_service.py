@@ -0,0 +1,153 @@
+"""
+Stats service for the dashboard numbers.
+Everything is computed in one SELECT of scalar subqueries and cached for a
+short time; services that change students, courses, enrollments or
+attendance drop the cached numbers through invalidate_dashboard_stats.
+"""
+import logging
+from datetime import date, datetime, timezone
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import join_live, run_db
+from app.models.attendance import Attendance, AttendanceSummary
+from app.models.course import Course
+from app.models.student import Student, student_course
+
+
+logger = logging.getLogger(__name__)
+
+
+# Dashboard numbers by day (today's attendance rolls over at midnight)
+_stats_cache = TTLCache(maxsize=2, ttl=settings.stats_cache_ttl_seconds)
+
+
+def invalidate_dashboard_stats() -> None:
+    """Drop the cached dashboard numbers (call after any write they depend on)."""
+    _stats_cache.clear()
+
+
+def dashboard_stats_cache_stats() -> dict:
+    """Get the dashboard stats cache's size and hit/miss counters."""
+    return _stats_cache.stats()
+
+
+def _rate(present: int | None, total: int | None) -> float | None:
+    """Attendance percentage, or None when nothing was marked."""
+    if not total:
+        return None
+    return round((present or 0) * 100 / total, 1)
+
+
+class StatsService:
+    """Service for dashboard statistics."""
+    
+    @staticmethod
+    def get_dashboard_stats(db: Session) -> dict:
+        """
+        Get the dashboard numbers, from the cache when possible.
+        
+        Args:
+            db: Database session (only used on a cache miss)
+        
+        Returns:
+            dict: Counts, today's and overall attendance rates, and at-risk students
+        """
+        stats = _stats_cache.get(date.today())
+        if stats is not None:
+            return stats
+        return StatsService.refresh_dashboard_stats(db)
+    
+    @staticmethod
+    def refresh_dashboard_stats(db: Session) -> dict:
+        """
+        Compute today's dashboard numbers and cache them.
+        
+        Args:
+            db: Database session
+        
+        Returns:
+            dict: Dashboard numbers
+        """
+        today = date.today()
+        stats = StatsService.compute_dashboard_stats(db, today)
+        _stats_cache.set(today, stats)
+        return stats
+    
+    @staticmethod
+    def compute_dashboard_stats(db: Session, today: date) -> dict:
+        """
+        Compute the dashboard numbers in one round trip.
+        
+        A student is at risk when their attendance in some course is below
+        AT_RISK_ATTENDANCE_RATE percent after at least AT_RISK_MIN_CLASSES classes.
+        Students and courses waiting to be purged (and their enrollments and
+        attendance) are not counted.
+        
+        Args:
+            db: Database session
+            today: Day for today's attendance
+        
+        Returns:
+            dict: Dashboard numbers
+        """
+        present = func.sum(case((Attendance.is_present, 1), else_=0))
+        # Rows of students and courses waiting to be purged are left out everywhere
+        live_enrollments = ((Student, student_course.c.student_id), (Course, student_course.c.course_id))
+        live_attendance = ((Student, Attendance.student_id), (Course, Attendance.course_id))
+        live_summaries = ((Student, AttendanceSummary.student_id), (Course, AttendanceSummary.course_id))
+        at_risk = (
+            join_live(select(AttendanceSummary.student_id), *live_summaries)
+            .where(
+                AttendanceSummary.total_classes >= settings.at_risk_min_classes,
+                AttendanceSummary.present_classes * 100 < AttendanceSummary.total_classes * settings.at_risk_attendance_rate,
+            )
+            .distinct()
+            .subquery()
+        )
+        stmt = select(
+            select(func.count(Student.id)).where(Student.deleted_at.is_(None)).scalar_subquery().label("students"),
+            select(func.count(Course.id)).where(Course.deleted_at.is_(None)).scalar_subquery().label("courses"),
+            join_live(select(func.count()).select_from(student_course), *live_enrollments)
+                .scalar_subquery().label("enrollments"),
+            join_live(select(func.count(Attendance.id)), *live_attendance)
+                .where(Attendance.attendance_day == today).scalar_subquery().label("today_total"),
+            join_live(select(present), *live_attendance)
+                .where(Attendance.attendance_day == today).scalar_subquery().label("today_present"),
+            join_live(select(func.sum(AttendanceSummary.total_classes)), *live_summaries)
+                .scalar_subquery().label("all_total"),
+            join_live(select(func.sum(AttendanceSummary.present_classes)), *live_summaries)
+                .scalar_subquery().label("all_present"),
+            select(func.count()).select_from(at_risk).scalar_subquery().label("at_risk"),
+        )
+        row = db.execute(stmt).one()
+        
+        return {
+            "students_count": row.students,
+            "courses_count": row.courses,
+            "enrollments_count": row.enrollments,
+            "today_marked": row.today_total,
+            "today_present": row.today_present or 0,
+            "today_attendance_rate": _rate(row.today_present, row.today_total),
+            "average_attendance_rate": _rate(row.all_present, row.all_total),
+            "at_risk_students": row.at_risk,
+            "generated_at": datetime.now(timezone.utc),
+        }
+
+
+class AsyncStatsService:
+    """Async facade over StatsService for the API routers."""
+    
+    @staticmethod
+    async def get_dashboard_stats(db: Session | AsyncSession) -> dict:
+        """
+        Async variant of StatsService.get_dashboard_stats (a cache hit skips the database entirely).
+        
+        Pass a primary session: the numbers computed on a miss are cached for every client.
+        """
+        stats = _stats_cache.get(date.today())
+        if stats is not None:
+            return stats
+        return await run_db(db, StatsService.refresh_dashboard_stats)
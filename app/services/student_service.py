@@ -1,17 +1,67 @@
 """
 Student service for handling student-related business logic.
 """
+import json
 import logging
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from app.core.database import run_db
 from app.models.student import Student, student_course
 from app.models.course import Course
+from app.models.purge_job import PurgeJob
 from app.schemas.student import StudentCreate, StudentUpdate
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.fieldsets import column_options, wants
+from app.services.purge_service import PurgeService
+from app.services.search_service import student_search_query
+from app.services.course_cache import enrolled_course_ids, invalidate_course_details
+from app.services.stats_service import invalidate_dashboard_stats
+from app.utils.pagination import estimate_row_count, keyset_paginate
+from app.utils.upsert import insert_ignore
 
 
 logger = logging.getLogger(__name__)
 
 
+# Sort keys for student listings; each ends with the unique id as tie-breaker
+STUDENT_SORT_KEYS = {
+    "id": [Student.id],
+    "last_name": [Student.last_name, Student.id],
+    "email": [Student.email, Student.id],
+}
+
+
+# Rows per multi-row INSERT (and per commit) for bulk imports
+BULK_IMPORT_CHUNK_SIZE = 1000
+
+# Per-row errors listed in a bulk import report (the failed count covers all rows)
+BULK_IMPORT_MAX_ERRORS = 1000
+
+# How a listing total is obtained
+TOTAL_MODES = ("exact", "cached", "estimated")
+
+# Exact counts keyed by search term (None for all students); cleared on writes
+_count_cache = TTLCache(maxsize=256, ttl=settings.count_cache_ttl_seconds)
+
+
+def _sort_columns(sort: str) -> list:
+    """Resolve a student sort key, raising ValueError for unknown keys."""
+    if sort not in STUDENT_SORT_KEYS:
+        raise ValueError(f"Invalid sort '{sort}'; expected one of: {', '.join(STUDENT_SORT_KEYS)}")
+    return STUDENT_SORT_KEYS[sort]
+
+
+def _check_student_and_course(db: Session, student_id: int, course_id: int) -> None:
+    """Raise ValueError unless both the student and the course exist (primary-key lookups only)."""
+    if not db.query(Student.id).filter(Student.id == student_id).first():
+        raise ValueError(f"Student with ID {student_id} not found")
+    if not db.query(Course.id).filter(Course.id == course_id).first():
+        raise ValueError(f"Course with ID {course_id} not found")
+
+
 class StudentService:
     """Service for student operations."""
     
@@ -27,8 +77,10 @@ class StudentService:
         Returns:
             Student: Created student instance
         """
-        # Check if email already exists
-        existing_student = db.query(Student).filter(Student.email == student_data.email).first()
+        # Check if email already exists (soft-deleted students keep theirs until purged)
+        existing_student = db.query(Student).filter(
+            Student.email == student_data.email
+        ).execution_options(include_deleted=True).first()
         if existing_student:
             raise ValueError(f"Email '{student_data.email}' already exists")
         
@@ -43,6 +95,8 @@ class StudentService:
         db.add(db_student)
         db.commit()
         db.refresh(db_student)
+        _count_cache.clear()
+        invalidate_dashboard_stats()
         
         logger.info(f"Created new student: {db_student.first_name} {db_student.last_name}")
         return db_student
@@ -62,7 +116,63 @@ class StudentService:
         return db.query(Student).filter(Student.id == student_id).first()
     
     @staticmethod
-    def get_students(db: Session, skip: int = 0, limit: int = 10) -> tuple[list[Student], int]:
+    def get_student_detail(db: Session, student_id: int, fields: tuple[str, ...] | None = None) -> Student | None:
+        """
+        Get student by ID with enrolled courses loaded.
+        
+        Args:
+            db: Database session
+            student_id: Student ID
+            fields: Response fields to load (see app.core.fieldsets), or None for all
+            
+        Returns:
+            Student: Student instance with courses (when requested), or None
+        """
+        query = db.query(Student).options(*column_options(Student, fields))
+        if wants(fields, "courses"):
+            # selectinload: one extra IN query for the collection, no row multiplication
+            query = query.options(selectinload(Student.courses))
+        return query.filter(Student.id == student_id).first()
+    
+    @staticmethod
+    def count_students(db: Session, search_term: str | None = None, mode: str = "exact") -> tuple[int, str]:
+        """
+        Count students, optionally matching a search term.
+        
+        Modes:
+            exact: run COUNT now
+            cached: reuse an exact count up to count_cache_ttl_seconds old
+            estimated: read table statistics (unfiltered counts only; searches use cached)
+        
+        Args:
+            db: Database session
+            search_term: Optional search term
+            mode: One of TOTAL_MODES
+            
+        Returns:
+            tuple: (total, kind of total returned: exact, cached or estimated)
+        """
+        if mode not in TOTAL_MODES:
+            raise ValueError(f"Invalid total mode '{mode}'; expected one of: {', '.join(TOTAL_MODES)}")
+        
+        if mode == "estimated" and search_term is None:
+            return estimate_row_count(db, Student), "estimated"
+        
+        if mode != "exact":
+            cached = _count_cache.get(search_term)
+            if cached is not None:
+                return cached, "cached"
+        
+        if search_term is not None:
+            query = student_search_query(db, search_term, ranked=False)
+        else:
+            query = db.query(Student)
+        total = query.count()
+        _count_cache.set(search_term, total)
+        return total, "exact"
+    
+    @staticmethod
+    def get_students(db: Session, skip: int = 0, limit: int = 10, sort: str = "id", total_mode: str | None = "exact", fields: tuple[str, ...] | None = None) -> tuple[list[Student], int | None, str | None]:
         """
         Get paginated list of students.
         
@@ -70,38 +180,137 @@ class StudentService:
             db: Database session
             skip: Number of records to skip
             limit: Maximum number of records to return
+            sort: Sort key (see STUDENT_SORT_KEYS)
+            total_mode: How to count the total (see count_students), or None to skip it
+            fields: Response fields to load (see app.core.fieldsets), or None for all
             
         Returns:
-            tuple: (students list, total count)
+            tuple: (students list, total count or None, kind of total or None)
         """
-        total = db.query(Student).count()
-        students = db.query(Student).offset(skip).limit(limit).all()
-        return students, total
+        total, total_kind = (
+            StudentService.count_students(db, mode=total_mode) if total_mode else (None, None)
+        )
+        students = db.query(Student).options(*column_options(Student, fields)).order_by(*_sort_columns(sort)).offset(skip).limit(limit).all()
+        return students, total, total_kind
     
     @staticmethod
-    def search_students(db: Session, search_term: str, skip: int = 0, limit: int = 10) -> tuple[list[Student], int]:
+    def get_students_after(db: Session, limit: int = 10, after: str | None = None, sort: str = "id", fields: tuple[str, ...] | None = None) -> tuple[list[Student], str | None]:
         """
-        Search students by name or email.
+        Get a page of students using keyset pagination.
+        
+        Cost does not grow with page depth: the sort index seeks straight to the cursor.
+        
+        Args:
+            db: Database session
+            limit: Maximum number of records to return
+            after: Cursor from the previous page, or None for the first page
+            sort: Sort key (see STUDENT_SORT_KEYS)
+            fields: Response fields to load (see app.core.fieldsets), or None for all
+            
+        Returns:
+            tuple: (students list, next cursor or None on the last page)
+        """
+        sort_columns = _sort_columns(sort)
+        # The sort columns are read back to build the next cursor
+        query = db.query(Student).options(*column_options(Student, fields, *sort_columns))
+        return keyset_paginate(query, sort_columns, sort, limit, after)
+    
+    @staticmethod
+    def search_students(db: Session, search_term: str, skip: int = 0, limit: int = 10, total_mode: str | None = "exact", fields: tuple[str, ...] | None = None) -> tuple[list[Student], int | None, str | None]:
+        """
+        Search students by name or email, best matches first.
+        
+        Uses the full-text index (see app.services.search_service): every word
+        of the term must prefix-match a word in the name or email.
         
         Args:
             db: Database session
             search_term: Search term
             skip: Number of records to skip
             limit: Maximum number of records to return
+            total_mode: How to count the total (see count_students), or None to skip it
+            fields: Response fields to load (see app.core.fieldsets), or None for all
             
         Returns:
-            tuple: (students list, total count)
-        """
-        query = db.query(Student).filter(
-            or_(
-                Student.first_name.ilike(f"%{search_term}%"),
-                Student.last_name.ilike(f"%{search_term}%"),
-                Student.email.ilike(f"%{search_term}%")
-            )
+            tuple: (students list, total count or None, kind of total or None)
+        """
+        total, total_kind = (
+            StudentService.count_students(db, search_term, total_mode) if total_mode else (None, None)
         )
-        total = query.count()
-        students = query.offset(skip).limit(limit).all()
-        return students, total
+        students = student_search_query(db, search_term).options(*column_options(Student, fields)).offset(skip).limit(limit).all()
+        return students, total, total_kind
+    
+    @staticmethod
+    def bulk_create_students(db: Session, rows: list[tuple[int, StudentCreate]]) -> tuple[int, list[dict]]:
+        """
+        Insert one chunk of validated students with a single multi-row INSERT and commit.
+        
+        Emails already in the database (one IN query for the whole chunk) or
+        repeated within the chunk are reported instead of inserted. If the
+        INSERT still conflicts after one retry, the chunk's rows are reported
+        as failed and the rest of the upload continues.
+        
+        Args:
+            db: Database session
+            rows: (row number, student data) pairs, at most BULK_IMPORT_CHUNK_SIZE long
+            
+        Returns:
+            tuple: (number of students inserted, list of per-row errors)
+        """
+        if not rows:
+            return 0, []
+        
+        emails = {student_data.email for _, student_data in rows}
+        # Retry once if a concurrent writer inserts one of the emails between the check and the INSERT
+        for attempt in range(2):
+            # Compared case-insensitively, as MySQL's default collation does
+            # (soft-deleted students keep their emails until purged)
+            existing = {
+                email.lower() for (email,) in db.query(Student.email)
+                .filter(Student.email.in_(emails))
+                .execution_options(include_deleted=True)
+            }
+            
+            errors = []
+            values = []
+            pending = []  # (row number, email) of values
+            seen = set()
+            for row_number, student_data in rows:
+                email = student_data.email.lower()
+                if email in existing:
+                    errors.append({"row": row_number, "email": student_data.email,
+                                   "errors": [f"Email '{student_data.email}' already exists"]})
+                elif email in seen:
+                    errors.append({"row": row_number, "email": student_data.email,
+                                   "errors": [f"Email '{student_data.email}' is repeated in the upload"]})
+                else:
+                    seen.add(email)
+                    values.append(student_data.model_dump())
+                    pending.append((row_number, student_data.email))
+            
+            if not values:
+                return 0, errors
+            
+            try:
+                db.execute(insert(Student).values(values))
+                db.commit()
+                break
+            except IntegrityError:
+                db.rollback()
+                if attempt:
+                    logger.warning(f"Bulk import chunk of {len(values)} students failed twice on concurrent inserts")
+                    errors.extend(
+                        {"row": row_number, "email": email,
+                         "errors": ["Not inserted: the chunk conflicted with concurrent inserts; retry this row"]}
+                        for row_number, email in pending
+                    )
+                    return 0, errors
+        
+        _count_cache.clear()
+        invalidate_dashboard_stats()
+        
+        logger.info(f"Bulk imported {len(values)} students")
+        return len(values), errors
     
     @staticmethod
     def update_student(db: Session, student_id: int, student_data: StudentUpdate) -> Student | None:
@@ -135,6 +344,8 @@ class StudentService:
         
         db.commit()
         db.refresh(student)
+        _count_cache.clear()  # Search totals depend on names and emails
+        invalidate_course_details(db, enrolled_course_ids(db, [student_id]))  # Rosters show the student
         
         logger.info(f"Updated student: {student.first_name} {student.last_name}")
         return student
@@ -142,7 +353,7 @@ class StudentService:
     @staticmethod
     def delete_student(db: Session, student_id: int) -> bool:
         """
-        Delete a student.
+        Delete a student with their attendance, summary and enrollment rows.
         
         Args:
             db: Database session
@@ -151,22 +362,71 @@ class StudentService:
         Returns:
             bool: True if deleted, False if not found
         """
-        student = StudentService.get_student_by_id(db, student_id)
+        deleted = PurgeService.delete_now(db, "student", [student_id])
+        if deleted:
+            _count_cache.clear()
+        return bool(deleted)
+    
+    @staticmethod
+    def purge_student(db: Session, student_id: int) -> PurgeJob | None:
+        """
+        Hide a student now and create a job that removes their rows in the background.
         
-        if not student:
-            return False
+        Args:
+            db: Database session
+            student_id: Student ID
+            
+        Returns:
+            PurgeJob: Pending purge job, or None if the student was not found
+        """
+        job = PurgeService.start_purge(db, "student", [student_id])
+        if job:
+            _count_cache.clear()
+        return job
+    
+    @staticmethod
+    def bulk_delete_students(db: Session, student_ids: list[int], mode: str = "sync") -> dict:
+        """
+        Delete many students at once, e.g. a graduated cohort.
         
-        db.delete(student)
-        db.commit()
+        In sync mode every row is deleted before returning, with one DELETE per
+        table. In async mode the students are hidden at once and a purge job is
+        returned; the caller runs it with PurgeService.run_purge_job.
         
-        logger.info(f"Deleted student with ID: {student_id}")
-        return True
+        Args:
+            db: Database session
+            student_ids: Student IDs
+            mode: sync or async
+            
+        Returns:
+            dict: Mode, deleted count, missing ids and the purge job (async mode)
+        """
+        if mode == "async":
+            job = PurgeService.start_purge(db, "student", student_ids)
+            deleted = json.loads(job.target_ids) if job else []
+        else:
+            job = None
+            deleted = PurgeService.delete_now(db, "student", student_ids)
+        if deleted:
+            _count_cache.clear()
+        
+        missing_ids = sorted(set(student_ids) - set(deleted))
+        return {
+            "mode": mode,
+            "deleted": len(deleted),
+            "missing": len(missing_ids),
+            "missing_ids": missing_ids,
+            "job": job,
+        }
     
     @staticmethod
     def enroll_student_in_course(db: Session, student_id: int, course_id: int) -> bool:
         """
         Enroll a student in a course.
         
+        Inserts the student_course row directly (a no-op if it exists), without
+        loading the student's course collection.
+        
         Args:
             db: Database session
             student_id: Student ID
@@ -175,20 +435,20 @@ class StudentService:
         Returns:
             bool: True if enrolled, False if already enrolled
         """
-        student = StudentService.get_student_by_id(db, student_id)
-        if not student:
-            raise ValueError(f"Student with ID {student_id} not found")
+        _check_student_and_course(db, student_id, course_id)
         
-        course = db.query(Course).filter(Course.id == course_id).first()
-        if not course:
-            raise ValueError(f"Course with ID {course_id} not found")
+        result = db.execute(insert_ignore(
+            db.get_bind().dialect.name,
+            student_course,
+            {"student_id": student_id, "course_id": course_id},
+            conflict_columns=["student_id", "course_id"],
+        ))
+        db.commit()
         
-        # Check if already enrolled
-        if course in student.courses:
+        if not result.rowcount:
             return False
-        
-        student.courses.append(course)
-        db.commit()
+        invalidate_dashboard_stats()
+        invalidate_course_details(db, [course_id])
         
         logger.info(f"Enrolled student {student_id} in course {course_id}")
         return True
@@ -198,6 +458,9 @@ class StudentService:
         """
         Unenroll a student from a course.
         
+        Deletes the student_course row directly, without loading the
+        student's course collection.
+        
         Args:
             db: Database session
             student_id: Student ID
@@ -206,20 +469,92 @@ class StudentService:
         Returns:
             bool: True if unenrolled, False if not enrolled
         """
-        student = StudentService.get_student_by_id(db, student_id)
-        if not student:
-            raise ValueError(f"Student with ID {student_id} not found")
+        _check_student_and_course(db, student_id, course_id)
         
-        course = db.query(Course).filter(Course.id == course_id).first()
-        if not course:
-            raise ValueError(f"Course with ID {course_id} not found")
+        result = db.execute(delete(student_course).where(
+            student_course.c.student_id == student_id,
+            student_course.c.course_id == course_id
+        ))
+        db.commit()
         
-        # Check if enrolled
-        if course not in student.courses:
+        if not result.rowcount:
             return False
-        
-        student.courses.remove(course)
-        db.commit()
+        invalidate_dashboard_stats()
+        invalidate_course_details(db, [course_id])
         
         logger.info(f"Unenrolled student {student_id} from course {course_id}")
         return True
+
+
+class AsyncStudentService:
+    """Async facade over StudentService for the API routers."""
+    
+    @staticmethod
+    async def create_student(db: Session | AsyncSession, student_data: StudentCreate) -> Student:
+        """Async variant of StudentService.create_student."""
+        return await run_db(db, StudentService.create_student, student_data)
+    
+    @staticmethod
+    async def get_student_by_id(db: Session | AsyncSession, student_id: int) -> Student | None:
+        """Async variant of StudentService.get_student_by_id."""
+        return await run_db(db, StudentService.get_student_by_id, student_id)
+    
+    @staticmethod
+    async def get_student_detail(db: Session | AsyncSession, student_id: int, fields: tuple[str, ...] | None = None) -> Student | None:
+        """Async variant of StudentService.get_student_detail."""
+        return await run_db(db, StudentService.get_student_detail, student_id, fields)
+    
+    @staticmethod
+    async def count_students(db: Session | AsyncSession, search_term: str | None = None, mode: str = "exact") -> tuple[int, str]:
+        """Async variant of StudentService.count_students."""
+        return await run_db(db, StudentService.count_students, search_term, mode)
+    
+    @staticmethod
+    async def get_students(db: Session | AsyncSession, skip: int = 0, limit: int = 10, sort: str = "id", total_mode: str | None = "exact", fields: tuple[str, ...] | None = None) -> tuple[list[Student], int | None, str | None]:
+        """Async variant of StudentService.get_students."""
+        return await run_db(db, StudentService.get_students, skip, limit, sort, total_mode, fields)
+    
+    @staticmethod
+    async def get_students_after(db: Session | AsyncSession, limit: int = 10, after: str | None = None, sort: str = "id", fields: tuple[str, ...] | None = None) -> tuple[list[Student], str | None]:
+        """Async variant of StudentService.get_students_after."""
+        return await run_db(db, StudentService.get_students_after, limit, after, sort, fields)
+    
+    @staticmethod
+    async def search_students(db: Session | AsyncSession, search_term: str, skip: int = 0, limit: int = 10, total_mode: str | None = "exact", fields: tuple[str, ...] | None = None) -> tuple[list[Student], int | None, str | None]:
+        """Async variant of StudentService.search_students."""
+        return await run_db(db, StudentService.search_students, search_term, skip, limit, total_mode, fields)
+    
+    @staticmethod
+    async def bulk_create_students(db: Session | AsyncSession, rows: list[tuple[int, StudentCreate]]) -> tuple[int, list[dict]]:
+        """Async variant of StudentService.bulk_create_students."""
+        return await run_db(db, StudentService.bulk_create_students, rows)
+    
+    @staticmethod
+    async def update_student(db: Session | AsyncSession, student_id: int, student_data: StudentUpdate) -> Student | None:
+        """Async variant of StudentService.update_student."""
+        return await run_db(db, StudentService.update_student, student_id, student_data)
+    
+    @staticmethod
+    async def delete_student(db: Session | AsyncSession, student_id: int) -> bool:
+        """Async variant of StudentService.delete_student."""
+        return await run_db(db, StudentService.delete_student, student_id)
+    
+    @staticmethod
+    async def purge_student(db: Session | AsyncSession, student_id: int) -> PurgeJob | None:
+        """Async variant of StudentService.purge_student."""
+        return await run_db(db, StudentService.purge_student, student_id)
+    
+    @staticmethod
+    async def bulk_delete_students(db: Session | AsyncSession, student_ids: list[int], mode: str = "sync") -> dict:
+        """Async variant of StudentService.bulk_delete_students."""
+        return await run_db(db, StudentService.bulk_delete_students, student_ids, mode)
+    
+    @staticmethod
+    async def enroll_student_in_course(db: Session | AsyncSession, student_id: int, course_id: int) -> bool:
+        """Async variant of StudentService.enroll_student_in_course."""
+        return await run_db(db, StudentService.enroll_student_in_course, student_id, course_id)
+    
+    @staticmethod
+    async def unenroll_student_from_course(db: Session | AsyncSession, student_id: int, course_id: int) -> bool:
+        """Async variant of StudentService.unenroll_student_from_course."""
+        return await run_db(db, StudentService.unenroll_student_from_course, student_id, course_id)
@@ -16,16 +16,43 @@ function logout() {
     // Clean any leftover JWT token (legacy)
     localStorage.removeItem('token');
     localStorage.removeItem('token_type');
+    clearResponseCache();
 
     // Redirect to server logout which clears the session cookie
     window.location.href = '/logout';
 }
 
+// sessionStorage key prefix of GET responses kept with their ETag
+const RESPONSE_CACHE_PREFIX = 'response-cache:';
+
+/**
+ * Get the cached copy of a GET response ({etag, contentType, body}) or null.
+ */
+function readCachedResponse(url) {
+    try {
+        return JSON.parse(sessionStorage.getItem(RESPONSE_CACHE_PREFIX + url));
+    } catch (error) {
+        return null;
+    }
+}
+
+/**
+ * Drop every cached GET response (e.g. on logout).
+ */
+function clearResponseCache() {
+    Object.keys(sessionStorage)
+        .filter(key => key.startsWith(RESPONSE_CACHE_PREFIX))
+        .forEach(key => sessionStorage.removeItem(key));
+}
+
 /**
  * Use fetch that includes cookies (session cookie) automatically.
  * opts is similar to fetch options (method, headers, body...).
+ *
+ * GET responses carrying an ETag are kept in sessionStorage and revalidated
+ * with If-None-Match; on 304 the cached copy is returned as a 200 response.
  */
-function fetchWithSession(url, opts = {}) {
+async function fetchWithSession(url, opts = {}) {
     const defaultOpts = {
         credentials: 'include', // ensure cookies are sent
         headers: {
@@ -36,7 +63,37 @@ function fetchWithSession(url, opts = {}) {
     // Merge headers if provided
     opts.headers = Object.assign({}, defaultOpts.headers, opts.headers || {});
     const finalOpts = Object.assign({}, defaultOpts, opts);
-    return fetch(url, finalOpts);
+    if ((finalOpts.method || 'GET').toUpperCase() !== 'GET') {
+        return fetch(url, finalOpts);
+    }
+
+    const cached = readCachedResponse(url);
+    if (cached) {
+        finalOpts.headers['If-None-Match'] = cached.etag;
+    }
+
+    const response = await fetch(url, finalOpts);
+    if (response.status === 304 && cached) {
+        return new Response(cached.body, {
+            status: 200,
+            headers: { 'Content-Type': cached.contentType, 'ETag': cached.etag }
+        });
+    }
+
+    const etag = response.headers.get('ETag');
+    if (response.ok && etag) {
+        const body = await response.clone().text();
+        try {
+            sessionStorage.setItem(RESPONSE_CACHE_PREFIX + url, JSON.stringify({
+                etag: etag,
+                contentType: response.headers.get('Content-Type'),
+                body: body
+            }));
+        } catch (error) {
+            // Storage full: serve uncached
+        }
+    }
+    return response;
 }
 
 // ============================
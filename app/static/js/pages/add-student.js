@@ -0,0 +1,38 @@
+document.getElementById('addStudentForm').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const formData = {
+        first_name: document.getElementById('first_name').value,
+        last_name: document.getElementById('last_name').value,
+        email: document.getElementById('email').value,
+        phone: document.getElementById('phone').value || null,
+        enrollment_date: document.getElementById('enrollment_date').value || null,
+        address: document.getElementById('address').value || null,
+        notes: document.getElementById('notes').value || null
+    };
+
+    try {
+        const response = await fetch('/api/students', {
+            method: 'POST',
+            credentials: 'include',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(formData)
+        });
+
+        if (response.ok) {
+            showAlert('Student added successfully!', 'success');
+            setTimeout(() => window.location.href = '/students', 1500);
+        } else {
+            const error = await response.json();
+            showAlert('Error: ' + error.detail, 'danger');
+        }
+    } catch (error) {
+        console.error('Error adding student:', error);
+        showAlert('An error occurred', 'danger');
+    }
+});
+
+// Set today's date as default enrollment date
+document.getElementById('enrollment_date').valueAsDate = new Date();
@@ -0,0 +1,51 @@
+async function loadAttendance() {
+    try {
+        const response = await fetch('/api/attendance/student/1', {
+            credentials: 'include',
+            headers: {
+                'Content-Type': 'application/json'
+            }
+        });
+
+        if (response.ok) {
+            const data = await response.json();
+            displayAttendance(data);
+        } else if (response.status === 401) {
+            window.location.href = '/login';
+        }
+    } catch (error) {
+        console.error('Error loading attendance:', error);
+        showAlert('Failed to load attendance records', 'danger');
+    }
+}
+
+function displayAttendance(records) {
+    const tbody = document.getElementById('attendanceBody');
+
+    if (!records || records.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="6" class="text-center">No attendance records found</td></tr>';
+        return;
+    }
+
+    tbody.innerHTML = records.map(record => `
+        <tr>
+            <td>${record.id}</td>
+            <td>${record.student_id}</td>
+            <td>${record.course_id}</td>
+            <td>${new Date(record.date).toLocaleDateString()}</td>
+            <td><span class="badge badge-success">Present</span></td>
+            <td class="action-buttons">
+                <button class="btn btn-small btn-info">Edit</button>
+                <button class="btn btn-small btn-danger">Delete</button>
+            </td>
+        </tr>
+    `).join('');
+}
+
+function filterAttendance() {
+    // Load filtered attendance
+    loadAttendance();
+}
+
+// Load attendance on page load
+loadAttendance();
@@ -0,0 +1,76 @@
+let currentPage = 1;
+let itemsPerPage = 10;
+
+async function loadCourses(page = 1) {
+    const skip = (page - 1) * itemsPerPage;
+
+    try {
+        const response = await fetchWithSession(`/api/courses?skip=${skip}&limit=${itemsPerPage}`);
+
+        if (response.ok) {
+            const data = await response.json();
+            displayCourses(data);
+            currentPage = page;
+        } else if (response.status === 401) {
+            window.location.href = '/login';
+        }
+    } catch (error) {
+        console.error('Error loading courses:', error);
+        showAlert('Failed to load courses', 'danger');
+    }
+}
+
+function displayCourses(courses) {
+    const tbody = document.getElementById('coursesBody');
+
+    if (!courses || courses.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="7" class="text-center">No courses found</td></tr>';
+        return;
+    }
+
+    tbody.innerHTML = courses.map(course => `
+        <tr>
+            <td>${course.id}</td>
+            <td>${course.name}</td>
+            <td>${course.code}</td>
+            <td>${course.instructor_name || 'N/A'}</td>
+            <td>${course.credits || 0}</td>
+            <td>${course.students?.length || 0}</td>
+            <td class="action-buttons">
+                <button onclick="editCourse(${course.id})" class="btn btn-small btn-info">Edit</button>
+                <button onclick="deleteCourse(${course.id})" class="btn btn-small btn-danger">Delete</button>
+            </td>
+        </tr>
+    `).join('');
+}
+
+async function deleteCourse(courseId) {
+    if (!confirm('Are you sure you want to delete this course?')) return;
+
+    try {
+        const response = await fetch(`/api/courses/${courseId}`, {
+            method: 'DELETE',
+            credentials: 'include',
+            headers: {
+                'Content-Type': 'application/json'
+            }
+        });
+
+        if (response.ok) {
+            showAlert('Course deleted successfully', 'success');
+            loadCourses(currentPage);
+        } else {
+            showAlert('Failed to delete course', 'danger');
+        }
+    } catch (error) {
+        console.error('Error deleting course:', error);
+        showAlert('An error occurred', 'danger');
+    }
+}
+
+function editCourse(courseId) {
+    showAlert('Edit course feature coming soon!', 'info');
+}
+
+// Load courses on page load
+loadCourses(1);
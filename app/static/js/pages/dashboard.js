@@ -0,0 +1,26 @@
+// Refresh the numbers in place without re-rendering the page
+const STATS_REFRESH_MS = 60000;
+
+function formatRate(rate) {
+    return rate === null ? '--' : `${rate.toFixed(1)}%`;
+}
+
+async function refreshStats() {
+    try {
+        const response = await fetchWithSession('/api/stats');
+        if (!response.ok) {
+            return;
+        }
+        const stats = await response.json();
+        for (const key of ['students_count', 'courses_count', 'enrollments_count', 'at_risk_students']) {
+            document.getElementById(`stat-${key}`).textContent = stats[key];
+        }
+        for (const key of ['today_attendance_rate', 'average_attendance_rate']) {
+            document.getElementById(`stat-${key}`).textContent = formatRate(stats[key]);
+        }
+    } catch (error) {
+        console.error('Error refreshing stats:', error);
+    }
+}
+
+setInterval(refreshStats, STATS_REFRESH_MS);
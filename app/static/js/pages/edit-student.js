@@ -0,0 +1,64 @@
+const studentId = window.location.pathname.split('/').pop();
+
+// Load student data
+async function loadStudent() {
+    try {
+        const response = await fetchWithSession(`/api/students/${studentId}`);
+
+        if (response.ok) {
+            const student = await response.json();
+            document.getElementById('first_name').value = student.first_name;
+            document.getElementById('last_name').value = student.last_name;
+            document.getElementById('email').value = student.email;
+            document.getElementById('phone').value = student.phone || '';
+            document.getElementById('enrollment_date').value = student.enrollment_date || '';
+            document.getElementById('address').value = student.address || '';
+            document.getElementById('notes').value = student.notes || '';
+        } else {
+            showAlert('Failed to load student data', 'danger');
+        }
+    } catch (error) {
+        console.error('Error loading student:', error);
+        showAlert('An error occurred', 'danger');
+    }
+}
+
+// Submit form
+document.getElementById('editStudentForm').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const formData = {
+        first_name: document.getElementById('first_name').value,
+        last_name: document.getElementById('last_name').value,
+        email: document.getElementById('email').value,
+        phone: document.getElementById('phone').value || null,
+        enrollment_date: document.getElementById('enrollment_date').value || null,
+        address: document.getElementById('address').value || null,
+        notes: document.getElementById('notes').value || null
+    };
+
+    try {
+        const response = await fetch(`/api/students/${studentId}`, {
+            method: 'PUT',
+            credentials: 'include',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(formData)
+        });
+
+        if (response.ok) {
+            showAlert('Student updated successfully!', 'success');
+            setTimeout(() => window.location.href = '/students', 1500);
+        } else {
+            const error = await response.json();
+            showAlert('Error: ' + error.detail, 'danger');
+        }
+    } catch (error) {
+        console.error('Error updating student:', error);
+        showAlert('An error occurred', 'danger');
+    }
+});
+
+// Load student on page load
+loadStudent();
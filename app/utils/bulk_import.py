@@ -0,0 +1,207 @@
+"""
+Incremental parsing of streamed CSV / NDJSON uploads.
+Records are yielded as they arrive, so memory does not grow with the upload size.
+"""
+import codecs
+import csv
+import heapq
+import itertools
+import json
+from typing import AsyncIterator
+
+
+# Supported upload formats and the content types that select them
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+FORMATS = ("csv", "ndjson")
+
+# Longest record kept in memory while parsing (a CSV record may span lines);
+# longer ones are reported as a row error and skipped
+MAX_RECORD_CHARS = 64 * 1024
+
+
+def detect_format(content_type: str | None, fmt: str | None = None) -> str:
+    """
+    Decide the upload format from an explicit choice or the Content-Type header.
+
+    Args:
+        content_type: Request Content-Type header
+        fmt: Explicitly requested format, if any
+
+    Returns:
+        str: "csv" or "ndjson"
+
+    Raises:
+        ValueError: If the format is unknown or cannot be determined
+    """
+    if fmt:
+        if fmt not in FORMATS:
+            raise ValueError(f"Invalid format '{fmt}'; expected one of: {', '.join(FORMATS)}")
+        return fmt
+
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in CONTENT_TYPES:
+        return CONTENT_TYPES[media_type]
+
+    raise ValueError("Cannot determine upload format; send Content-Type text/csv or application/x-ndjson, or pass format=")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_length: int = MAX_RECORD_CHARS) -> AsyncIterator[str | None]:
+    """
+    Split a stream of UTF-8 byte chunks into lines (newline included).
+
+    Only the current line is buffered, and at most max_length characters of
+    it: a longer line is dropped up to its newline and yielded as None.
+
+    Args:
+        chunks: Async iterator of raw body chunks
+        max_length: Longest line kept, in characters
+
+    Yields:
+        str | None: One line at a time, or None for a line that was too long
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    parts, length, overlong = [], 0, False
+
+    async for chunk in chunks:
+        *lines, rest = decoder.decode(chunk).split("\n")
+        for line in lines:
+            if overlong or length + len(line) > max_length:
+                yield None
+            else:
+                yield "".join(parts) + line + "\n"
+            parts, length, overlong = [], 0, False
+        if not overlong:
+            parts.append(rest)
+            length += len(rest)
+            if length > max_length:
+                parts, length, overlong = [], 0, True
+
+    rest = decoder.decode(b"", final=True)
+    if overlong or length + len(rest) > max_length:
+        yield None
+    elif length or rest:
+        yield "".join(parts) + rest
+
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """
+    Parse a streamed upload into records.
+
+    CSV uploads need a header row; quoted fields may span lines.
+    NDJSON uploads hold one JSON object per line. Blank lines are skipped.
+    A record longer than MAX_RECORD_CHARS (e.g. after an unbalanced quote)
+    is reported as a row error, and parsing resumes at the next line.
+
+    Args:
+        chunks: Async iterator of raw body chunks
+        fmt: "csv" or "ndjson"
+
+    Yields:
+        tuple: (row number, record dict or None, parse error or None)
+    """
+    row_number = 0
+    too_long = f"Record exceeds {MAX_RECORD_CHARS} characters"
+
+    if fmt == "ndjson":
+        async for line in iter_lines(chunks):
+            if line is not None and not line.strip():
+                continue
+            row_number += 1
+            if line is None:
+                yield row_number, None, too_long
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield row_number, None, "Each line must be a JSON object"
+                continue
+            yield row_number, record, None
+        return
+
+    header = None
+    buffered, length, in_quotes = [], 0, False
+    async for line in iter_lines(chunks):
+        if line is None or length + len(line) > MAX_RECORD_CHARS:
+            # Too long to keep: drop it and start the next record on the next line
+            buffered, length, in_quotes = [], 0, False
+            if header is None:
+                yield row_number + 1, None, f"Header row exceeds {MAX_RECORD_CHARS} characters"
+                return
+            row_number += 1
+            yield row_number, None, too_long
+            continue
+
+        buffered.append(line)
+        length += len(line)
+        # An odd number of quotes means a quoted field continues on the next line
+        in_quotes ^= line.count('"') % 2 == 1
+        if in_quotes:
+            continue
+        lines, buffered, length = buffered, [], 0
+        if not any(text.strip() for text in lines):
+            continue
+
+        fields = next(csv.reader(lines))
+        if header is None:
+            header = [name.strip() for name in fields]
+            continue
+
+        row_number += 1
+        if len(fields) != len(header):
+            yield row_number, None, f"Expected {len(header)} fields, got {len(fields)}"
+            continue
+        # Empty cells mean "not given" so optional fields stay None
+        yield row_number, {name: value for name, value in zip(header, fields) if value != ""}, None
+
+    if buffered:
+        yield row_number + 1, None, "Unterminated quoted field"
+
+
+class ErrorReport:
+    """
+    Per-row errors of an upload, bounded: keeps the errors of the first
+    limit rows (by row number) and counts the rest.
+
+    Chunks report their errors after later rows were already parsed, so the
+    kept errors are the limit lowest row numbers seen, not the first added.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.total = 0
+        self._heap = []  # (-row, tie-breaker, error): the highest kept row is popped first
+        self._order = itertools.count()
+
+    def add(self, error: dict) -> None:
+        """Record one row's error (a dict with its "row" number)."""
+        self.total += 1
+        if self.limit <= 0:
+            return
+        entry = (-error["row"], next(self._order), error)
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heappushpop(self._heap, entry)
+
+    def extend(self, errors: list[dict]) -> None:
+        """Record several rows' errors."""
+        for error in errors:
+            self.add(error)
+
+    @property
+    def truncated(self) -> bool:
+        """Whether errors were counted but not kept."""
+        return self.total > len(self._heap)
+
+    def errors(self) -> list[dict]:
+        """Get the kept errors ordered by row."""
+        return [error for _, _, error in sorted(self._heap, key=lambda entry: (-entry[0], entry[1]))]
@@ -1,11 +1,95 @@
 """
 Password hashing utilities for secure password storage.
+
+Argon2 is deliberately slow and CPU-heavy, so hashing and verification run
+on a small dedicated process pool instead of the request threads. At most
+PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE operations are accepted at
+a time; beyond that HashingBusyError is raised so a login burst is turned
+away quickly instead of starving the rest of the application.
 """
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from passlib.context import CryptContext
+from app.core.config import settings
+
+
+# Create context for Argon2 hashing (no character limit). Hashes made with
+# other parameters still verify, and are flagged for rehashing.
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.argon2_time_cost,
+    argon2__memory_cost=settings.argon2_memory_cost,
+    argon2__parallelism=settings.argon2_parallelism,
+)
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when the password hashing queue is full."""
+
 
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+# Operations running or waiting on the pool
+_slots = threading.BoundedSemaphore(max(settings.password_hash_workers, 1) + settings.password_hash_queue_size)
 
-# Create context for Argon2 hashing (no character limit)
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Start the worker processes on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs server threads is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.password_hash_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _run(function, *args):
+    """
+    Run a hashing function on the process pool and wait for its result.
+    
+    Runs it in the calling thread when PASSWORD_HASH_WORKERS is 0.
+    
+    Raises:
+        HashingBusyError: If the pool's queue is full
+    """
+    if settings.password_hash_workers <= 0:
+        return function(*args)
+    
+    if not _slots.acquire(blocking=False):
+        raise HashingBusyError("Too many password operations in progress")
+    try:
+        future = _get_pool().submit(function, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future.result()
+
+
+def shutdown_hashing_pool() -> None:
+    """Stop the worker processes (on application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
 
 
 def hash_password(password: str) -> str:
@@ -14,11 +98,14 @@ def hash_password(password: str) -> str:
     
     Args:
         password: Plain-text password
-        
+    
     Returns:
         str: Hashed password
+    
+    Raises:
+        HashingBusyError: If the hashing queue is full
     """
-    return pwd_context.hash(password)
+    return _run(_hash, password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -28,8 +115,28 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Args:
         plain_password: Plain-text password
         hashed_password: Hashed password to verify against
-        
+    
     Returns:
         bool: True if password matches, False otherwise
+    
+    Raises:
+        HashingBusyError: If the hashing queue is full
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _run(_verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify a password and rehash it if it was hashed with outdated Argon2 parameters.
+    
+    Args:
+        plain_password: Plain-text password
+        hashed_password: Hashed password to verify against
+    
+    Returns:
+        tuple: (True if password matches, new hash to store or None)
+    
+    Raises:
+        HashingBusyError: If the hashing queue is full
+    """
+    return _run(_verify_and_update, plain_password, hashed_password)
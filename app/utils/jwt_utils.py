@@ -1,11 +1,18 @@
 """
 JWT token utilities for authentication.
 """
+import hashlib
+import time
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 
+# Payloads of tokens whose signature was already verified, by SHA-256 of the token
+_token_cache = TTLCache(maxsize=settings.token_cache_size, ttl=settings.token_cache_ttl_seconds)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """
     Create a JWT access token.
@@ -54,3 +61,38 @@ def decode_token(token: str) -> dict:
         algorithms=[settings.algorithm]
     )
     return payload
+
+
+def decode_token_cached(token: str) -> dict:
+    """
+    Decode and validate a JWT token, reusing the result for a token seen before.
+    
+    Only valid tokens are cached, keyed by a digest of the whole token (so a
+    hit means the exact same signed bytes), and never past their exp claim.
+    
+    Args:
+        token: JWT token to decode
+        
+    Returns:
+        dict: Token payload (shared between requests; do not modify)
+        
+    Raises:
+        JWTError: If token is invalid or expired
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _token_cache.get(key)
+    if payload is not None:
+        return payload
+    
+    payload = decode_token(token)
+    ttl = _token_cache.ttl
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        _token_cache.set(key, payload, ttl=ttl)
+    return payload
+
+
+def token_cache_stats() -> dict:
+    """Get the verified-token cache's size and hit/miss counters."""
+    return _token_cache.stats()
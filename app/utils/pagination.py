@@ -0,0 +1,160 @@
+"""
+Keyset (cursor) pagination utilities.
+Cursors are opaque to clients: base64url-encoded JSON holding the sort key and
+the sort values of the last row on the page.
+"""
+import base64
+import binascii
+import json
+from sqlalchemy import and_, func, or_, text
+
+
+def encode_cursor(sort: str, values: list) -> str:
+    """
+    Encode a pagination cursor.
+
+    Args:
+        sort: Sort key the cursor belongs to
+        values: Sort column values of the last returned row
+
+    Returns:
+        str: Opaque cursor string
+    """
+    raw = json.dumps({"s": sort, "v": values}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> list:
+    """
+    Decode a pagination cursor.
+
+    Args:
+        cursor: Cursor string from a previous response
+        sort: Sort key of the current request
+
+    Returns:
+        list: Sort column values to continue after
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort key
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor_sort, values = data["s"], data["v"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+
+    if not isinstance(values, list):
+        raise ValueError("Invalid pagination cursor")
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was issued for sort '{cursor_sort}', not '{sort}'")
+
+    return values
+
+
+def check_cursor_values(values: list, sort_columns: list) -> None:
+    """
+    Check that cursor values can be compared with the sort columns.
+
+    Cursors come from clients, so their values are bound into SQL only when
+    there is one non-null value per column, of the column's Python type.
+
+    Args:
+        values: Decoded cursor values
+        sort_columns: Columns the values belong to
+
+    Raises:
+        ValueError: If the values do not match the columns
+    """
+    if len(values) != len(sort_columns):
+        raise ValueError("Invalid pagination cursor")
+    for column, value in zip(sort_columns, values):
+        expected = column.type.python_type
+        # bool is an int subclass, but never a valid value of an int column
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise ValueError("Invalid pagination cursor")
+
+
+def keyset_paginate(query, sort_columns: list, sort: str, limit: int, after: str | None = None) -> tuple[list, str | None]:
+    """
+    Fetch one page of a query ordered by sort_columns, continuing after a cursor.
+
+    The last sort column must be unique (normally the primary key) so the order is total.
+
+    Args:
+        query: ORM query to paginate
+        sort_columns: Columns to order by, ending with a unique column
+        sort: Sort key name stored in the cursor
+        limit: Maximum number of rows to return
+        after: Cursor from the previous page, or None for the first page
+
+    Returns:
+        tuple: (rows, next cursor or None on the last page)
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    if after:
+        values = decode_cursor(after, sort)
+        check_cursor_values(values, sort_columns)
+
+        # (c1, c2, ...) > (v1, v2, ...) expanded; the leading c1 >= v1 gives
+        # every database an index range seek instead of a scan from the start
+        query = query.filter(
+            sort_columns[0] >= values[0],
+            or_(*(
+                and_(*(column == value for column, value in zip(sort_columns[:i], values[:i])),
+                     sort_columns[i] > values[i])
+                for i in range(len(sort_columns))
+            ))
+        )
+
+    rows = query.order_by(*sort_columns).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, [getattr(last, column.key) for column in sort_columns])
+
+    return rows, next_cursor
+
+
+def estimate_row_count(db, model) -> int:
+    """
+    Estimate a table's row count from database statistics without scanning it.
+
+    MySQL and PostgreSQL report their planner statistics; other databases
+    (and tables without statistics yet) fall back to MAX(id), which is served
+    by the primary key index.
+
+    Args:
+        db: Database session
+        model: ORM model whose table to estimate
+
+    Returns:
+        int: Estimated number of rows
+    """
+    table_name = model.__tablename__
+    dialect_name = db.get_bind().dialect.name
+    estimate = None
+
+    if dialect_name in ("mysql", "mariadb"):
+        estimate = db.execute(
+            text("SELECT TABLE_ROWS FROM information_schema.TABLES "
+                 "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"),
+            {"table_name": table_name},
+        ).scalar()
+    elif dialect_name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table_name"),
+            {"table_name": table_name},
+        ).scalar()
+        if estimate is not None and estimate < 0:
+            estimate = None  # Never analyzed
+
+    if estimate is None:
+        estimate = db.query(func.max(model.id)).scalar()
+
+    return int(estimate or 0)
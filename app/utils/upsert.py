@@ -0,0 +1,93 @@
+"""
+Dialect-specific INSERT ... ON CONFLICT / ON DUPLICATE KEY / INSERT IGNORE helpers.
+"""
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+
+def _insert_for(dialect_name: str):
+    """
+    Get the dialect's insert() construct that supports conflict handling.
+
+    Args:
+        dialect_name: SQLAlchemy dialect name (mysql, sqlite, postgresql)
+
+    Returns:
+        Dialect-specific insert function
+
+    Raises:
+        NotImplementedError: If the dialect has no upsert support here
+    """
+    inserts = {
+        "mysql": mysql.insert,
+        "mariadb": mysql.insert,
+        "sqlite": sqlite.insert,
+        "postgresql": postgresql.insert,
+    }
+    if dialect_name not in inserts:
+        raise NotImplementedError(f"Upsert is not supported for dialect '{dialect_name}'")
+    return inserts[dialect_name]
+
+
+def upsert(
+    dialect_name: str, table, values, conflict_columns: list[str], update_values: dict, columns: list[str] | None = None
+):
+    """
+    Build an INSERT that updates the existing row when a unique key conflicts.
+
+    Args:
+        dialect_name: SQLAlchemy dialect name
+        table: Table or ORM model to insert into
+        values: Row dict or list of row dicts, or a SELECT of the columns
+            (INSERT ... SELECT; give it a WHERE clause, which SQLite needs
+            to parse the conflict clause)
+        conflict_columns: Columns of the unique key (ignored by MySQL, which uses any unique key)
+        update_values: Column -> value on conflict; a callable receives the "inserted row"
+            proxy (excluded/inserted) and returns the value
+        columns: Columns the SELECT in values produces, in order
+
+    Returns:
+        Insert statement
+    """
+    stmt = _insert_for(dialect_name)(table)
+    stmt = stmt.from_select(columns, values) if columns is not None else stmt.values(values)
+
+    if dialect_name in ("mysql", "mariadb"):
+        incoming = stmt.inserted
+        return stmt.on_duplicate_key_update({
+            column: value(incoming) if callable(value) else value
+            for column, value in update_values.items()
+        })
+
+    incoming = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=conflict_columns,
+        set_={
+            column: value(incoming) if callable(value) else value
+            for column, value in update_values.items()
+        },
+    )
+
+
+def insert_ignore(dialect_name: str, table, values, conflict_columns: list[str]):
+    """
+    Build an INSERT that skips rows whose unique key already exists.
+
+    The result's rowcount is the number of rows actually inserted.
+    Check foreign keys first: MySQL's INSERT IGNORE also skips rows
+    that violate them (and turns the error into a warning).
+
+    Args:
+        dialect_name: SQLAlchemy dialect name
+        table: Table or ORM model to insert into
+        values: Row dict or list of row dicts
+        conflict_columns: Columns of the unique key (ignored by MySQL, which uses any unique key)
+
+    Returns:
+        Insert statement
+    """
+    stmt = _insert_for(dialect_name)(table).values(values)
+
+    if dialect_name in ("mysql", "mariadb"):
+        return stmt.prefix_with("IGNORE")
+
+    return stmt.on_conflict_do_nothing(index_elements=conflict_columns)
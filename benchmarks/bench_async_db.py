@@ -0,0 +1,61 @@
+"""
+Benchmark: sync (threadpool) vs async (AsyncSession) database path for the API routers.
+
+Fires concurrent GET /api/students and GET /api/students/{id} requests at the
+application in-process and reports throughput and latency for each mode.
+
+Usage:
+    python benchmarks/bench_async_db.py [requests] [concurrency]
+"""
+import asyncio
+import sys
+import time
+from common import configure, login, run_modes, summarize
+
+
+MODES = ["sync", "async"]
+
+
+async def run(mode: str, total: int, concurrency: int) -> None:
+    import httpx
+    from app.main import app
+    from app.core.database import SessionLocal
+    from app.models.student import Student
+
+    with SessionLocal() as db:
+        db.add_all(
+            Student(first_name=f"First{i}", last_name=f"Last{i}", email=f"student{i}@example.com")
+            for i in range(1000)
+        )
+        db.commit()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = await login(client)
+        latencies = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(i: int) -> None:
+            url = f"/api/students/{i % 1000 + 1}" if i % 2 else "/api/students/?limit=50"
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    print(f"{mode:>5}: {total / elapsed:8.1f} req/s  {summarize(latencies)}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in MODES:
+        mode = sys.argv[1]
+        total = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+        concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+        configure(f"bench_async_{mode}.db", db_async=str(mode == "async").lower())
+        asyncio.run(run(mode, total, concurrency))
+    else:
+        run_modes(__file__, MODES)
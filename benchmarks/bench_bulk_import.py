@@ -0,0 +1,74 @@
+"""
+Benchmark: streaming bulk student import throughput.
+
+Streams a generated CSV or NDJSON body to POST /api/students/bulk in small
+chunks (as a slow upload would arrive) and reports rows per second and the
+process's peak memory, which should stay flat as the row count grows.
+
+Usage:
+    python benchmarks/bench_bulk_import.py [rows] [chunk_size]
+"""
+import asyncio
+import json
+import resource
+import sys
+import time
+from common import configure, login, run_modes
+
+
+MODES = ["csv", "ndjson"]
+CONTENT_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def body(fmt: str, rows: int, lines_per_chunk: int = 500):
+    """Yield the upload body a few hundred lines at a time, never holding it whole."""
+    if fmt == "csv":
+        yield b"first_name,last_name,email,phone,address\n"
+    for start in range(0, rows, lines_per_chunk):
+        lines = []
+        for i in range(start, min(start + lines_per_chunk, rows)):
+            if fmt == "csv":
+                lines.append(f"First{i},Last{i},student{i}@example.com,555-{i % 10000:04d},\"{i} Main St\"\n")
+            else:
+                lines.append(json.dumps({
+                    "first_name": f"First{i}", "last_name": f"Last{i}", "email": f"student{i}@example.com",
+                    "phone": f"555-{i % 10000:04d}", "address": f"{i} Main St",
+                }) + "\n")
+        yield "".join(lines).encode()
+
+
+async def run(fmt: str, rows: int, chunk_size: int) -> None:
+    import httpx
+    from app.main import app
+
+    async def stream():
+        for chunk in body(fmt, rows):
+            yield chunk
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        headers = await login(client)
+        started = time.perf_counter()
+        response = await client.post(
+            f"/api/students/bulk?chunk_size={chunk_size}",
+            content=stream(),
+            headers={**headers, "Content-Type": CONTENT_TYPES[fmt]},
+        )
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+        report = response.json()
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{fmt:>6}: {report['inserted']} rows in {elapsed:.2f}s = {report['inserted'] / elapsed:9.0f} rows/s  "
+          f"(failed {report['failed']}, chunk {chunk_size}, peak RSS {peak_mb:.0f} MB)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in MODES:
+        fmt = sys.argv[1]
+        rows = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+        chunk_size = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+        configure(f"bench_bulk_{fmt}.db")
+        asyncio.run(run(fmt, rows, chunk_size))
+    else:
+        run_modes(__file__, MODES)
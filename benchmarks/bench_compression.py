@@ -0,0 +1,102 @@
+"""
+Benchmark: response compression on representative list endpoints.
+
+Seeds students, a course with a large roster and a day of attendance, then
+compresses each response body with gzip and (when the brotli package is
+installed) br at a few levels, reporting the compressed size and the
+compression CPU time per response, so COMPRESSION_GZIP_LEVEL and
+COMPRESSION_BROTLI_QUALITY can be tuned. The compression cost is timed on
+the encoder alone: next to the handler's own CPU time it drowns in noise.
+
+Payloads:
+  - GET /api/students/?limit=100
+  - GET /api/courses/{id} (course detail with its 500-student roster)
+  - GET /api/attendance/date/{day} (one day of attendance, 500 rows)
+
+Usage:
+    python benchmarks/bench_compression.py [iterations]
+"""
+import asyncio
+import sys
+import time
+from common import configure, login
+
+
+GZIP_LEVELS = [1, 6, 9]
+BROTLI_QUALITIES = [4, 11]
+STUDENTS = 500
+DAY = "2024-03-01"
+
+
+async def seed(client, headers: dict) -> int:
+    csv_body = "first_name,last_name,email,phone\n" + "".join(
+        f"First{i},Last{i},student{i}@example.com,555-{i:04d}\n" for i in range(STUDENTS)
+    )
+    await client.post("/api/students/bulk", content=csv_body, headers={**headers, "Content-Type": "text/csv"})
+    course = await client.post(
+        "/api/courses/", json={"name": "Benchmark Course", "code": "BENCH101", "credits": 3}, headers=headers
+    )
+    course_id = course.json()["id"]
+    student_ids = list(range(1, STUDENTS + 1))
+    await client.post(
+        f"/api/courses/{course_id}/enrollments/bulk", json={"student_ids": student_ids}, headers=headers
+    )
+    await client.post(
+        "/api/attendance/bulk",
+        json={
+            "course_id": course_id,
+            "attendance_date": f"{DAY}T09:00:00",
+            "entries": [{"student_id": i, "is_present": i % 5 != 0} for i in student_ids],
+        },
+        headers=headers,
+    )
+    return course_id
+
+
+def cpu_ms(function, iterations: int) -> float:
+    started = time.process_time()
+    for _ in range(iterations):
+        function()
+    return (time.process_time() - started) / iterations * 1000
+
+
+async def run(iterations: int) -> None:
+    import httpx
+    from app.core.compression import _BrotliEncoder, _GzipEncoder, brotli
+    from app.main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        headers = await login(client)
+        course_id = await seed(client, headers)
+        payloads = {
+            "students?limit=100": "/api/students/?limit=100",
+            "course detail": f"/api/courses/{course_id}",
+            "attendance by date": f"/api/attendance/date/{DAY}",
+        }
+
+        for label, url in payloads.items():
+            body = (await client.get(url, headers={**headers, "Accept-Encoding": "identity"})).content
+            started = time.process_time()
+            for _ in range(iterations):
+                await client.get(url, headers={**headers, "Accept-Encoding": "identity"})
+            handler_ms = (time.process_time() - started) / iterations * 1000
+            print(f"{label}: {len(body)} B uncompressed, {handler_ms:.2f} ms CPU per request uncompressed")
+
+            for level in GZIP_LEVELS:
+                size = len(_GzipEncoder(level).finish(body))
+                cost = cpu_ms(lambda: _GzipEncoder(level).finish(body), iterations)
+                print(f"  gzip level {level}:  {size:7d} B ({len(body) / size:4.1f}x)  +{cost:.3f} ms CPU")
+            for quality in BROTLI_QUALITIES if brotli else []:
+                size = len(_BrotliEncoder(quality).finish(body))
+                cost = cpu_ms(lambda: _BrotliEncoder(quality).finish(body), iterations)
+                print(f"  br quality {quality}: {size:7d} B ({len(body) / size:4.1f}x)  +{cost:.3f} ms CPU")
+
+            response = await client.get(url, headers={**headers, "Accept-Encoding": "br, gzip"})
+            print(f"  served with defaults: {response.headers.get('content-encoding')} "
+                  f"{response.headers['content-length']} B on the wire")
+
+
+
+if __name__ == "__main__":
+    configure("bench_compression.db", password_hash_workers=0)
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,73 @@
+"""
+Benchmark: course endpoints with and without the course response cache.
+
+Seeds 50 courses with a 200-student roster each, then fires concurrent
+GET /api/courses (the UI's dropdown call) and GET /api/courses/{id}
+requests, reporting throughput and latency with COURSE_CACHE_BACKEND off
+and lru. The redis backend adds one round trip to the lru numbers.
+
+Usage:
+    python benchmarks/bench_course_cache.py [requests] [concurrency]
+"""
+import asyncio
+import sys
+import time
+from common import configure, login, run_modes, summarize
+
+
+MODES = ["off", "lru"]
+COURSES = 50
+ROSTER = 200
+
+
+async def run(mode: str, total: int, concurrency: int) -> None:
+    import httpx
+    from app.main import app
+    from app.core.database import engine
+    from app.services.course_cache import course_cache_stats
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO students (first_name, last_name, email) VALUES (?, ?, ?)",
+            [(f"First{i}", f"Last{i}", f"student{i}@example.com") for i in range(ROSTER)],
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO courses (name, code, credits) VALUES (?, ?, 3)",
+            [(f"Course {i}", f"C{i}") for i in range(COURSES)],
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO student_course (student_id, course_id) VALUES (?, ?)",
+            [(student, course) for course in range(1, COURSES + 1) for student in range(1, ROSTER + 1)],
+        )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = await login(client)
+        latencies = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(i: int) -> None:
+            url = f"/api/courses/{i % COURSES + 1}" if i % 2 else "/api/courses/?limit=100"
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    stats = course_cache_stats()
+    print(f"{mode:>4}: {total / elapsed:8.1f} req/s  {summarize(latencies)}  hit ratio {stats.get('hit_ratio', '-')}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in MODES:
+        mode = sys.argv[1]
+        total = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+        concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+        configure(f"bench_course_cache_{mode}.db", course_cache_backend=mode, password_hash_workers=0)
+        asyncio.run(run(mode, total, concurrency))
+    else:
+        run_modes(__file__, MODES)
@@ -0,0 +1,95 @@
+"""
+Benchmark: streaming attendance export throughput and memory.
+
+Seeds an attendance table, then runs the export pipeline that backs
+GET /api/export/attendance (server-side cursor -> encoder) for CSV, NDJSON
+and gzipped CSV, reporting rows/s, output MB/s and peak RSS. Peak RSS should
+not grow with the row count.
+
+The HTTP layer is left out: httpx's in-process ASGI transport buffers whole
+response bodies, which would measure the client rather than the server.
+
+Usage:
+    python benchmarks/bench_export.py [rows]      # e.g. 10000000 for the 10M-row case
+"""
+import resource
+import sys
+import time
+from datetime import date, datetime, timedelta
+from itertools import islice
+from common import configure
+
+
+STUDENTS = 1000
+COURSES = 10
+SEED_BATCH = 100_000
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed(rows: int) -> None:
+    from app.main import app  # noqa: F401  (creates the tables)
+    from app.core.database import engine
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO students (first_name, last_name, email) VALUES (?, ?, ?)",
+            [(f"First{i}", f"Last{i}", f"student{i}@example.com") for i in range(STUDENTS)],
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO courses (name, code, credits) VALUES (?, ?, 3)",
+            [(f"Course {i}", f"C{i}") for i in range(COURSES)],
+        )
+
+    def attendance_rows():
+        # Unique (student, course, day): walk students, then courses, then days
+        start_day = date(2020, 1, 1)
+        for i in range(rows):
+            day = start_day + timedelta(days=i // (STUDENTS * COURSES))
+            yield (i % STUDENTS + 1, i // STUDENTS % COURSES + 1,
+                   datetime.combine(day, datetime.min.time()).isoformat(" "), day.isoformat(), i % 7 != 0)
+
+    generator = attendance_rows()
+    with engine.begin() as conn:
+        while batch := list(islice(generator, SEED_BATCH)):
+            conn.exec_driver_sql(
+                "INSERT INTO attendances (student_id, course_id, attendance_date, attendance_day, is_present) "
+                "VALUES (?, ?, ?, ?, ?)",
+                batch,
+            )
+
+
+def export(fmt: str, compress: bool) -> tuple[int, int, float]:
+    from app.core.database import SessionLocal
+    from app.services.export_service import EXPORTS, ExportEncoder, ExportService
+
+    stmt = ExportService.export_query("attendance")
+    encoder = ExportEncoder(fmt, EXPORTS["attendance"], compress=compress)
+    rows = 0
+    size = len(encoder.header())
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        for partition in ExportService.iter_partitions(db, stmt):
+            rows += len(partition)
+            size += len(encoder.encode(partition))
+    size += len(encoder.finish())
+    return rows, size, time.perf_counter() - started
+
+
+def main(rows: int) -> None:
+    configure("bench_export.db")
+    started = time.perf_counter()
+    seed(rows)
+    print(f"seeded {rows} attendance rows in {time.perf_counter() - started:.1f}s, peak RSS {peak_rss_mb():.0f} MB")
+
+    for fmt, compress in [("csv", False), ("ndjson", False), ("csv", True)]:
+        exported, size, elapsed = export(fmt, compress)
+        label = fmt + ("+gzip" if compress else "")
+        print(f"{label:>8}: {exported / elapsed:9.0f} rows/s  {size / elapsed / 1e6:6.1f} MB/s  "
+              f"({size / 1e6:.0f} MB in {elapsed:.1f}s, peak RSS {peak_rss_mb():.0f} MB)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
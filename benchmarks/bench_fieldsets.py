@@ -0,0 +1,72 @@
+"""
+Benchmark: full vs sparse-fieldset student and course responses.
+
+Seeds students with a long address and a course with a large roster, then
+requests each payload with every field and with the few fields a mobile
+client needs, reporting latency and response size. Both sides pass fields=,
+so both take the same (uncached) path and differ only in the columns and
+relationships loaded and serialized.
+
+Payloads:
+  - GET /api/students/?limit=100: all fields vs id,first_name,last_name,email
+  - GET /api/courses/{id}: all fields (with the roster) vs id,name,code
+
+Usage:
+    python benchmarks/bench_fieldsets.py [requests]
+"""
+import asyncio
+import sys
+import time
+from common import configure, login, summarize
+
+
+STUDENTS = 2000
+ADDRESS = "Apartment 12, " + "Long Street " * 40  # ~500 bytes of Text per student
+PAYLOADS = {
+    "students?limit=100": (
+        "/api/students/?limit=100&fields=" + ",".join(
+            ["first_name", "last_name", "email", "phone", "address", "id", "enrollment_date", "created_at", "updated_at"]
+        ),
+        "/api/students/?limit=100&fields=id,first_name,last_name,email",
+    ),
+    f"course detail ({STUDENTS} students)": (
+        "/api/courses/1?fields=id,name,code,description,credits,created_at,updated_at,students",
+        "/api/courses/1?fields=id,name,code",
+    ),
+}
+
+
+async def run(total: int) -> None:
+    import httpx
+    from app.main import app
+    from app.core.database import engine
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO students (first_name, last_name, email, phone, address) VALUES (?, ?, ?, ?, ?)",
+            [(f"First{i}", f"Last{i}", f"student{i}@example.com", f"555-{i:04d}", ADDRESS) for i in range(STUDENTS)],
+        )
+        conn.exec_driver_sql("INSERT INTO courses (name, code, credits) VALUES ('Benchmark Course', 'BENCH101', 3)")
+        conn.exec_driver_sql(
+            "INSERT INTO student_course (student_id, course_id) VALUES (?, 1)",
+            [(student,) for student in range(1, STUDENTS + 1)],
+        )
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        headers = await login(client)
+        for label, urls in PAYLOADS.items():
+            print(label)
+            for name, url in zip(("full", "sparse"), urls):
+                size = len((await client.get(url, headers=headers)).content)
+                latencies = []
+                for _ in range(total):
+                    start = time.perf_counter()
+                    response = await client.get(url, headers=headers)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    response.raise_for_status()
+                print(f"  {name:>6}: {size:8d} B  {summarize(latencies)}")
+
+
+if __name__ == "__main__":
+    configure("bench_fieldsets.db", password_hash_workers=0)
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
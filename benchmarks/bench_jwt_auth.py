@@ -0,0 +1,73 @@
+"""
+Benchmark: per-request bearer-token authentication overhead.
+
+Times, for one token reused over and over:
+  - decode_token (signature check and claim parsing on every call) vs.
+    decode_token_cached (verified-token cache)
+  - the whole get_current_admin_or_session dependency with each decoder
+    (the admin identity cache is warm in both cases)
+
+Usage:
+    python benchmarks/bench_jwt_auth.py [iterations]
+"""
+import asyncio
+import sys
+import time
+from common import configure
+
+
+def per_call_us(function, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def per_await_us(function, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await function()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def run(iterations: int) -> None:
+    from fastapi.security import HTTPAuthorizationCredentials
+    from starlette.requests import Request
+    from app.main import app  # noqa: F401  (creates the tables)
+    from app.core import security
+    from app.core.database import SessionLocal
+    from app.schemas.admin import AdminCreate
+    from app.services.admin_service import AdminService
+    from app.utils.jwt_utils import create_access_token, decode_token, decode_token_cached
+
+    with SessionLocal() as db:
+        admin = AdminService.create_admin(
+            db, AdminCreate(username="benchadmin", email="bench@example.com", password="benchpassword")
+        )
+        admin_id = admin.id
+    token = create_access_token({"sub": str(admin_id)})
+
+    before = per_call_us(lambda: decode_token(token), iterations)
+    after = per_call_us(lambda: decode_token_cached(token), iterations)
+    print(f"decode:     {before:7.1f} us/call uncached  {after:7.1f} us/call cached  ({before / after:.0f}x)")
+
+    request = Request({"type": "http", "session": {}, "headers": []})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    with SessionLocal() as db:
+        def authenticate():
+            return security.get_current_admin_or_session(request, credentials, db)
+
+        timings = {}
+        for label, decoder in [("uncached", decode_token), ("cached", decode_token_cached)]:
+            security.decode_token_cached = decoder
+            await authenticate()  # Warm the admin identity cache
+            timings[label] = await per_await_us(authenticate, iterations)
+        security.decode_token_cached = decode_token_cached
+
+    print(f"dependency: {timings['uncached']:7.1f} us/call uncached  {timings['cached']:7.1f} us/call cached  "
+          f"({timings['uncached'] / timings['cached']:.1f}x)")
+
+
+if __name__ == "__main__":
+    configure("bench_jwt_auth.db", password_hash_workers=0)
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
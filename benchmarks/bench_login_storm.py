@@ -0,0 +1,86 @@
+"""
+Benchmark: login storm vs. unrelated API latency.
+
+Fires concurrent POST /api/auth/login requests while a steady stream of
+GET /api/courses/ requests runs alongside, once with Argon2 in the request
+threads (PASSWORD_HASH_WORKERS=0) and once on the bounded process pool.
+Reports login throughput, logins turned away with 503, and the latency of
+the course listings (compare with the baseline taken before the storm).
+
+Usage:
+    python benchmarks/bench_login_storm.py [logins] [login_concurrency] [workers]
+"""
+import asyncio
+import sys
+import time
+from common import ADMIN, configure, login, run_modes, summarize
+
+
+MODES = ["inline", "pool"]
+PROBE_INTERVAL = 0.01  # Seconds between course listing requests
+
+
+async def probe(client, headers: dict, stop: asyncio.Event) -> list[float]:
+    """Request the course listing at a steady rate until stopped; return latencies in ms."""
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/api/courses/", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        await asyncio.sleep(PROBE_INTERVAL)
+    return latencies
+
+
+async def run(mode: str, total: int, concurrency: int) -> None:
+    import httpx
+    from app.main import app
+    from app.utils.hashing import shutdown_hashing_pool
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        headers = await login(client)
+        for i in range(20):
+            await client.post("/api/courses/", json={"name": f"Course {i}", "code": f"C{i}"}, headers=headers)
+
+        stop = asyncio.Event()
+        baseline = asyncio.create_task(probe(client, headers, stop))
+        await asyncio.sleep(2)
+        stop.set()
+        baseline = await baseline
+
+        credentials = {"username": ADMIN["username"], "password": ADMIN["password"]}
+        statuses = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one() -> None:
+            async with semaphore:
+                response = await client.post("/api/auth/login", json=credentials)
+                statuses.append(response.status_code)
+
+        stop = asyncio.Event()
+        during = asyncio.create_task(probe(client, headers, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        during = await during
+
+    shutdown_hashing_pool()
+    succeeded = statuses.count(200)
+    print(f"{mode:>6}: {succeeded / elapsed:6.1f} logins/s  ({succeeded} ok, {statuses.count(503)} turned away with 503"
+          f" in {elapsed:.1f}s)")
+    print(f"        courses before storm {summarize(baseline)}")
+    print(f"        courses during storm {summarize(during)}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in MODES:
+        mode = sys.argv[1]
+        total = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+        concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+        workers = int(sys.argv[4]) if len(sys.argv) > 4 else 2
+        configure(f"bench_login_{mode}.db", password_hash_workers=workers if mode == "pool" else 0)
+        asyncio.run(run(mode, total, concurrency))
+    else:
+        run_modes(__file__, MODES)
@@ -0,0 +1,59 @@
+"""
+Benchmark: offset vs keyset (cursor) pagination of students at increasing page depth.
+
+Calls StudentService directly so only query cost is measured.
+
+Usage:
+    python benchmarks/bench_pagination.py [students]
+"""
+import sys
+import time
+from common import configure
+
+
+def main(total: int) -> None:
+    configure("bench_pagination.db")
+    from app.main import app  # noqa: F401  (creates tables)
+    from app.core.database import SessionLocal
+    from app.models.student import Student
+    from app.services.student_service import StudentService
+
+    with SessionLocal() as db:
+        batch = 50000
+        for start in range(0, total, batch):
+            db.execute(Student.__table__.insert(), [
+                {"first_name": "First", "last_name": f"Last{i % 997:03d}", "email": f"student{i}@example.com"}
+                for i in range(start, min(start + batch, total))
+            ])
+        db.commit()
+
+        limit = 50
+        for sort in ("id", "last_name"):
+            # Walk to each depth once with cursors, then time the page at that depth
+            depths = [d for d in (1, total // 100, total // 10, total // 2, total - limit) if d > 0]
+            cursors = {}
+            after = None
+            position = 0
+            while after is not None or position == 0:
+                for depth in depths:
+                    if position <= depth < position + limit and depth not in cursors:
+                        cursors[depth] = after
+                _, after = StudentService.get_students_after(db, limit, after, sort)
+                position += limit
+                if after is None:
+                    break
+
+            for depth in depths:
+                start = time.perf_counter()
+                StudentService.get_students(db, (depth // limit) * limit, limit, sort)
+                offset_ms = (time.perf_counter() - start) * 1000
+
+                start = time.perf_counter()
+                StudentService.get_students_after(db, limit, cursors.get(depth), sort)
+                keyset_ms = (time.perf_counter() - start) * 1000
+
+                print(f"sort={sort:<9} row {depth:>9}: offset {offset_ms:8.2f} ms   keyset {keyset_ms:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,58 @@
+"""
+Benchmark: student search latency, full-text index vs ILIKE substring scan.
+
+Seeds students with random names, then runs prefix searches (what the
+students.html search box sends while typing) through StudentService and
+reports latency percentiles for the page query plus its count.
+
+Usage:
+    python benchmarks/bench_search.py [students] [queries]
+"""
+import random
+import sys
+import time
+from common import configure, run_modes, summarize
+
+
+MODES = ["fulltext", "like"]
+SYLLABLES = ["an", "bel", "car", "dan", "el", "fer", "gar", "han", "is", "jo", "ka", "lee", "mar", "no", "os", "pra", "ri", "sa", "to", "vi"]
+
+
+def name(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def main(mode: str, total: int, queries: int) -> None:
+    configure("bench_search.db", student_search_backend=mode)
+    from app.main import app  # noqa: F401  (creates tables and the full-text index)
+    from app.core.database import SessionLocal
+    from app.models.student import Student
+    from app.services.student_service import StudentService
+
+    rng = random.Random(42)
+    with SessionLocal() as db:
+        batch = 50000
+        for start in range(0, total, batch):
+            db.execute(Student.__table__.insert(), [
+                {"first_name": name(rng), "last_name": name(rng), "email": f"student{i}@example.com"}
+                for i in range(start, min(start + batch, total))
+            ])
+        db.commit()
+
+        terms = [name(rng)[:rng.randint(3, 6)] for _ in range(queries)]
+        latencies = []
+        for term in terms:
+            start = time.perf_counter()
+            StudentService.search_students(db, term, 0, 10, total_mode="exact")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    print(f"{mode:>8} ({total} students): {summarize(latencies)}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in MODES:
+        total = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+        queries = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+        main(sys.argv[1], total, queries)
+    else:
+        run_modes(__file__, MODES)
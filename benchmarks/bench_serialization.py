@@ -0,0 +1,172 @@
+"""
+Benchmark: response serialization per response schema, before and after FAST_JSON_ROUTERS.
+
+Serializes a representative value of every response schema in app/schemas/
+(ORM objects where the endpoint returns them, dicts where it returns dicts)
+two ways and reports the CPU time per response:
+  - before: FastAPI's default pipeline (serialize_response validates against
+    the response field and converts to primitives, JSONResponse encodes them
+    with the json module)
+  - after: dump_response, as used by FastJSONRoute (one from-attributes
+    validation with the schema's precompiled TypeAdapter, which writes the
+    JSON bytes itself)
+
+No database or HTTP round trip is involved; this is the per-response cost
+the router setting switches.
+
+Usage:
+    python benchmarks/bench_serialization.py [iterations]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from common import configure
+
+
+ROWS = 100  # Rows of list payloads (a page of students, a roster, a day of attendance)
+NOW = datetime(2024, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def sample_payloads() -> dict:
+    """Build label -> (response schema, value returned by the endpoint)."""
+    from app.models.admin import Admin
+    from app.models.attendance import Attendance
+    from app.models.course import Course
+    from app.models.purge_job import PurgeJob
+    from app.models.student import Student
+    from app.schemas.admin import AdminResponse, Token
+    from app.schemas.attendance import (
+        AttendanceBulkResponse,
+        AttendanceByDateResponse,
+        AttendanceDetailResponse,
+        AttendanceReportResponse,
+        AttendanceResponse,
+    )
+    from app.schemas.course import CourseDetailResponse, CourseResponse, EnrollmentBulkResponse
+    from app.schemas.purge_job import PurgeJobResponse
+    from app.schemas.stats import DashboardStatsResponse
+    from app.schemas.student import (
+        StudentBulkDeleteResponse,
+        StudentBulkImportResponse,
+        StudentDetailResponse,
+        StudentListResponse,
+        StudentResponse,
+    )
+
+    def student(i: int) -> Student:
+        return Student(
+            id=i, first_name=f"First{i}", last_name=f"Last{i}", email=f"student{i}@example.com",
+            phone=f"555-{i:04d}", address=f"{i} Main Street", enrollment_date=NOW, created_at=NOW, updated_at=None,
+        )
+
+    def course(i: int) -> Course:
+        return Course(
+            id=i, name=f"Course {i}", code=f"C{i:03d}", description="Introductory course", credits=3,
+            created_at=NOW, updated_at=NOW,
+        )
+
+    def attendance(i: int) -> Attendance:
+        return Attendance(
+            id=i, student_id=i, course_id=1, attendance_date=NOW + timedelta(days=i % 30),
+            is_present=i % 5 != 0, remarks=None if i % 5 else "sick", created_at=NOW, updated_at=None,
+        )
+
+    detailed_course = course(1)
+    detailed_course.students = [student(i) for i in range(1, ROWS + 1)]
+    detailed_student = student(1)
+    detailed_student.courses = [course(i) for i in range(1, 7)]
+    detailed_attendance = attendance(1)
+    detailed_attendance.student = student(1)
+    detailed_attendance.course = course(1)
+    report = {
+        "student_id": 1, "student_name": "First1 Last1", "course_id": 1, "course_name": "Course 1",
+        "total_classes": 30, "attended_classes": 27, "absent_classes": 3, "attendance_percentage": 90.0,
+    }
+
+    return {
+        "AdminResponse": (AdminResponse, Admin(
+            id=1, username="admin", email="admin@example.com", is_active=True, created_at=NOW, updated_at=None,
+        )),
+        "Token": (Token, {"access_token": "x" * 180, "token_type": "bearer", "expires_in": 1800}),
+        "AttendanceResponse": (AttendanceResponse, attendance(1)),
+        f"list[AttendanceResponse] x{ROWS}": (list[AttendanceResponse], [attendance(i) for i in range(1, ROWS + 1)]),
+        "AttendanceBulkResponse": (AttendanceBulkResponse, {
+            "course_id": 1, "attendance_date": NOW, "created": ROWS, "updated": 0, "failed": 0,
+            "results": [{"student_id": i, "status": "created", "attendance_id": i} for i in range(1, ROWS + 1)],
+        }),
+        "AttendanceDetailResponse": (AttendanceDetailResponse, detailed_attendance),
+        "AttendanceReportResponse": (AttendanceReportResponse, report),
+        f"list[AttendanceReportResponse] x{ROWS}": (list[AttendanceReportResponse], [report] * ROWS),
+        "AttendanceByDateResponse": (AttendanceByDateResponse, {
+            "date": NOW, "course_id": 1, "course_name": "Course 1", "total_students": ROWS,
+            "present_students": ROWS - ROWS // 5, "absent_students": ROWS // 5,
+            "attendance_records": [attendance(i) for i in range(1, ROWS + 1)],
+        }),
+        "CourseResponse": (CourseResponse, course(1)),
+        f"list[CourseResponse] x{ROWS}": (list[CourseResponse], [course(i) for i in range(1, ROWS + 1)]),
+        f"CourseDetailResponse ({ROWS} students)": (CourseDetailResponse, detailed_course),
+        "EnrollmentBulkResponse": (EnrollmentBulkResponse, {
+            "course_id": 1, "action": "add", "added": ROWS, "removed": 0, "skipped": 0, "missing": 2,
+            "missing_ids": [9998, 9999],
+        }),
+        "PurgeJobResponse": (PurgeJobResponse, PurgeJob(
+            id=1, entity="course", status="done", total_rows=5000, rows_deleted=5000, error=None,
+            created_at=NOW, finished_at=NOW,
+        )),
+        "DashboardStatsResponse": (DashboardStatsResponse, {
+            "students_count": 5000, "courses_count": 40, "enrollments_count": 20000, "today_marked": 800,
+            "today_present": 720, "today_attendance_rate": 90.0, "average_attendance_rate": 88.5,
+            "at_risk_students": 12, "generated_at": NOW,
+        }),
+        "StudentResponse": (StudentResponse, student(1)),
+        "StudentDetailResponse (6 courses)": (StudentDetailResponse, detailed_student),
+        f"StudentListResponse x{ROWS}": (StudentListResponse, {
+            "total": 5000, "total_kind": "exact", "page": 1, "limit": ROWS,
+            "students": [student(i) for i in range(1, ROWS + 1)],
+        }),
+        "StudentBulkImportResponse": (StudentBulkImportResponse, {
+            "total_rows": 1000, "inserted": 990, "failed": 10,
+            "errors": [{"row": i, "email": f"bad{i}", "errors": ["value is not a valid email address"]} for i in range(10)],
+        }),
+        "StudentBulkDeleteResponse": (StudentBulkDeleteResponse, {
+            "mode": "sync", "deleted": ROWS - 2, "missing": 2, "missing_ids": [9998, 9999], "job": None,
+        }),
+    }
+
+
+def cpu_us(function, iterations: int) -> float:
+    started = time.process_time()
+    for _ in range(iterations):
+        function()
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+def run(iterations: int) -> None:
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from app.core.serialization import dump_response, orjson
+
+    loop = asyncio.new_event_loop()
+
+    def fastapi_default(field, value) -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=value))
+        return JSONResponse(content).body
+
+    print(f"{'schema':44s} {'before':>10s} {'after':>10s} {'speedup':>8s}")
+    for label, (schema, value) in sample_payloads().items():
+        field = create_response_field(name=f"Response_{label}", type_=schema)
+        before_body, after_body = fastapi_default(field, value), dump_response(schema, value)
+        if orjson is not None:
+            assert orjson.loads(before_body) == orjson.loads(after_body), label
+
+        before = cpu_us(lambda: fastapi_default(field, value), iterations)
+        after = cpu_us(lambda: dump_response(schema, value), iterations)
+        print(f"{label:44s} {before:8.1f}us {after:8.1f}us {before / after:7.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    configure("bench_serialization.db", password_hash_workers=0)
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
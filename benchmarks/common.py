@@ -0,0 +1,97 @@
+"""
+Shared helpers for the benchmark scripts.
+Each benchmark runs the application in-process against a throwaway SQLite database,
+so settings must be configured before anything under app/ is imported.
+
+Requires httpx (also needed by FastAPI's TestClient).
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+ADMIN = {"username": "benchadmin", "email": "bench@example.com", "password": "benchpassword"}
+
+
+def configure(db_name: str = "bench.db", **env) -> Path:
+    """
+    Point the application at a fresh SQLite database and apply setting overrides.
+
+    Args:
+        db_name: File name of the database inside the temp directory
+        **env: Extra settings, e.g. db_async="true"
+
+    Returns:
+        Path: Database file path
+    """
+    db_path = Path(tempfile.gettempdir()) / db_name
+    if db_path.exists():
+        db_path.unlink()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    for key, value in env.items():
+        os.environ[key.upper()] = str(value)
+
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    return db_path
+
+
+def run_modes(script: str, modes: list[str]) -> None:
+    """
+    Re-run a benchmark script once per mode in a separate interpreter.
+
+    Settings are read at import time, so each mode needs its own process.
+
+    Args:
+        script: Path of the benchmark script (usually __file__)
+        modes: Mode names passed as the first argument to the child
+    """
+    for mode in modes:
+        subprocess.run([sys.executable, script, mode, *sys.argv[1:]], check=True)
+
+
+async def login(client) -> dict:
+    """
+    Register the benchmark admin and return bearer auth headers.
+
+    Args:
+        client: httpx.AsyncClient bound to the application
+
+    Returns:
+        dict: Authorization header
+    """
+    await client.post("/api/auth/register", json=ADMIN)
+    response = await client.post(
+        "/api/auth/login",
+        json={"username": ADMIN["username"], "password": ADMIN["password"]},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def summarize(latencies_ms: list[float]) -> dict:
+    """
+    Summarize request latencies.
+
+    Args:
+        latencies_ms: Latencies in milliseconds
+
+    Returns:
+        dict: Count, mean and p50/p95/p99 latencies
+    """
+    ordered = sorted(latencies_ms)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 2),
+        "p50_ms": round(pct(0.50), 2),
+        "p95_ms": round(pct(0.95), 2),
+        "p99_ms": round(pct(0.99), 2),
+    }
@@ -0,0 +1,120 @@
+"""
+Shared fixtures for the test suite.
+
+The application runs in-process against two throwaway SQLite files: a
+primary and a read replica. Replication is explicit (the replicate fixture
+copies the primary over the replica), so a test controls exactly what the
+replica has seen. Settings are read at import time, so the environment is
+configured before anything under app/ is imported.
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+import pytest
+
+
+ROOT = Path(__file__).resolve().parent.parent
+DB_DIR = Path(tempfile.mkdtemp(prefix="sms-tests-"))
+PRIMARY_DB = DB_DIR / "primary.db"
+REPLICA_DB = DB_DIR / "replica.db"
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{PRIMARY_DB}",
+    "REPLICA_DATABASE_URLS": f'["sqlite:///{REPLICA_DB}"]',
+    "PASSWORD_HASH_WORKERS": "0",
+    "COURSE_CACHE_BACKEND": "lru",
+})
+os.environ.setdefault("DB_ASYNC", "false")  # DB_ASYNC=true runs the suite on the async path
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def copy_primary_to_replica() -> None:
+    """Bring the replica up to date with the primary (SQLite online backup)."""
+    source, target = sqlite3.connect(PRIMARY_DB), sqlite3.connect(REPLICA_DB)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.main import app as application
+    copy_primary_to_replica()  # Schema on the replica
+    return application
+
+
+@pytest.fixture
+def replicate():
+    """Function replicating the primary's current state to the replica."""
+    return copy_primary_to_replica
+
+
+@pytest.fixture
+def client(app):
+    """
+    Test client that echoes X-Primary-Until, like an API client reading its own writes.
+
+    Drop the header from client.headers to read as a client that did not write.
+    """
+    from fastapi.testclient import TestClient
+    from app.core.database import PRIMARY_UNTIL_HEADER
+
+    with TestClient(app) as test_client:
+        def echo_primary_until(response) -> None:
+            if PRIMARY_UNTIL_HEADER in response.headers:
+                test_client.headers[PRIMARY_UNTIL_HEADER] = response.headers[PRIMARY_UNTIL_HEADER]
+
+        test_client.event_hooks = {"request": [], "response": [echo_primary_until]}
+        yield test_client
+
+
+@pytest.fixture
+def make_admin(client):
+    """
+    Factory registering an admin and returning its bearer auth headers.
+
+    The admin is not replicated: authentication reads it from the primary.
+    """
+    def make() -> dict:
+        name = f"admin{uuid.uuid4().hex[:8]}"
+        password = "testpassword"
+        client.post("/api/auth/register", json={"username": name, "email": f"{name}@example.com", "password": password})
+        response = client.post("/api/auth/login", json={"username": name, "password": password})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return make
+
+
+@pytest.fixture
+def make_student(client):
+    """Factory creating a student (on the primary) and returning its ID."""
+    def make(headers: dict) -> int:
+        unique = uuid.uuid4().hex[:8]
+        response = client.post(
+            "/api/students/",
+            json={"first_name": "Ada", "last_name": f"Test{unique}", "email": f"{unique}@example.com"},
+            headers=headers,
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    return make
+
+
+@pytest.fixture
+def make_course(client):
+    """Factory creating a course (on the primary) and returning its ID."""
+    def make(headers: dict) -> int:
+        unique = uuid.uuid4().hex[:8]
+        response = client.post("/api/courses/", json={"name": f"Course {unique}", "code": unique}, headers=headers)
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    return make
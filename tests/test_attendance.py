@@ -0,0 +1,222 @@
+"""
+Attendance marking and the attendance_summary counters.
+"""
+import json
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from app.core.database import SessionLocal
+from app.schemas.attendance import AttendanceCreate
+from app.services import attendance_service
+from app.services.attendance_service import AttendanceService
+from app.services.purge_service import PurgeService
+
+DATE = "2024-03-01T09:00:00Z"
+
+
+def race_first_mark(monkeypatch, statement: str, student_id: int, course_id: int, is_present: bool) -> None:
+    """
+    Make another request commit the day's first mark right before this
+    request's first insert or upsert statement, as a concurrent first mark would.
+    """
+    real = getattr(attendance_service, statement)
+    raced = []
+
+    def build(*args, **kwargs):
+        if not raced:
+            raced.append(True)
+            with SessionLocal() as other:
+                AttendanceService.mark_attendance(other, AttendanceCreate(
+                    student_id=student_id, course_id=course_id, attendance_date=DATE, is_present=is_present
+                ))
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(attendance_service, statement, build)
+
+
+@pytest.fixture
+def statements():
+    """SQL statements run on the primary while the test runs."""
+    from app.core.database import engine
+    executed = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    yield executed
+    event.remove(engine, "before_cursor_execute", on_execute)
+
+
+def report(client, headers, student_id: int, course_id: int) -> dict:
+    response = client.get(f"/api/attendance/report/{student_id}/{course_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_marks_update_the_summary(client, make_admin, make_student, make_course):
+    headers = make_admin()
+    student_id, course_id = make_student(headers), make_course(headers)
+    mark = {"student_id": student_id, "course_id": course_id, "attendance_date": DATE}
+
+    assert client.post("/api/attendance/", json={**mark, "is_present": True}, headers=headers).status_code == 201
+    assert client.post("/api/attendance/", json={**mark, "is_present": False}, headers=headers).status_code == 200
+    remarked = client.post("/api/attendance/", json={**mark, "is_present": False, "remarks": "late"}, headers=headers)
+    assert remarked.status_code == 200
+    assert remarked.json()["remarks"] == "late"
+
+    summary = report(client, headers, student_id, course_id)
+    assert (summary["total_classes"], summary["attended_classes"], summary["absent_classes"]) == (1, 0, 1)
+
+
+def test_a_mark_is_one_upsert_and_a_summary_update(make_admin, make_student, make_course, statements):
+    headers = make_admin()
+    student_id, course_id = make_student(headers), make_course(headers)
+    statements.clear()
+
+    with SessionLocal() as db:
+        AttendanceService.mark_attendance(db, AttendanceCreate(
+            student_id=student_id, course_id=course_id, attendance_date=DATE, is_present=True
+        ))
+
+    writes = [statement for statement in statements if not statement.startswith("UPDATE table_versions")]
+    assert len(writes) == 2, writes
+    assert writes[0].startswith("INSERT INTO attendances") and "EXISTS" in writes[0]
+    assert writes[1].startswith("INSERT INTO attendance_summary")
+
+
+def test_losing_a_first_mark_race_counts_the_day_once(client, make_admin, make_student, make_course, monkeypatch):
+    headers = make_admin()
+    student_id, course_id = make_student(headers), make_course(headers)
+    race_first_mark(monkeypatch, "upsert", student_id, course_id, is_present=False)
+
+    response = client.post(
+        "/api/attendance/",
+        json={"student_id": student_id, "course_id": course_id, "attendance_date": DATE, "is_present": True},
+        headers=headers,
+    )
+    assert response.status_code == 200  # Updates the mark that won the race
+    assert response.json()["is_present"] is True
+
+    summary = report(client, headers, student_id, course_id)
+    assert (summary["total_classes"], summary["attended_classes"], summary["absent_classes"]) == (1, 1, 0)
+
+
+def test_bulk_mark_losing_a_race_counts_the_day_once(client, make_admin, make_student, make_course, monkeypatch):
+    headers = make_admin()
+    course_id = make_course(headers)
+    raced_id, other_id = make_student(headers), make_student(headers)
+    race_first_mark(monkeypatch, "insert", raced_id, course_id, is_present=False)
+
+    response = client.post("/api/attendance/bulk", json={
+        "course_id": course_id,
+        "attendance_date": DATE,
+        "entries": [{"student_id": raced_id, "is_present": True}, {"student_id": other_id, "is_present": True}],
+    }, headers=headers)
+    assert response.status_code == 200, response.text
+    assert [result["status"] for result in response.json()["results"]] == ["updated", "created"]
+
+    for student_id in (raced_id, other_id):
+        summary = report(client, headers, student_id, course_id)
+        assert (summary["total_classes"], summary["attended_classes"]) == (1, 1)
+
+
+def soft_delete(entity: str, record_id: int) -> None:
+    """Hide a record pending its purge, as DELETE ?mode=async does before the background job runs."""
+    with SessionLocal() as db:
+        assert PurgeService.start_purge(db, entity, [record_id]) is not None
+
+
+def test_marks_are_rejected_while_pending_purge(client, make_admin, make_student, make_course):
+    headers = make_admin()
+    student_id, course_id = make_student(headers), make_course(headers)
+    live_student, live_course = make_student(headers), make_course(headers)
+    soft_delete("student", student_id)
+    soft_delete("course", course_id)
+
+    for mark_student, mark_course, missing in (
+        (student_id, live_course, f"Student with ID {student_id} not found"),
+        (live_student, course_id, f"Course with ID {course_id} not found"),
+    ):
+        response = client.post("/api/attendance/", json={
+            "student_id": mark_student, "course_id": mark_course, "attendance_date": DATE, "is_present": True,
+        }, headers=headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == missing
+
+
+def test_pending_purge_is_left_out_of_stats_and_export(client, make_admin, make_student, make_course):
+    headers = make_admin()
+    course_id = make_course(headers)
+    kept_id, purged_id = make_student(headers), make_student(headers)
+    today = datetime.now().isoformat()
+    for student_id in (kept_id, purged_id):
+        response = client.post("/api/attendance/", json={
+            "student_id": student_id, "course_id": course_id, "attendance_date": today, "is_present": True,
+        }, headers=headers)
+        assert response.status_code == 201
+
+    before = client.get("/api/stats", headers=headers).json()
+    soft_delete("student", purged_id)
+    after = client.get("/api/stats", headers=headers).json()
+    assert after["today_marked"] == before["today_marked"] - 1
+    assert after["today_present"] == before["today_present"] - 1
+
+    export = client.get(f"/api/export/attendance?format=ndjson&course_id={course_id}", headers=headers)
+    assert export.status_code == 200
+    assert [json.loads(line)["student_id"] for line in export.text.splitlines()] == [kept_id]
+
+
+def test_pending_purge_is_left_out_of_attendance_listings(client, make_admin, make_student, make_course):
+    headers = make_admin()
+    course_id, purged_course = make_course(headers), make_course(headers)
+    kept_id, purged_id = make_student(headers), make_student(headers)
+    day = "2024-04-02"
+    for student_id, mark_course in ((kept_id, course_id), (purged_id, course_id), (kept_id, purged_course)):
+        response = client.post("/api/attendance/", json={
+            "student_id": student_id, "course_id": mark_course, "attendance_date": f"{day}T09:00:00Z", "is_present": True,
+        }, headers=headers)
+        assert response.status_code == 201
+
+    soft_delete("student", purged_id)
+    soft_delete("course", purged_course)
+
+    by_date = client.get(f"/api/attendance/date/{day}", params={"course_id": course_id}, headers=headers)
+    assert [record["student_id"] for record in by_date.json()] == [kept_id]
+    assert client.get(f"/api/attendance/student/{purged_id}", headers=headers).json() == []
+    by_student = client.get(f"/api/attendance/student/{kept_id}", headers=headers)
+    assert [record["course_id"] for record in by_student.json()] == [course_id]
+
+
+def test_pending_purge_is_left_out_of_every_dashboard_number(client, make_admin, make_student, make_course):
+    headers = make_admin()
+    kept_course, purged_course = make_course(headers), make_course(headers)
+    student_id = make_student(headers)
+    for course_id in (kept_course, purged_course):
+        assert client.post(f"/api/students/{student_id}/courses/{course_id}", headers=headers).status_code == 200
+        for day in range(1, 4):  # Three absences: at risk in both courses
+            response = client.post("/api/attendance/", json={
+                "student_id": student_id, "course_id": course_id,
+                "attendance_date": f"2024-03-0{day}T09:00:00Z", "is_present": False,
+            }, headers=headers)
+            assert response.status_code == 201
+
+    before = client.get("/api/stats", headers=headers).json()
+    soft_delete("course", purged_course)
+    after = client.get("/api/stats", headers=headers).json()
+    assert after["courses_count"] == before["courses_count"] - 1
+    assert after["enrollments_count"] == before["enrollments_count"] - 1
+    assert after["at_risk_students"] == before["at_risk_students"]  # Still at risk in the kept course
+
+    soft_delete("course", kept_course)
+    final = client.get("/api/stats", headers=headers).json()
+    assert final["enrollments_count"] == before["enrollments_count"] - 2
+    assert final["at_risk_students"] == before["at_risk_students"] - 1
+
+
+def test_stats_are_computed_on_the_primary(client, make_admin, make_course):
+    writer, reader = make_admin(), make_admin()
+    before = client.get("/api/stats", headers=reader).json()
+    make_course(writer)  # Invalidates the cached numbers; not replicated yet
+
+    assert client.get("/api/stats", headers=reader).json()["courses_count"] == before["courses_count"] + 1
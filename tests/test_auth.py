@@ -0,0 +1,58 @@
+"""
+Admin deactivation: a deactivated admin can neither log in nor use an
+existing token.
+"""
+import uuid
+
+
+def register(client) -> tuple[int, dict]:
+    """Register an admin and return its ID and login credentials."""
+    name = f"admin{uuid.uuid4().hex[:8]}"
+    credentials = {"username": name, "password": "testpassword"}
+    response = client.post("/api/auth/register", json={**credentials, "email": f"{name}@example.com"})
+    assert response.status_code == 200, response.text
+    return response.json()["id"], credentials
+
+
+def login(client, credentials: dict):
+    return client.post("/api/auth/login", json=credentials)
+
+
+def test_deactivated_admin_is_locked_out(client, make_admin, replicate):
+    headers = make_admin()
+    admin_id, credentials = register(client)
+    token = login(client, credentials).json()["access_token"]
+    replicate()
+    own_headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/stats", headers=own_headers).status_code == 200
+
+    response = client.put(f"/api/auth/admins/{admin_id}/active", json={"is_active": False}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["is_active"] is False
+    replicate()
+
+    assert login(client, credentials).status_code == 401
+    assert client.get("/api/stats", headers=own_headers).status_code == 401
+
+    response = client.put(f"/api/auth/admins/{admin_id}/active", json={"is_active": True}, headers=headers)
+    assert response.status_code == 200
+    replicate()
+    assert login(client, credentials).status_code == 200
+    assert client.get("/api/stats", headers=own_headers).status_code == 200
+
+
+def test_admins_cannot_deactivate_themselves(client):
+    admin_id, credentials = register(client)
+    headers = {"Authorization": f"Bearer {login(client, credentials).json()['access_token']}"}
+    response = client.put(f"/api/auth/admins/{admin_id}/active", json={"is_active": False}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_unknown_admin(client, make_admin):
+    response = client.put("/api/auth/admins/999999/active", json={"is_active": False}, headers=make_admin())
+    assert response.status_code == 404
+
+
+def test_deactivation_needs_authentication(client):
+    admin_id, _ = register(client)
+    assert client.put(f"/api/auth/admins/{admin_id}/active", json={"is_active": False}).status_code == 401
@@ -0,0 +1,99 @@
+"""
+Streaming bulk student import: the report stays bounded, and a chunk that
+keeps conflicting is reported instead of failing the upload.
+"""
+import json
+import uuid
+from app.routers import student_router
+from app.services import student_service
+from app.utils import bulk_import
+
+
+def upload(client, headers, lines: list[str], **params):
+    return client.post(
+        "/api/students/bulk",
+        content="\n".join(["first_name,last_name,email", *lines]),
+        params=params,
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+
+
+def test_error_report_is_capped(client, make_admin, monkeypatch):
+    monkeypatch.setattr(student_router, "BULK_IMPORT_MAX_ERRORS", 5)
+    email = f"{uuid.uuid4().hex[:8]}@example.com"
+    # Rows 1-3 repeat an email (reported when the chunk is inserted, after
+    # every other row was parsed); rows 4-23 are invalid
+    lines = [f"Ada,Repeat,{email}"] * 3 + [f"Bad,Row{i},not-an-email" for i in range(20)]
+
+    response = upload(client, make_admin(), lines)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["total_rows"] == 23
+    assert report["inserted"] == 1
+    assert report["failed"] == 22
+    assert report["errors_truncated"] is True
+    assert [error["row"] for error in report["errors"]] == [2, 3, 4, 5, 6]
+
+
+def test_small_report_is_complete(client, make_admin):
+    lines = [f"Ada,Ok,{uuid.uuid4().hex[:8]}@example.com", "Bad,Row,not-an-email"]
+    report = upload(client, make_admin(), lines).json()
+    assert report["inserted"] == 1
+    assert report["errors_truncated"] is False
+    assert [error["row"] for error in report["errors"]] == [2]
+
+
+def test_conflicting_chunk_is_reported(client, make_admin, monkeypatch):
+    real_insert = student_service.insert
+
+    class ConflictingInsert:
+        """INSERT that always repeats its first row, as if a concurrent writer kept winning."""
+        def __init__(self, model):
+            self.model = model
+
+        def values(self, values):
+            return real_insert(self.model).values([*values, values[0]])
+
+    monkeypatch.setattr(student_service, "insert", ConflictingInsert)
+    lines = [f"Ada,Chunk{i},{uuid.uuid4().hex[:8]}@example.com" for i in range(3)]
+
+    response = upload(client, make_admin(), lines, chunk_size=2)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 0
+    assert report["failed"] == 3
+    assert [error["row"] for error in report["errors"]] == [1, 2, 3]
+    assert "concurrent inserts" in report["errors"][0]["errors"][0]
+
+
+def test_unbalanced_quote_is_reported_and_parsing_resumes(client, make_admin):
+    email = f"{uuid.uuid4().hex[:8]}@example.com"
+    # The stray quote would otherwise swallow the rest of the upload into one field
+    filler = [f"Bad,Filler{i:05d},not-an-email-padding-the-record" for i in range(2000)]
+    lines = ['Ada,"Broken,broken@example.com', *filler, f"Ada,After{email[:8]},{email}"]
+
+    response = upload(client, make_admin(), lines)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 1
+    assert report["errors"][0]["row"] == 1
+    assert report["errors"][0]["errors"] == [f"Record exceeds {bulk_import.MAX_RECORD_CHARS} characters"]
+
+
+def test_overlong_ndjson_line_is_reported(client, make_admin):
+    email = f"{uuid.uuid4().hex[:8]}@example.com"
+    lines = [
+        json.dumps({"first_name": "Ada", "last_name": "x" * (bulk_import.MAX_RECORD_CHARS + 1), "email": "a@example.com"}),
+        json.dumps({"first_name": "Ada", "last_name": f"After{email[:8]}", "email": email}),
+    ]
+    response = client.post(
+        "/api/students/bulk",
+        content="\n".join(lines),
+        headers={**make_admin(), "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["total_rows"] == 2 and report["inserted"] == 1
+    assert [(error["row"], error["errors"]) for error in report["errors"]] == [
+        (1, [f"Record exceeds {bulk_import.MAX_RECORD_CHARS} characters"])
+    ]
@@ -0,0 +1,18 @@
+"""
+Health endpoints: liveness is public, pool and cache internals are for admins.
+"""
+import pytest
+
+
+def test_liveness_is_public(client):
+    assert client.get("/health").status_code == 200
+
+
+@pytest.mark.parametrize("path", ["/health/db", "/health/cache"])
+def test_statistics_need_an_admin(client, make_admin, path):
+    client.cookies.clear()
+    assert client.get(path).status_code == 401
+
+    response = client.get(path, headers=make_admin())
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
@@ -0,0 +1,273 @@
+"""
+Course response cache: every write drops the entries showing it, and only
+primary renders are cached.
+
+The redis backend runs against an in-memory fake client, so a missing
+invalidation would show up as a stale hit: that backend does not check
+its hits against the table versions.
+"""
+import uuid
+import pytest
+from app.core.response_cache import RedisResponseBackend
+from app.services.course_cache import course_response_cache
+
+
+class FakePipeline:
+    """Queues commands and runs them on execute, like a redis-py pipeline."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((getattr(self.client, name), args, kwargs))
+
+    def execute(self):
+        return [command(*args, **kwargs) for command, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """The subset of redis.Redis the response cache uses, in memory; values come back as bytes."""
+
+    def __init__(self):
+        self.data = {}
+
+    @staticmethod
+    def _name(key) -> str:
+        return key.decode() if isinstance(key, bytes) else key
+
+    def get(self, key):
+        return self.data.get(self._name(key))
+
+    def set(self, key, value, ex=None):
+        self.data[self._name(key)] = value if isinstance(value, bytes) else str(value).encode()
+
+    def incr(self, key):
+        value = int(self.data.get(self._name(key), b"0")) + 1
+        self.data[self._name(key)] = str(value).encode()
+        return value
+
+    def sadd(self, key, *members):
+        self.data.setdefault(self._name(key), set()).update(self._name(member).encode() for member in members)
+
+    def smembers(self, key):
+        return set(self.data.get(self._name(key), set()))
+
+    def expire(self, key, seconds):
+        pass
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(self._name(key), None)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def redis_cache(monkeypatch):
+    """Fake Redis server behind the course response cache."""
+    server = FakeRedis()
+    monkeypatch.setattr(course_response_cache, "backend", RedisResponseBackend(server, ttl=300))
+    return server
+
+
+@pytest.fixture
+def enrolled(client, make_admin, make_student, make_course):
+    """An admin's headers, and a course with one enrolled student."""
+    headers = make_admin()
+    course_id, student_id = make_course(headers), make_student(headers)
+    response = client.post(f"/api/students/{student_id}/courses/{course_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    return headers, course_id, student_id
+
+
+def detail_key(course_id: int) -> str:
+    return f"response:course:{course_id}"
+
+
+def listing_keys(server: FakeRedis) -> list[str]:
+    return [key for key in server.data if key.startswith("response:courses:")]
+
+
+def roster(client, headers: dict, course_id: int) -> dict:
+    """GET a course detail, through the cache; student ID -> last name."""
+    response = client.get(f"/api/courses/{course_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    return {student["id"]: student["last_name"] for student in response.json()["students"]}
+
+
+def listed(client, headers: dict) -> dict:
+    """GET the first course listing page, through the cache; course ID -> name."""
+    response = client.get("/api/courses/", params={"limit": 100, "sort": "id"}, headers=headers)
+    assert response.status_code == 200, response.text
+    return {course["id"]: course["name"] for course in response.json()}
+
+
+def test_course_create_drops_the_listings(client, make_admin, make_course, redis_cache):
+    headers = make_admin()
+    listed(client, headers)
+    assert listing_keys(redis_cache)
+
+    course_id = make_course(headers)
+
+    assert not listing_keys(redis_cache)
+    assert course_id in listed(client, headers)
+
+
+def test_course_update_drops_listing_and_detail(client, enrolled, redis_cache):
+    headers, course_id, _ = enrolled
+    listed(client, headers), roster(client, headers, course_id)
+    assert detail_key(course_id) in redis_cache.data
+
+    response = client.put(f"/api/courses/{course_id}", json={"name": "Renamed"}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    assert detail_key(course_id) not in redis_cache.data and not listing_keys(redis_cache)
+    assert listed(client, headers)[course_id] == "Renamed"
+    assert client.get(f"/api/courses/{course_id}", headers=headers).json()["name"] == "Renamed"
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_course_delete_drops_listing_and_detail(client, enrolled, redis_cache, mode):
+    headers, course_id, _ = enrolled
+    listed(client, headers), roster(client, headers, course_id)
+
+    response = client.delete(f"/api/courses/{course_id}", params={"mode": mode}, headers=headers)
+    assert response.status_code in (202, 204), response.text
+
+    assert detail_key(course_id) not in redis_cache.data and not listing_keys(redis_cache)
+    assert course_id not in listed(client, headers)
+    assert client.get(f"/api/courses/{course_id}", headers=headers).status_code == 404
+
+
+def test_enroll_and_unenroll_drop_the_detail(client, enrolled, make_student, redis_cache):
+    headers, course_id, _ = enrolled
+    student_id = make_student(headers)
+    assert student_id not in roster(client, headers, course_id)
+
+    assert client.post(f"/api/students/{student_id}/courses/{course_id}", headers=headers).status_code == 200
+    assert detail_key(course_id) not in redis_cache.data
+    assert student_id in roster(client, headers, course_id)
+
+    assert client.delete(f"/api/students/{student_id}/courses/{course_id}", headers=headers).status_code == 200
+    assert detail_key(course_id) not in redis_cache.data
+    assert student_id not in roster(client, headers, course_id)
+
+
+def test_bulk_enrollment_drops_the_detail(client, enrolled, make_student, redis_cache):
+    headers, course_id, _ = enrolled
+    student_ids = [make_student(headers), make_student(headers)]
+    roster(client, headers, course_id)
+
+    for action in ("add", "remove"):
+        response = client.post(
+            f"/api/courses/{course_id}/enrollments/bulk",
+            json={"student_ids": student_ids, "action": action},
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        assert detail_key(course_id) not in redis_cache.data
+        assert (set(student_ids) <= roster(client, headers, course_id).keys()) == (action == "add")
+
+
+def test_student_update_drops_the_details_of_their_courses(client, enrolled, redis_cache):
+    headers, course_id, student_id = enrolled
+    roster(client, headers, course_id)
+
+    response = client.put(f"/api/students/{student_id}", json={"last_name": "Renamed"}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    assert detail_key(course_id) not in redis_cache.data
+    assert roster(client, headers, course_id)[student_id] == "Renamed"
+
+
+@pytest.mark.parametrize("delete", [
+    lambda client, headers, student_id: client.delete(f"/api/students/{student_id}", headers=headers),
+    lambda client, headers, student_id: client.delete(
+        f"/api/students/{student_id}", params={"mode": "async"}, headers=headers
+    ),
+    lambda client, headers, student_id: client.post(
+        "/api/students/bulk-delete", json={"student_ids": [student_id]}, headers=headers
+    ),
+    lambda client, headers, student_id: client.post(
+        "/api/students/bulk-delete", json={"student_ids": [student_id], "mode": "async"}, headers=headers
+    ),
+], ids=["sync", "async", "bulk-sync", "bulk-async"])
+def test_student_delete_drops_the_details_of_their_courses(client, enrolled, redis_cache, delete):
+    headers, course_id, student_id = enrolled
+    assert student_id in roster(client, headers, course_id)
+
+    response = delete(client, headers, student_id)
+    assert response.status_code in (200, 202, 204), response.text
+
+    assert detail_key(course_id) not in redis_cache.data
+    assert student_id not in roster(client, headers, course_id)
+
+
+def test_cached_responses_are_rendered_on_the_primary(client, make_admin, make_course, redis_cache):
+    writer, reader = make_admin(), make_admin()
+    client.cookies.clear()
+    course_id = make_course(writer)  # Not replicated: the replica lags behind
+
+    # Another admin's read, not sticky to the primary, must not cache the replica's view
+    assert course_id in listed(client, reader)
+    assert client.get(f"/api/courses/{course_id}", headers=reader).status_code == 200
+    assert course_id in listed(client, writer)
+
+
+def test_lru_hit_outdated_by_another_worker_is_a_miss(client, enrolled):
+    from app.core.database import SessionLocal
+    from app.models.course import Course
+    headers, course_id, _ = enrolled
+    assert course_response_cache.backend.name == "lru"
+    client.get(f"/api/courses/{course_id}", headers=headers)
+    outdated = course_response_cache.stats()["outdated"]
+
+    # A write handled by another worker process: this process' cache is not invalidated
+    name = f"Elsewhere {uuid.uuid4().hex[:8]}"
+    with SessionLocal() as db:
+        db.get(Course, course_id).name = name
+        db.commit()
+
+    assert client.get(f"/api/courses/{course_id}", headers=headers).json()["name"] == name
+    assert course_response_cache.stats()["outdated"] == outdated + 1
+
+
+def test_equivalent_urls_share_the_etag(client, make_admin, make_course):
+    headers = make_admin()
+    make_course(headers)
+    first = client.get("/api/courses/", params={"limit": 10}, headers=headers)
+    outdated = course_response_cache.stats()["outdated"]
+
+    # Same page with its defaults spelled out: the same cache entry, and the same ETag
+    same = client.get("/api/courses/", params={"sort": "id", "skip": 0, "limit": 10}, headers=headers)
+    assert same.headers["etag"] == first.headers["etag"]
+    assert course_response_cache.stats()["outdated"] == outdated
+
+    revalidated = client.get(
+        "/api/courses/", params={"skip": 0, "limit": 10}, headers={**headers, "If-None-Match": first.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+
+
+def test_redis_invalidation_runs_off_the_event_loop(client, make_admin, make_course, redis_cache, monkeypatch):
+    import asyncio
+    on_loop = []
+
+    def incr(key):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(key)
+        except RuntimeError:
+            pass
+        return FakeRedis.incr(redis_cache, key)
+
+    monkeypatch.setattr(redis_cache, "incr", incr)
+    headers = make_admin()
+    listed(client, headers)
+
+    course_id = make_course(headers)
+
+    assert redis_cache.data["response:epoch"] and not on_loop
+    assert course_id in listed(client, headers)
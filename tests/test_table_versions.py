@@ -0,0 +1,64 @@
+"""
+Table versions: bumped after a write commits, in a transaction of their own.
+"""
+import uuid
+import pytest
+from sqlalchemy import event, select
+
+
+@pytest.fixture
+def transactions():
+    """Statements run on the primary, grouped per transaction (including the one in progress)."""
+    from app.core.database import engine
+    log = [[]]
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        log[-1].append(statement)
+
+    def on_commit(conn):
+        log.append([])
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    event.listen(engine, "commit", on_commit)
+    yield log
+    event.remove(engine, "before_cursor_execute", on_execute)
+    event.remove(engine, "commit", on_commit)
+
+
+def student_version() -> int:
+    from app.core.database import SessionLocal
+    from app.models.table_version import TableVersion
+    with SessionLocal() as db:
+        return db.scalar(select(TableVersion.version).where(TableVersion.table_name == "students"))
+
+
+def add_student(db) -> None:
+    from app.models.student import Student
+    unique = uuid.uuid4().hex[:8]
+    db.add(Student(first_name="Ada", last_name=f"Test{unique}", email=f"{unique}@example.com"))
+
+
+def test_version_is_bumped_outside_the_writing_transaction(app, transactions):
+    from app.core.database import SessionLocal
+    before = student_version()
+    with SessionLocal() as db:
+        add_student(db)
+        db.commit()
+
+    assert student_version() == before + 1
+    writing = [statements for statements in transactions if any("INSERT INTO students" in s for s in statements)]
+    bumping = [statements for statements in transactions if any("UPDATE table_versions" in s for s in statements)]
+    assert len(writing) == 1 and len(bumping) == 1
+    assert all(statement.startswith("UPDATE table_versions") for statement in bumping[0])
+
+
+def test_rolled_back_write_leaves_the_version(app):
+    from app.core.database import SessionLocal
+    before = student_version()
+    with SessionLocal() as db:
+        add_student(db)
+        db.flush()
+        db.rollback()
+        db.commit()
+
+    assert student_version() == before
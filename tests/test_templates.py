@@ -0,0 +1,20 @@
+"""
+Page templates: page scripts call helpers from main.js (fetchWithSession,
+showAlert), so they must load after it.
+"""
+import re
+from pathlib import Path
+import pytest
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "app" / "templates"
+PAGES = sorted(path.name for path in TEMPLATE_DIR.glob("*.html") if "js/pages/" in path.read_text())
+
+
+@pytest.mark.parametrize("name", PAGES)
+def test_page_script_loads_after_main_js(app, name):
+    html = app.state.templates.env.get_template(name).render(is_authenticated=True, username="admin")
+    scripts = re.findall(r'<script src="([^"]+)"', html)
+    main = [index for index, src in enumerate(scripts) if "/js/main." in src]
+    pages = [index for index, src in enumerate(scripts) if "/js/pages/" in src]
+    assert main and pages, scripts
+    assert main[0] < min(pages)